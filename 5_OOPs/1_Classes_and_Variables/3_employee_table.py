@@ -0,0 +1,321 @@
+"""
+EmployeeTable: the Employee class turned "sideways" into columns.
+
+An Employee object keeps first/last/pay/raise_amt in its own __dict__, and a
+payroll run calls apply_raise() once per person. With millions of employees,
+the per-object overhead (object headers, dicts, method calls) dominates.
+
+EmployeeTable stores one column per attribute instead:
+  - first, last  -> plain lists of strings
+  - pay          -> array('q')  (64-bit ints, packed like a C array)
+  - raise_amt    -> array('d')  (64-bit floats)
+
+Bulk operations (raises, filters, totals) then work on whole columns at once.
+If NumPy is installed it operates directly on the arrays' memory (no copy),
+so a raise for a million people is a single vectorized multiply; without it
+the same operations fall back to C-level loops (map, sum, itertools.compress).
+Either way the numbers are exactly those of the per-object apply_raise(),
+because it is the same int(pay * raise_amt) arithmetic on the same floats.
+table[i] still gives an Employee-like view of row i for code that wants one
+object at a time.
+"""
+
+import time
+from array import array
+from itertools import compress, repeat
+from operator import and_, mul
+
+try:
+    import numpy as np  # optional: vectorized bulk operations
+except ImportError:
+    np = None
+
+
+class Employee:
+    # Same Employee as in 2_class_variables.py / 2_2_inheritance.py
+    raise_amt = 1.04
+    num_of_emps = 0
+
+    def __init__(self, first, last, pay):
+        self.first = first
+        self.last = last
+        self.pay = pay
+        self.email = f"{first}.{last}@company.com"
+
+        Employee.num_of_emps += 1
+
+    def full_name(self):
+        return f"{self.first} {self.last}"
+
+    def apply_raise(self):
+        self.pay = int(self.pay * self.raise_amt)
+        return self.pay
+
+
+class Developer(Employee):
+    # As in 5_Inheritance/2_2_inheritance.py: a class-level raise of its own
+    raise_amt = 1.10
+
+
+class EmployeeRow:
+    """
+    Employee-like view of one row of an EmployeeTable.
+    Reading or assigning an attribute reads or writes the table's columns.
+    """
+    __slots__ = ("table", "row")
+
+    def __init__(self, table, row):
+        self.table = table
+        self.row = row
+
+    @property
+    def first(self):
+        return self.table.first[self.row]
+
+    @first.setter
+    def first(self, value):
+        self.table.first[self.row] = value
+
+    @property
+    def last(self):
+        return self.table.last[self.row]
+
+    @last.setter
+    def last(self, value):
+        self.table.last[self.row] = value
+
+    @property
+    def pay(self):
+        return self.table.pay[self.row]
+
+    @pay.setter
+    def pay(self, value):
+        self.table.pay[self.row] = value
+
+    @property
+    def raise_amt(self):
+        return self.table.raise_amt[self.row]
+
+    @raise_amt.setter
+    def raise_amt(self, value):
+        # Like emp_1.raise_amt = 1.10: this row no longer follows the table default
+        self.table.raise_amt[self.row] = value
+        self.table.own_raise[self.row] = 1
+
+    @property
+    def email(self):
+        return f"{self.first}.{self.last}@company.com"
+
+    def full_name(self):
+        return f"{self.first} {self.last}"
+
+    def apply_raise(self):
+        self.pay = int(self.pay * self.raise_amt)
+        return self.pay
+
+    raise_pay = apply_raise  # name used in 2_class_variables.py
+
+    def __repr__(self):
+        return f"EmployeeRow({self.first!r}, {self.last!r}, {self.pay})"
+
+
+class EmployeeTable:
+    """
+    Column-oriented collection of employees with bulk payroll operations.
+    """
+
+    def __init__(self, raise_amt=1.04):
+        """
+        :param raise_amt: Default raise for every row, like the Employee.raise_amt class variable
+        """
+        self.default_raise = raise_amt
+        self.first = []
+        self.last = []
+        self.pay = array("q")
+        self.raise_amt = array("d")
+        self.own_raise = bytearray()  # 1 where a row has its own raise_amt (an "instance variable")
+
+    @classmethod
+    def from_employees(cls, employees, raise_amt=1.04):
+        """
+        Build a table from Employee objects (their own or class raise_amt is kept).
+        """
+        table = cls(raise_amt)
+        for emp in employees:
+            # getattr also finds a subclass's raise_amt (e.g. Developer's 1.10);
+            # only an amount different from the default becomes the row's own
+            emp_raise = getattr(emp, "raise_amt", raise_amt)
+            table.append(emp.first, emp.last, emp.pay,
+                         None if emp_raise == raise_amt else emp_raise)
+        return table
+
+    def append(self, first, last, pay, raise_amt=None):
+        """
+        Add one employee; raise_amt=None means "use the table default".
+        """
+        self.first.append(first)
+        self.last.append(last)
+        self.pay.append(pay)
+        self.raise_amt.append(self.default_raise if raise_amt is None else raise_amt)
+        self.own_raise.append(raise_amt is not None)
+
+    def extend(self, firsts, lasts, pays):
+        """
+        Add many employees at once (all on the default raise).
+        """
+        before = len(self.pay)
+        self.first.extend(firsts)
+        self.last.extend(lasts)
+        self.pay.extend(pays)
+        added = len(self.pay) - before
+        self.raise_amt.extend(repeat(self.default_raise, added))
+        self.own_raise.extend(bytes(added))
+
+    def set_default_raise(self, raise_amt):
+        """
+        Like Employee.raise_amt = ...: changes every row without its own amount.
+        """
+        self.default_raise = raise_amt
+        if np is not None:
+            amounts = np.frombuffer(self.raise_amt)
+            amounts[np.frombuffer(self.own_raise, dtype=np.uint8) == 0] = raise_amt
+            return
+        amounts = self.raise_amt
+        for row in compress(range(len(amounts)), map((0).__eq__, self.own_raise)):
+            amounts[row] = raise_amt
+
+    def __len__(self):
+        return len(self.pay)
+
+    def __getitem__(self, row):
+        if not -len(self) <= row < len(self):
+            raise IndexError("employee row out of range")
+        return EmployeeRow(self, row % len(self))
+
+    def __iter__(self):
+        return map(EmployeeRow, repeat(self), range(len(self)))
+
+    # ——— bulk operations ———
+
+    def apply_raise(self, rows=None):
+        """
+        Give a raise to every row (or only `rows`), exactly as Employee.apply_raise() does.
+        """
+        if np is not None:
+            # NumPy views share memory with the arrays, so this updates the column in place
+            pay, amounts = np.frombuffer(self.pay, dtype=np.int64), np.frombuffer(self.raise_amt)
+            if rows is None:
+                pay[:] = pay * amounts  # float -> int64 truncates like int()
+            else:
+                rows = np.asarray(rows, dtype=np.intp)
+                pay[rows] = pay[rows] * amounts[rows]
+            return
+        if rows is None:
+            # One C-level pass: pay = int(pay * raise_amt), element by element
+            self.pay = array("q", map(int, map(mul, self.pay, self.raise_amt)))
+        else:
+            pay, amounts = self.pay, self.raise_amt
+            for row in rows:
+                pay[row] = int(pay[row] * amounts[row])
+
+    def where(self, min_pay=None, max_pay=None, last=None):
+        """
+        Row numbers matching every given condition (min_pay <= pay <= max_pay, last name).
+        """
+        if np is not None:
+            pay = np.frombuffer(self.pay, dtype=np.int64)
+            mask = np.ones(len(pay), dtype=bool)
+            if min_pay is not None:
+                mask &= pay >= min_pay
+            if max_pay is not None:
+                mask &= pay <= max_pay
+            if last is not None:
+                mask &= np.fromiter(map(last.__eq__, self.last), dtype=bool, count=len(pay))
+            return np.flatnonzero(mask)
+
+        tests = []
+        if min_pay is not None:
+            tests.append(map(min_pay.__le__, self.pay))
+        if max_pay is not None:
+            tests.append(map(max_pay.__ge__, self.pay))
+        if last is not None:
+            tests.append(map(last.__eq__, self.last))
+        mask = tests[0] if tests else repeat(True, len(self))
+        for test in tests[1:]:
+            mask = map(and_, mask, test)
+        return list(compress(range(len(self)), mask))
+
+    def _pays(self, rows):
+        if np is not None:
+            pay = np.frombuffer(self.pay, dtype=np.int64)
+            return pay if rows is None else pay[np.asarray(rows, dtype=np.intp)]
+        return self.pay if rows is None else list(map(self.pay.__getitem__, rows))
+
+    def total_pay(self, rows=None):
+        return int(sum(self._pays(rows)) if np is None else self._pays(rows).sum())
+
+    def mean_pay(self, rows=None):
+        count = len(self) if rows is None else len(rows)
+        return self.total_pay(rows) / count if count else 0.0
+
+    def max_pay(self, rows=None):
+        pays = self._pays(rows)
+        return int(max(pays)) if len(pays) else None
+
+
+# ------------------------------------------------
+# Example Usage
+# ------------------------------------------------
+team = EmployeeTable.from_employees([Employee('Arsh', 'Ansari', 50000),
+                                     Employee('Test', 'User', 60000),
+                                     Developer('Dev', 'Eloper', 50000)])
+team.append('Another', 'User', 70000)
+
+emp_1 = team[0]                         # an Employee-like view of row 0
+print(emp_1.full_name(), emp_1.email, emp_1.pay)
+
+emp_1.raise_amt = 1.10                  # this row gets its own raise ...
+team.set_default_raise(1.05)            # ... and every other row follows the default
+team.apply_raise()                      # one bulk raise for the whole table
+print("After raise:", [(row.full_name(), row.pay) for row in team])
+
+users = team.where(last='User', min_pay=65000)
+print("Users earning >= 65000:", [team[row].full_name() for row in users])
+print("Total pay:", team.total_pay(), " mean:", team.mean_pay(), " max:", team.max_pay())
+
+
+# ------------------------------------------------
+# Benchmark: 1M employees, objects vs columns
+# ------------------------------------------------
+N = 1_000_000
+firsts = [f"First{i % 5000}" for i in range(N)]
+lasts = [f"Last{i % 7919}" for i in range(N)]
+pays = [30000 + (i * 7919) % 90000 for i in range(N)]
+
+staff = list(map(Employee, firsts, lasts, pays))
+start = time.perf_counter()
+for emp in staff:
+    emp.apply_raise()
+objects_s = time.perf_counter() - start
+
+table = EmployeeTable()
+table.extend(firsts, lasts, pays)
+start = time.perf_counter()
+table.apply_raise()
+table_s = time.perf_counter() - start
+
+# Same results as the per-object raise
+assert list(table.pay) == [emp.pay for emp in staff]
+
+start = time.perf_counter()
+high_objects = sum(emp.pay for emp in staff if emp.pay >= 100000)
+filter_objects_s = time.perf_counter() - start
+start = time.perf_counter()
+high_table = table.total_pay(table.where(min_pay=100000))
+filter_table_s = time.perf_counter() - start
+assert high_objects == high_table
+
+print(f"\n{N:,} employees")
+print(f"apply_raise:        objects {objects_s:.3f} s   table {table_s:.3f} s   ({objects_s / table_s:.1f}x)")
+print(f"filter + total pay: objects {filter_objects_s:.3f} s   table {filter_table_s:.3f} s   "
+      f"({filter_objects_s / filter_table_s:.1f}x)")
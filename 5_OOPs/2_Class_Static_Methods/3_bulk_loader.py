@@ -0,0 +1,202 @@
+'''Bulk loading: from_empstr() for whole files of 'first-last-pay' records, split across CPU cores.'''
+
+import mmap
+import os
+import tempfile
+import time
+from array import array
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+
+class Employee:
+    # Same Employee as in 1_classmethods.py
+    num_of_emps = 1
+
+    def __init__(self, first, last, pay):
+        self.first = first
+        self.last = last
+        self.pay = int(pay)
+        self.email = first + '.' + last + '@company.com'
+        self.cid = Employee.num_of_emps
+        Employee.num_of_emps += 1
+
+    def full_name(self):
+        return '{} {}'.format(self.first, self.last)
+
+    @classmethod
+    def from_empstr(cls, emp_str):
+        '''Create an Employee from a string'''
+        first, last, pay = emp_str.split('-')
+        return cls(first, last, int(pay))
+
+    @classmethod
+    def from_file(cls, path, **options):
+        '''Create Employees from every line of a file (see EmployeeLoader)'''
+        return EmployeeLoader(path, cls=cls, **options)
+
+
+# A parsed piece of the file, one list/array per field ("columnar")
+Batch = namedtuple('Batch', ['first', 'last', 'pay'])
+
+# A line that could not be parsed: 1-based line number, the raw text, and why
+Malformed = namedtuple('Malformed', ['line_no', 'text', 'reason'])
+
+
+def parse_chunk(path, start, end):
+    '''
+    Parse the records between byte offsets start and end (both on line boundaries).
+    Runs in a worker process, which maps the file itself, so only the results
+    travel back to the parent, never the raw text.
+
+    :return: (Batch, number of lines, [(line index within chunk, text, reason)])
+    '''
+    first, last, pay, bad = [], [], array('q'), []
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        lines = mm[start:end].split(b'\n')
+    if lines and not lines[-1]:
+        lines.pop()  # the chunk ends with a newline
+    for index, line in enumerate(lines):
+        fields = line.split(b'-')  # same rule as from_empstr: exactly three fields
+        if len(fields) != 3:
+            if line.strip():  # blank lines are simply skipped
+                bad.append((index, line, f'expected 3 fields, got {len(fields)}'))
+            continue
+        try:
+            amount = int(fields[2])
+            names = fields[0].decode(), fields[1].decode()
+        except (ValueError, OverflowError) as e:  # bad pay, or not UTF-8
+            bad.append((index, line, str(e)))
+            continue
+        first.append(names[0])
+        last.append(names[1])
+        pay.append(amount)
+    return Batch(first, last, pay), len(lines), bad
+
+
+class EmployeeLoader:
+    '''
+    Streams Employees (or columnar Batches) out of a file of 'first-last-pay' lines.
+
+    The file is memory-mapped and cut into chunks at line boundaries; a pool of
+    worker processes parses the chunks in parallel, and results come back in file
+    order. Malformed lines are collected in .errors instead of stopping the load.
+    '''
+
+    def __init__(self, path, cls=Employee, workers=None, chunk_bytes=8 << 20):
+        '''
+        :param cls: Class to construct for each record
+        :param workers: Worker processes (default: one per CPU; 0 or 1 parses in this process)
+        :param chunk_bytes: Approximate size of the piece each worker parses at a time
+        '''
+        self.path = path
+        self.cls = cls
+        self.workers = os.cpu_count() if workers is None else workers
+        self.chunk_bytes = chunk_bytes
+        self.errors = []
+        self.records = 0
+
+    def chunks(self):
+        '''Byte ranges of about chunk_bytes each, ending just after a newline'''
+        size = os.path.getsize(self.path)
+        if size == 0:
+            return []
+        ranges = []
+        with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            while start < size:
+                cut = mm.find(b'\n', min(start + self.chunk_bytes, size) - 1)
+                end = size if cut == -1 else cut + 1
+                ranges.append((start, end))
+                start = end
+        return ranges
+
+    def batches(self):
+        '''Yield one Batch per chunk, in file order'''
+        self.errors, self.records = [], 0
+        ranges = self.chunks()
+        if self.workers > 1 and len(ranges) > 1:
+            with ProcessPoolExecutor(self.workers) as pool:
+                yield from self._collect(self._in_order(pool, ranges))
+        else:
+            yield from self._collect(parse_chunk(self.path, start, end) for start, end in ranges)
+
+    def _in_order(self, pool, ranges):
+        '''
+        Results of parse_chunk for each range, in file order, with at most
+        2 chunks per worker submitted and not yet consumed (so memory stays
+        bounded however big the file is).
+        '''
+        pending = deque()
+        ranges = iter(ranges)
+        for start, end in islice(ranges, 2 * self.workers):
+            pending.append(pool.submit(parse_chunk, self.path, start, end))
+        while pending:
+            result = pending.popleft().result()
+            for start, end in islice(ranges, 1):
+                pending.append(pool.submit(parse_chunk, self.path, start, end))
+            yield result
+
+    def _collect(self, results):
+        line_no = 1  # number of the first line of the current chunk
+        for batch, lines, bad in results:
+            for index, text, reason in bad:
+                self.errors.append(Malformed(line_no + index, text.decode(errors='replace'), reason))
+            line_no += lines
+            self.records += len(batch.pay)
+            yield batch
+
+    def __iter__(self):
+        '''Yield one object per valid record'''
+        cls = self.cls
+        for batch in self.batches():
+            yield from map(cls, batch.first, batch.last, batch.pay)
+
+
+# ------------------------------------------------
+# Example Usage + Benchmark
+# ------------------------------------------------
+if __name__ == '__main__':  # required: worker processes re-import this file on some platforms
+    N = 2_000_000
+    path = os.path.join(tempfile.mkdtemp(), 'employees.txt')
+    with open(path, 'w') as f:
+        for i in range(N):
+            f.write(f'First{i % 5000}-Last{i % 7919}-{30000 + i % 90000}\n')
+            if i % 500_000 == 1:
+                f.write('Mary-Jane-Smith-45000\n' if i % 1_000_000 == 1 else 'Bad-Pay-lots\n')
+    print(f'{path}: {os.path.getsize(path) / 2**20:.0f} MB')
+
+    # Before: one from_empstr() per line
+    start = time.perf_counter()
+    baseline = []
+    with open(path) as f:
+        for line in f:
+            try:
+                baseline.append(Employee.from_empstr(line.rstrip('\n')))
+            except ValueError:
+                pass
+    baseline_s = time.perf_counter() - start
+
+    # After: streaming loader, as objects and as columnar batches
+    start = time.perf_counter()
+    loader = Employee.from_file(path)
+    employees = list(loader)
+    objects_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    loader = EmployeeLoader(path)
+    total_pay = sum(sum(batch.pay) for batch in loader.batches())
+    batches_s = time.perf_counter() - start
+
+    assert [(e.first, e.last, e.pay) for e in employees] == [(e.first, e.last, e.pay) for e in baseline]
+    assert total_pay == sum(e.pay for e in baseline)
+
+    print('Malformed lines (reported, not fatal):')
+    for error in loader.errors:
+        print(f'  line {error.line_no}: {error.text!r} ({error.reason})')
+    print(f'\n{loader.records:,} records, {loader.workers} worker(s)')
+    print(f'from_empstr per line : {loader.records / baseline_s:12,.0f} records/s')
+    print(f'loader, objects      : {loader.records / objects_s:12,.0f} records/s')
+    print(f'loader, batches      : {loader.records / batches_s:12,.0f} records/s')
+    os.remove(path)
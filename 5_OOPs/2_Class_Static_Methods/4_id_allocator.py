@@ -0,0 +1,288 @@
+'''Employee IDs that stay unique across threads, processes and restarts: an ID allocator that hands out blocks.'''
+
+# In 1_classmethods.py every Employee takes `cid = Employee.num_of_emps` and then
+# does `Employee.num_of_emps += 1`. That is fine in one process, but:
+#   - `+=` on a class variable is read, add, write: two threads can read the same
+#     value, so both employees get the same cid and one increment is lost;
+#   - every process has its own copy of the class, so two worker processes both
+#     start again at 1;
+#   - after a restart the counter starts at 1 again.
+#
+# IdAllocator fixes all three. It keeps the "high-water mark" (the first ID
+# nobody has been given yet) in a small file. A thread that needs IDs locks the
+# file, takes a whole block of them (say 4096) by moving the mark forward, and
+# unlocks. Handing out IDs from its own block needs no lock at all, so the lock
+# is taken once per block, not once per employee.
+#
+# IDs never repeat, but they can have gaps: IDs left in a block when a thread or
+# process ends are skipped, never handed out again.
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import weakref
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from operator import length_hint
+
+try:
+    import fcntl  # Unix: whole-file lock
+except ImportError:
+    fcntl = None
+    import msvcrt  # Windows: lock the first byte instead
+
+
+def _lock(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+    else:
+        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+
+
+def _unlock(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+# Every live allocator, so one fork hook can reset them all (a hook per
+# allocator would keep each one alive and pile up with every configure())
+_allocators = weakref.WeakSet()
+
+
+def _reset_after_fork():
+    # A forked child gets a copy of the parent's blocks; it must not use them
+    for allocator in list(_allocators):
+        allocator._reset()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class _Block:
+    # One thread's current range of IDs, and how many it has reserved in total
+    __slots__ = ('ids', 'taken')
+
+    def __init__(self):
+        self.ids = iter(())
+        self.taken = 0
+
+
+class IdAllocator:
+    '''
+    Hands out unique integer IDs, starting at 1.
+
+    With a path, the high-water mark lives in that file, so several processes
+    (and later runs) using the same file never get the same ID. Without one,
+    IDs are only unique within this process.
+    '''
+
+    def __init__(self, path=None, block_size=4096):
+        '''
+        :param path: File holding the high-water mark (created if missing)
+        :param block_size: How many IDs a thread reserves at a time
+        '''
+        self.path = path
+        self.block_size = block_size
+        self.next_block = 1  # high-water mark when there is no file
+        self._reset()
+        _allocators.add(self)
+
+    def _reset(self):
+        self.lock = threading.Lock()
+        self.local = threading.local()  # this thread's current block
+        self.blocks = []                # every thread's _Block, for issued()
+
+    def next_id(self):
+        '''Return an ID no other thread or process has (no lock unless the block is used up)'''
+        try:
+            return next(self.local.ids)
+        except (AttributeError, StopIteration):  # first call in this thread, or block used up
+            return self._refill()
+
+    def _refill(self):
+        local = self.local
+        block = getattr(local, 'block', None)
+        if block is None:
+            # Attributes of a threading.local are invisible to other threads, so the
+            # counts issued() reads live in a plain object the thread keeps a link to
+            block = local.block = _Block()
+            with self.lock:
+                self.blocks.append(block)
+        start = self.reserve(self.block_size)
+        block.ids = local.ids = iter(range(start, start + self.block_size))
+        block.taken += self.block_size
+        return next(local.ids)
+
+    def reserve(self, count):
+        '''Take `count` IDs for the caller and return the first one'''
+        with self.lock:  # threads of this process wait here ...
+            if self.path is None:
+                start = self.next_block
+                self.next_block += count
+                return start
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                _lock(fd)  # ... and other processes wait here
+                try:
+                    text = os.read(fd, 32).strip()
+                    start = int(text) if text else 1
+                    # Same width every time, so the old number is overwritten in place
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    os.write(fd, b'%020d\n' % (start + count))
+                    os.fsync(fd)  # on disk before anyone uses the IDs
+                finally:
+                    _unlock(fd)
+            finally:
+                os.close(fd)
+            return start
+
+    def high_water_mark(self):
+        '''The first ID that has not been reserved yet'''
+        if self.path is None:
+            return self.next_block
+        try:
+            with open(self.path, 'rb') as f:
+                return int(f.read().strip() or 1)
+        except FileNotFoundError:
+            return 1
+
+    def issued(self):
+        '''How many IDs this process has handed out (reserved but unused ones are not counted)'''
+        with self.lock:
+            return sum(block.taken - length_hint(block.ids) for block in self.blocks)
+
+
+class Employee:
+    # Same Employee as in 1_classmethods.py, with the ID coming from an allocator.
+    # Default: unique within this process; configure() with a file for more.
+    ids = IdAllocator()
+
+    def __init__(self, first, last, pay):
+        self.first = first
+        self.last = last
+        self.pay = int(pay)
+        self.email = first + '.' + last + '@company.com'
+        self.cid = Employee.ids.next_id()
+
+    def full_name(self):
+        return '{} {}'.format(self.first, self.last)
+
+    @classmethod
+    def from_empstr(cls, emp_str):
+        '''Create an Employee from a string'''
+        first, last, pay = emp_str.split('-')
+        return cls(first, last, int(pay))
+
+    @classmethod
+    def configure(cls, path, block_size=4096):
+        '''Take IDs from the high-water mark file at path (shared by every process using it)'''
+        cls.ids = IdAllocator(path, block_size)
+
+    @classmethod
+    def num_of_emps(cls):
+        '''Employees created by this process (replaces the racy class-variable counter)'''
+        return cls.ids.issued()
+
+
+# ------------------------------------------------
+# Helpers for the worker processes (must be importable, see 3_bulk_loader.py)
+# ------------------------------------------------
+class OldEmployee:
+    # The 1_classmethods.py version, for comparison
+    num_of_emps = 1
+
+    def __init__(self, first, last, pay):
+        self.first = first
+        self.last = last
+        self.pay = int(pay)
+        self.cid = OldEmployee.num_of_emps
+        OldEmployee.num_of_emps += 1
+
+
+def old_cids(count):
+    return [OldEmployee('Test', 'User', 50000).cid for _ in range(count)]
+
+
+def make_employees(count):
+    '''Create `count` Employees in this thread; return just their IDs'''
+    return array('q', [Employee('Test', 'User', 50000).cid for _ in range(count)])
+
+
+def worker_batch(path, threads, per_thread):
+    '''One worker process: `threads` threads each creating per_thread Employees'''
+    if Employee.ids.path != path:
+        Employee.configure(path)
+    before = Employee.num_of_emps()
+    with ThreadPoolExecutor(threads) as pool:
+        parts = list(pool.map(make_employees, [per_thread] * threads))
+    cids = array('q')
+    for part in parts:
+        cids.extend(part)
+    return cids.tobytes(), Employee.num_of_emps() - before
+
+
+# ------------------------------------------------
+# Example Usage + Stress test
+# ------------------------------------------------
+if __name__ == '__main__':
+    id_file = os.path.join(tempfile.mkdtemp(), 'employee_ids')
+
+    # Before: two processes each start counting at 1
+    runs = []
+    for _ in range(2):
+        with ProcessPoolExecutor(1) as pool:  # a new process each time
+            runs.append(pool.submit(old_cids, 3).result())
+    a, b = runs
+    print('Old cids from two processes:', a, b, '-> duplicates:', sorted(set(a) & set(b)))
+
+    # After
+    Employee.configure(id_file, block_size=100)
+    emp_1 = Employee('Arsh', 'Ansari', 50000)
+    emp_2 = Employee.from_empstr('John-Doe-70000')
+    print(emp_1.cid, emp_1.full_name(), '|', emp_2.cid, emp_2.full_name())
+    print('High-water mark on disk:', Employee.ids.high_water_mark())  # 101: block 1-100 reserved
+
+    # "Restart": a fresh allocator on the same file continues after the old block
+    Employee.configure(id_file, block_size=100)
+    print('After a restart the next cid is', Employee('Test', 'User', 60000).cid)
+
+    # Stress test: 10M employees from 4 processes x 4 threads at the same time.
+    # Pass a smaller total on the command line for a quicker run.
+    N = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    PROCESSES, THREADS = 4, 4
+    per_thread = N // (PROCESSES * THREADS)
+    Employee.configure(id_file)
+    first_id = Employee.ids.high_water_mark()
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(PROCESSES) as pool:
+        results = list(pool.map(worker_batch, [id_file] * PROCESSES,
+                                [THREADS] * PROCESSES, [per_thread] * PROCESSES))
+    elapsed = time.perf_counter() - start
+
+    # Every ID must show up exactly once: mark each in a bitmap of all reserved IDs
+    seen = bytearray(Employee.ids.high_water_mark() - first_id)
+    total = duplicates = 0
+    for raw, created in results:
+        cids = array('q')
+        cids.frombytes(raw)
+        assert created == len(cids)  # num_of_emps() matches what the workers made
+        for cid in cids:
+            if seen[cid - first_id]:
+                duplicates += 1
+            seen[cid - first_id] = 1
+        total += len(cids)
+
+    print(f'\n{total:,} employees from {PROCESSES} processes x {THREADS} threads in {elapsed:.1f} s '
+          f'({total / elapsed:,.0f}/s)')
+    print(f'Duplicate cids: {duplicates}')
+    print(f'High-water mark: {Employee.ids.high_water_mark():,} '
+          f'({Employee.ids.high_water_mark() - first_id - total:,} reserved but unused)')
+    assert duplicates == 0
+    os.remove(id_file)
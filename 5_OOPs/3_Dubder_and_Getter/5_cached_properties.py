@@ -0,0 +1,202 @@
+# Cached properties: compute email / fullname once, recompute only after first or last changes
+
+# In 3_Getter_Setter.py every read of emp.email or emp.fullname runs str.format
+# again, even though the answer only changes when first or last changes.
+#
+# cached_property('first', 'last') is a property that remembers its value in the
+# instance (in the attribute '_' + its name, e.g. _email) and hands that back on
+# later reads. Classes that use it inherit from Cacheable, whose __setattr__ /
+# __delattr__ mark those remembered values as stale whenever one of the listed
+# attributes is assigned or deleted - including from the fullname setter and
+# deleter, which assign first and last. The next read then recomputes.
+#
+# It also works with __slots__: list the cache attributes (_email, _fullname)
+# in __slots__ next to first and last. (functools.cached_property needs an
+# instance __dict__ and never notices that first/last changed.)
+
+import time
+
+_STALE = object()  # "no remembered value": never computed, or invalidated since
+
+
+class Cacheable:
+    # Base class: keeps cached_property values in step with the attributes they use
+    __slots__ = ()
+    _invalidates = {}  # attribute -> cache attributes to mark stale (filled in by cached_property)
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        for cache in self._invalidates.get(name, ()):
+            object.__setattr__(self, cache, _STALE)
+
+    def __delattr__(self, name):
+        object.__delattr__(self, name)
+        for cache in self._invalidates.get(name, ()):
+            object.__setattr__(self, cache, _STALE)
+
+
+class CachedProperty:
+    """
+    Like property, but the getter runs once and its result is reused until one of
+    `depends_on` changes. Supports .setter and .deleter the same way property does.
+    """
+
+    def __init__(self, fget, depends_on, fset=None, fdel=None):
+        self.fget = fget
+        self.depends_on = depends_on
+        self.fset = fset
+        self.fdel = fdel
+        self.__doc__ = fget.__doc__
+
+    def __set_name__(self, owner, name):
+        self.cache = '_' + name
+        # Each class gets its own map (copied from its parent) so subclasses can add to it
+        if '_invalidates' not in owner.__dict__:
+            owner._invalidates = {attr: list(caches) for attr, caches in owner._invalidates.items()}
+        for attr in self.depends_on:
+            owner._invalidates.setdefault(attr, []).append(self.cache)
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        value = getattr(obj, self.cache, _STALE)
+        if value is _STALE:
+            value = self.fget(obj)
+            object.__setattr__(obj, self.cache, value)
+        return value
+
+    def __set__(self, obj, value):
+        if self.fset is None:
+            raise AttributeError(f"can't set attribute '{self.cache[1:]}'")
+        self.fset(obj, value)  # assigns first/last, which invalidates the cache
+
+    def __delete__(self, obj):
+        if self.fdel is None:
+            raise AttributeError(f"can't delete attribute '{self.cache[1:]}'")
+        self.fdel(obj)
+
+    def setter(self, fset):
+        return CachedProperty(self.fget, self.depends_on, fset, self.fdel)
+
+    def deleter(self, fdel):
+        return CachedProperty(self.fget, self.depends_on, self.fset, fdel)
+
+
+def cached_property(*depends_on):
+    """
+    Decorator: @cached_property('first', 'last') caches until first or last is assigned.
+    """
+    def decorate(fget):
+        return CachedProperty(fget, depends_on)
+    return decorate
+
+
+# ------------------------------------------------
+# The Employee from 3_Getter_Setter.py, before and after
+# ------------------------------------------------
+class Employee:
+    def __init__(self, first, last):
+        self.first = first
+        self.last = last
+
+    @property  # Getter for email
+    def email(self):
+        return '{}.{}@company.com'.format(self.first, self.last)
+
+    @property  # Getter for fullname
+    def fullname(self):
+        return '{} {}'.format(self.first, self.last)
+
+    @fullname.setter  # Setter for fullname
+    def fullname(self, name):
+        first, last = name.split(' ')
+        self.first = first
+        self.last = last
+
+    @fullname.deleter  # Deleter for fullname
+    def fullname(self):
+        self.first = None
+        self.last = None
+
+
+class CachedEmployee(Cacheable):
+    # Slotted: the cache lives in the _email / _fullname slots
+    __slots__ = ('first', 'last', '_email', '_fullname')
+
+    def __init__(self, first, last):
+        self.first = first
+        self.last = last
+
+    @cached_property('first', 'last')  # Getter for email, computed once per name
+    def email(self):
+        return '{}.{}@company.com'.format(self.first, self.last)
+
+    @cached_property('first', 'last')  # Getter for fullname, computed once per name
+    def fullname(self):
+        return '{} {}'.format(self.first, self.last)
+
+    @fullname.setter  # Setter for fullname: first/last change, so both caches go stale
+    def fullname(self, name):
+        first, last = name.split(' ')
+        self.first = first
+        self.last = last
+
+    @fullname.deleter  # Deleter for fullname
+    def fullname(self):
+        self.first = None
+        self.last = None
+
+
+class CachedManager(CachedEmployee):
+    # No __slots__ here, so instances have a __dict__ again: the cache works either way
+    @cached_property('first')
+    def initial(self):
+        return self.first[0] + '.'
+
+
+# ------------------------------------------------
+# Example Usage
+# ------------------------------------------------
+emp_1 = CachedEmployee('John', 'Smith')
+print(emp_1.fullname, emp_1.email)  # computed and remembered
+print(emp_1.fullname, emp_1.email)  # remembered values, no str.format
+emp_1.fullname = 'Arsh Ansari'      # setter assigns first/last -> caches stale
+print(emp_1.fullname, emp_1.email)  # recomputed: Arsh Ansari Arsh.Ansari@company.com
+emp_1.last = 'User'                 # a direct assignment invalidates too
+print(emp_1.email)                  # Arsh.User@company.com
+del emp_1.fullname                  # deleter sets first/last to None
+print(emp_1.fullname)               # None None
+
+mgr_1 = CachedManager('Mohd_Arsh', 'Ansari')
+print(mgr_1.initial, mgr_1.email)
+mgr_1.first = 'Test'
+print(mgr_1.initial, mgr_1.email)   # T. Test.Ansari@company.com
+print("Has __dict__?", hasattr(emp_1, '__dict__'), hasattr(mgr_1, '__dict__'))
+
+
+# ------------------------------------------------
+# Benchmark: reading email + fullname 1M times
+# ------------------------------------------------
+N = 1_000_000
+
+
+def read_all(emp, rename_every=None):
+    start = time.perf_counter()
+    for i in range(N):
+        if rename_every and i % rename_every == 0:
+            emp.fullname = 'Test User'
+        emp.email
+        emp.fullname
+    return time.perf_counter() - start
+
+
+plain = read_all(Employee('Test', 'User'))
+cached = read_all(CachedEmployee('Test', 'User'))
+print(f"\n{N:,} x (email + fullname):")
+print(f"  @property, recomputed : {plain:.3f} s")
+print(f"  @cached_property      : {cached:.3f} s   ({plain / cached:.1f}x faster)")
+
+# Even with a rename every 10 reads the cache still wins
+plain = read_all(Employee('Test', 'User'), rename_every=10)
+cached = read_all(CachedEmployee('Test', 'User'), rename_every=10)
+print(f"  renamed every 10 reads: property {plain:.3f} s   cached {cached:.3f} s")
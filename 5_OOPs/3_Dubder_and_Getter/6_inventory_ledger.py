@@ -0,0 +1,341 @@
+'''
+InventoryLedger: the InventoryItem arithmetic from 2_Example.py, applied to a whole
+stock list (millions of items) in one operation instead of one object at a time.
+'''
+
+import math
+import time
+from array import array
+from itertools import repeat
+from operator import add, lt, mul, sub, truediv
+
+try:
+    import numpy as np  # optional: vectorized arithmetic
+except ImportError:
+    np = None
+
+
+class InventoryItem:
+    """
+    Same InventoryItem as in 2_Example.py (arithmetic part only).
+    """
+
+    def __init__(self, name: str, quantity: int):
+        self.name = name
+        self.quantity = quantity
+
+    def __repr__(self) -> str:
+        return f"InventoryItem(name='{self.name}', quantity={self.quantity})"
+
+    def __str__(self) -> str:
+        return f"{self.quantity} x {self.name}"
+
+    def __add__(self, other):
+        if isinstance(other, InventoryItem) and self.name == other.name:
+            return InventoryItem(self.name, self.quantity + other.quantity)
+        raise ValueError("Cannot add items of different types or names.")
+
+    def __sub__(self, other):
+        if isinstance(other, InventoryItem) and self.name == other.name:
+            if self.quantity >= other.quantity:
+                return InventoryItem(self.name, self.quantity - other.quantity)
+            raise ValueError("Cannot subtract more than the available quantity.")
+        raise ValueError("Cannot subtract items of different types.")
+
+    def __mul__(self, factor):
+        if isinstance(factor, (int, float)):
+            return InventoryItem(self.name, int(self.quantity * factor))
+        raise ValueError("Multiplication factor must be a number.")
+
+    def __truediv__(self, factor):
+        if isinstance(factor, (int, float)) and factor != 0:
+            return InventoryItem(self.name, int(self.quantity / factor))
+        raise ValueError("Division factor must be a non-zero number.")
+
+
+class InventoryLedger:
+    """
+    Stock levels for many items: the names in one tuple, the quantities in one
+    packed array (a NumPy int64 array if NumPy is installed, else array('q')).
+    Supports:
+      - ledger + other, ledger - other: other is a ledger (the same items, or a
+        batch of some of them, e.g. a delivery or an order) or an InventoryItem
+      - ledger * factor, ledger / factor: factor is a number, or one per item
+      - the in-place forms +=, -=, *=, /=, which update this ledger itself
+      - ledger['Widget'] -> InventoryItem, len(ledger), iteration
+
+    The rules are InventoryItem's, checked for the whole operation before
+    anything changes: names must match, stock never goes below zero, factors
+    must be numbers and divisors non-zero. Results share the names tuple with
+    the ledger they came from, so matching names is usually one `is` check.
+    """
+
+    def __init__(self, names, quantities):
+        """
+        :param names: Item names, each at most once
+        :param quantities: Number in stock of each item, in the same order
+        """
+        self.names = tuple(names)
+        self.quantities = _to_array(quantities)
+        if len(self.quantities) != len(self.names):
+            raise ValueError("Need exactly one quantity per name.")
+        self.index = {name: row for row, name in enumerate(self.names)}
+        if len(self.index) != len(self.names):
+            raise ValueError("Each name may appear only once in a ledger.")
+
+    @classmethod
+    def from_items(cls, items):
+        """
+        Build a ledger from InventoryItem objects.
+        """
+        items = list(items)
+        return cls([item.name for item in items], [item.quantity for item in items])
+
+    def _derived(self, quantities):
+        # A ledger over the same items (names and index shared, not copied)
+        ledger = object.__new__(type(self))
+        ledger.names, ledger.index, ledger.quantities = self.names, self.index, quantities
+        return ledger
+
+    def __repr__(self) -> str:
+        return f"InventoryLedger({len(self)} items)"
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, name):
+        return InventoryItem(name, int(self.quantities[self.index[name]]))
+
+    def __iter__(self):
+        return map(InventoryItem, self.names, map(int, self.quantities))
+
+    # -----------------------------
+    # Adding and subtracting stock
+    # -----------------------------
+    def _align(self, other, message):
+        """
+        Match other's items to rows of this ledger.
+
+        :return: (rows, amounts); rows is None when other has exactly our items, in order
+        """
+        if isinstance(other, InventoryItem):
+            other = InventoryLedger([other.name], [other.quantity])
+        if not isinstance(other, InventoryLedger):
+            raise ValueError(message)
+        if other.names is self.names or other.names == self.names:
+            return None, other.quantities
+        try:
+            rows = [self.index[name] for name in other.names]
+        except KeyError as e:
+            raise ValueError(f"{message[:-1]} ({e.args[0]!r} is not in this ledger).") from None
+        return (rows if np is None else np.array(rows, dtype=np.intp)), other.quantities
+
+    def _add(self, other, in_place, subtract=False):
+        if subtract:
+            rows, amounts = self._align(other, "Cannot subtract items of different types.")
+        else:
+            rows, amounts = self._align(other, "Cannot add items of different types or names.")
+        quantities = self.quantities
+        current = quantities if rows is None else _take(quantities, rows)
+        if subtract:
+            _check_stock(self, rows, current, amounts)
+
+        if np is not None:
+            result = quantities if in_place else quantities.copy()
+            if rows is None:
+                (np.subtract if subtract else np.add)(result, amounts, out=result)
+            else:
+                result[rows] = current - amounts if subtract else current + amounts
+            return result
+        op = sub if subtract else add
+        if rows is None:
+            return array('q', map(op, quantities, amounts))
+        result = quantities if in_place else array('q', quantities)
+        for row, amount in zip(rows, amounts):
+            result[row] = op(result[row], amount)
+        return result
+
+    def __add__(self, other):
+        """
+        Restock: a new ledger with other's quantities added.
+        """
+        return self._derived(self._add(other, in_place=False))
+
+    def __iadd__(self, other):
+        self.quantities = self._add(other, in_place=True)
+        return self
+
+    def __sub__(self, other):
+        """
+        Take an order out of stock: a new ledger with other's quantities subtracted.
+        No item may go below zero (nothing is subtracted if one would).
+        """
+        return self._derived(self._add(other, in_place=False, subtract=True))
+
+    def __isub__(self, other):
+        self.quantities = self._add(other, in_place=True, subtract=True)
+        return self
+
+    # -----------------------------
+    # Scaling
+    # -----------------------------
+    def _scale(self, factor, in_place, divide=False):
+        if divide:
+            factor = _check_factors(factor, len(self), "Division factor must be a non-zero number.", divide)
+        else:
+            factor = _check_factors(factor, len(self), "Multiplication factor must be a number.", divide)
+        quantities = self.quantities
+
+        if np is not None:
+            # Float results are cut to whole items like int() does (towards zero)
+            result = quantities if in_place else np.empty_like(quantities)
+            (np.true_divide if divide else np.multiply)(quantities, factor, out=result, casting='unsafe')
+            return result
+        factors = repeat(factor) if isinstance(factor, (int, float)) else factor
+        return array('q', map(int, map(truediv if divide else mul, quantities, factors)))
+
+    def __mul__(self, factor):
+        """
+        Scale every quantity by factor (a number, or one number per item).
+        """
+        return self._derived(self._scale(factor, in_place=False))
+
+    def __imul__(self, factor):
+        self.quantities = self._scale(factor, in_place=True)
+        return self
+
+    def __truediv__(self, factor):
+        """
+        Divide every quantity by factor (a non-zero number, or one per item).
+        """
+        return self._derived(self._scale(factor, in_place=False, divide=True))
+
+    def __itruediv__(self, factor):
+        self.quantities = self._scale(factor, in_place=True, divide=True)
+        return self
+
+
+def _to_array(values):
+    # A new packed int64 array from any iterable of whole numbers
+    if np is not None:
+        if isinstance(values, np.ndarray):
+            return values.astype(np.int64)
+        return np.fromiter(values, dtype=np.int64)
+    return array('q', values)
+
+
+def _take(quantities, rows):
+    if np is not None:
+        return quantities[rows]
+    return array('q', map(quantities.__getitem__, rows))
+
+
+def _check_stock(ledger, rows, current, amounts):
+    # Same rule as InventoryItem.__sub__, for every item at once
+    if np is not None:
+        short = np.flatnonzero(current < amounts)
+        first = int(short[0]) if len(short) else None
+    else:
+        first = next((i for i, too_few in enumerate(map(lt, current, amounts)) if too_few), None)
+    if first is not None:
+        name = ledger.names[first if rows is None else rows[first]]
+        raise ValueError(f"Cannot subtract more than the available quantity "
+                         f"({name!r}: {current[first]} in stock, {amounts[first]} requested).")
+
+
+def _check_factors(factor, count, message, divide):
+    # Same rule as InventoryItem.__mul__ / __truediv__, for one factor or one per item.
+    # inf and nan are refused too: the result would not be a whole number of items
+    if isinstance(factor, (int, float)):
+        if isinstance(factor, float) and not math.isfinite(factor):
+            raise ValueError(message)
+        if divide and factor == 0:
+            raise ValueError(message)
+        return factor
+    if np is not None:
+        factors = np.asarray(factor)
+        if factors.shape != (count,) or factors.dtype.kind not in 'biuf':
+            raise ValueError(message)
+        if factors.dtype.kind == 'f' and not np.isfinite(factors).all():
+            raise ValueError(message)
+        if divide and not factors.all():
+            raise ValueError(message)
+        return factors
+    factors = list(factor)
+    if len(factors) != count or not all(isinstance(f, (int, float)) for f in factors):
+        raise ValueError(message)
+    if not all(map(math.isfinite, (f for f in factors if isinstance(f, float)))):
+        raise ValueError(message)
+    if divide and 0 in factors:
+        raise ValueError(message)
+    return factors
+
+
+# ------------------------------------------------
+# Example Usage
+# ------------------------------------------------
+stock = InventoryLedger(["Widget", "Gadget", "Gizmo"], [10, 4, 7])
+delivery = InventoryLedger(["Gadget", "Gizmo"], [6, 3])
+
+stock = stock + delivery                     # restock two items in one call
+print("Restocked:", list(map(str, stock)))  # 10 x Widget, 10 x Gadget, 10 x Gizmo
+stock -= InventoryItem("Widget", 3)          # one item works too
+print("Widget:", stock["Widget"])           # 7 x Widget
+print("Doubled:", list(map(str, stock * 2)))
+print("Per-item factors:", list(map(str, stock / [7, 2, 5])))
+
+for bad in (lambda: stock - InventoryLedger(["Gizmo"], [99]),
+            lambda: stock + InventoryLedger(["Sprocket"], [1]),
+            lambda: stock / 0,
+            lambda: stock * float('nan'),
+            lambda: stock / [1, float('inf'), 1],
+            lambda: stock * "2"):
+    try:
+        bad()
+    except ValueError as e:
+        print("ValueError:", e)
+print("Unchanged after the failed operations:", list(map(str, stock)))
+
+
+# ------------------------------------------------
+# Benchmark: 1M SKUs, InventoryItem objects vs one ledger
+# ------------------------------------------------
+N = 1_000_000
+names = [f"SKU{i:07d}" for i in range(N)]
+counts = [(i * 7919) % 500 + 100 for i in range(N)]
+order_rows = range(0, N, 10)  # an order for every 10th SKU
+
+items = list(map(InventoryItem, names, counts))
+incoming = list(map(InventoryItem, names, repeat(50)))
+order = [InventoryItem(names[row], 80) for row in order_rows]
+
+ledger = InventoryLedger(names, counts)
+incoming_ledger = InventoryLedger(names, repeat(50, N))
+order_ledger = InventoryLedger([names[row] for row in order_rows], repeat(80, len(order_rows)))
+
+
+def timed(label, per_item, whole):
+    start = time.perf_counter()
+    expected = per_item()
+    items_s = time.perf_counter() - start
+    start = time.perf_counter()
+    result = whole()
+    ledger_s = time.perf_counter() - start
+    assert list(map(int, result.quantities)) == [item.quantity for item in expected]
+    print(f"{label:24} items {items_s * 1000:8.1f} ms   ledger {ledger_s * 1000:7.1f} ms   "
+          f"({items_s / ledger_s:.0f}x)")
+    return expected, result
+
+
+def take_order(stock):
+    stock = list(stock)
+    for row, item in zip(order_rows, order):
+        stock[row] = stock[row] - item
+    return stock
+
+
+print(f"\n{N:,} SKUs ({'NumPy' if np is not None else 'array module'})")
+items, ledger = timed("restock (+)", lambda: list(map(add, items, incoming)), lambda: ledger + incoming_ledger)
+items, ledger = timed("order batch (-)", lambda: take_order(items), lambda: ledger - order_ledger)
+timed("scale (* 1.5)", lambda: [item * 1.5 for item in items], lambda: ledger * 1.5)
+timed("split (/ 4)", lambda: [item / 4 for item in items], lambda: ledger / 4)
@@ -0,0 +1,168 @@
+"""
+Compact Employee / Developer / Manager with __slots__.
+
+The classes in 2_2_inheritance.py give every instance its own __dict__ and
+store `email`, a string that only repeats first and last. With a million
+employees that adds up. This version:
+
+  - declares __slots__, so instances have fixed attribute slots and no __dict__
+    (each subclass lists only the slots it adds);
+  - computes `email` on access with @property, as in 3_Dubder_and_Getter/3_Getter_Setter.py;
+  - interns first/last names and programming languages with sys.intern(), so
+    the thousands of employees called "Smith" or coding in "Python" share one
+    string object instead of each holding an equal copy.
+
+The benchmark at the bottom uses tracemalloc to measure bytes per instance for
+1M developers, before (dict-based) and after (slotted).
+"""
+
+import sys
+import tracemalloc
+
+
+# ------------------------------------------------
+# Before: the classes from 2_2_inheritance.py
+# ------------------------------------------------
+class Employee:
+    raise_amt = 1.04
+    num_of_emps = 0
+
+    def __init__(self, first, last, pay):
+        self.first = first
+        self.last = last
+        self.pay = pay
+        self.email = f"{first}.{last}@company.com"
+
+        Employee.num_of_emps += 1
+
+    def full_name(self):
+        return f"{self.first} {self.last}"
+
+    def apply_raise(self):
+        self.pay = int(self.pay * self.raise_amt)
+        return self.pay
+
+
+class Developer(Employee):
+    raise_amt = 1.10
+
+    def __init__(self, first, last, pay, prog_lang):
+        super().__init__(first, last, pay)
+        self.prog_lang = prog_lang
+
+
+# ------------------------------------------------
+# After: slotted classes
+# ------------------------------------------------
+class SlottedEmployee:
+    # Only these attributes can exist on an instance; there is no __dict__.
+    # Class variables (raise_amt, num_of_emps) are unaffected, but an instance can
+    # no longer shadow one (emp.raise_amt = 1.10 raises AttributeError); add a
+    # 'raise_amt' slot if individual raises are needed.
+    __slots__ = ("first", "last", "pay")
+
+    raise_amt = 1.04
+    num_of_emps = 0
+
+    def __init__(self, first, last, pay):
+        # Equal names share one string object
+        self.first = sys.intern(first)
+        self.last = sys.intern(last)
+        self.pay = pay
+
+        SlottedEmployee.num_of_emps += 1
+
+    @property  # Getter for email: built when asked for, never stored
+    def email(self):
+        return f"{self.first}.{self.last}@company.com"
+
+    def full_name(self):
+        return f"{self.first} {self.last}"
+
+    def apply_raise(self):
+        self.pay = int(self.pay * self.raise_amt)
+        return self.pay
+
+
+class SlottedDeveloper(SlottedEmployee):
+    # Subclasses list only their NEW slots; the parent's are inherited
+    __slots__ = ("prog_lang",)
+
+    raise_amt = 1.10
+
+    def __init__(self, first, last, pay, prog_lang):
+        super().__init__(first, last, pay)
+        self.prog_lang = sys.intern(prog_lang)
+
+
+class SlottedManager(SlottedEmployee):
+    __slots__ = ("employees",)
+
+    def __init__(self, first, last, pay, employees=None):
+        super().__init__(first, last, pay)
+        self.employees = [] if employees is None else employees
+
+    def add_emp(self, emp):
+        if emp not in self.employees:
+            self.employees.append(emp)
+
+    def remove_emp(self, emp):
+        if emp in self.employees:
+            self.employees.remove(emp)
+
+    def print_emps(self):
+        for emp in self.employees:
+            print('-->', emp.full_name())
+
+
+# ------------------------------------------------
+# Example Usage
+# ------------------------------------------------
+dev_1 = SlottedDeveloper('Arsh', 'Ansari', 50000, 'Python')
+dev_2 = SlottedDeveloper('Test', 'User', 60000, 'C++')
+mgr_1 = SlottedManager('Mohd_Arsh', 'Ansari', 90000, [dev_1])
+mgr_1.add_emp(dev_2)
+
+print("Manager email:", mgr_1.email)            # computed by the property
+mgr_1.print_emps()
+dev_1.apply_raise()
+print("Developer pay after raise:", dev_1.pay)  # 55000, Developer.raise_amt = 1.10
+
+print("Has __dict__?", hasattr(dev_1, '__dict__'))                # False
+print("Same 'Ansari' object?", dev_1.last is mgr_1.last)          # True, interned
+try:
+    dev_1.salary = 1  # not a slot
+except AttributeError as e:
+    print("AttributeError:", e)
+
+
+# ------------------------------------------------
+# Benchmark: memory for 1M developers
+# ------------------------------------------------
+# Rows arrive as freshly built strings (as if parsed from a file), so equal
+# names are separate objects until interned ( ''.join copies the language name).
+# tracemalloc records every allocation, so this part takes a while to run.
+N = 1_000_000
+LANGS = ['Python', 'C++', 'Java', 'Go', 'Rust']
+
+
+def build(cls):
+    return [cls(f"First{i % 5000}", f"Last{i % 7919}", 30000 + i % 90000, ''.join(LANGS[i % 5]))
+            for i in range(N)]
+
+
+def bytes_per_instance(cls):
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    staff = build(cls)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del staff
+    return (after - before) / N
+
+
+dict_based = bytes_per_instance(Developer)
+slotted = bytes_per_instance(SlottedDeveloper)
+print(f"\n{N:,} developers, bytes per instance (object + its strings + list slot):")
+print(f"  __dict__ + stored email : {dict_based:7.1f}")
+print(f"  __slots__ + interning   : {slotted:7.1f}   ({dict_based / slotted:.1f}x smaller)")
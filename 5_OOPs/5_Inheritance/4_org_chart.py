@@ -0,0 +1,309 @@
+"""
+Org chart: Manager.employees as an ordered set, plus multi-level reporting lines.
+
+In 2_2_inheritance.py, Manager.employees is a list, so add_emp() (`emp not in
+list`) and remove_emp() (`list.remove`) scan the whole team: O(n) each, O(n²)
+to build a team of n.
+
+Here:
+  - Manager.employees is a dict used as an insertion-ordered set (keys only,
+    values None): membership, add and remove are O(1) hash lookups, and
+    iteration still goes in the order people were added.
+  - OrgChart links managers into a hierarchy and keeps, for every manager,
+    the set of ALL people under them (the transitive closure). all_reports()
+    and is_under() are then single lookups instead of a walk down the tree.
+    The closure is updated incrementally: adding or moving someone only
+    touches the managers above them.
+"""
+
+import time
+
+
+class Employee:
+    # Same Employee as in 2_2_inheritance.py
+    raise_amt = 1.04
+    num_of_emps = 0
+
+    def __init__(self, first, last, pay):
+        self.first = first
+        self.last = last
+        self.pay = pay
+        self.email = f"{first}.{last}@company.com"
+
+        Employee.num_of_emps += 1
+
+    def full_name(self):
+        return f"{self.first} {self.last}"
+
+    def apply_raise(self):
+        self.pay = int(self.pay * self.raise_amt)
+        return self.pay
+
+
+class Developer(Employee):
+    raise_amt = 1.10
+
+    def __init__(self, first, last, pay, prog_lang):
+        super().__init__(first, last, pay)
+        self.prog_lang = prog_lang
+
+
+class Manager(Employee):
+    # Direct reports in a dict used as an ordered set: {emp: None, ...}
+    def __init__(self, first, last, pay, employees=None):
+        super().__init__(first, last, pay)
+        self.employees = dict.fromkeys(employees or ())
+
+    def add_emp(self, emp):
+        self.employees[emp] = None  # O(1); adding someone twice keeps one entry
+
+    def remove_emp(self, emp):
+        self.employees.pop(emp, None)  # O(1); no error if they were not there
+
+    def print_emps(self):
+        for emp in self.employees:
+            print('-->', emp.full_name())
+
+
+class OrgChart:
+    """
+    Reporting lines between employees, with precomputed "everyone under X" sets.
+    """
+
+    def __init__(self):
+        self.manager_of = {}  # emp -> their manager (None at the top)
+        self.under = {}       # manager -> {everyone below them, at any depth: None}
+
+    def managers_above(self, emp):
+        """
+        emp's manager, their manager, ... up to the top.
+        """
+        chain = []
+        manager = self.manager_of.get(emp)
+        while manager is not None:
+            chain.append(manager)
+            manager = self.manager_of.get(manager)
+        return chain
+
+    def _subtree(self, emp):
+        # emp plus everyone under them, as an ordered set
+        return {emp: None, **self.under.get(emp, {})}
+
+    def _check_manager(self, manager):
+        if manager is not None:
+            if manager not in self.manager_of:
+                raise ValueError(f"{manager.full_name()} is not in the chart")
+            if not isinstance(manager, Manager):
+                raise TypeError("only a Manager can have reports")
+
+    def _existing_team(self, emp):
+        # Everyone already in emp.employees, at any depth: {report: their manager}
+        team, todo = {}, [emp]
+        while todo:
+            boss = todo.pop()
+            for report in boss.employees if isinstance(boss, Manager) else ():
+                if report is emp or report in team or report in self.manager_of:
+                    raise ValueError(f"{report.full_name()} is already in the chart")
+                team[report] = boss
+                todo.append(report)
+        return team
+
+    def add(self, emp, manager=None):
+        """
+        Put emp into the chart, reporting to manager. If emp is a Manager who
+        already has a team (Manager.employees), the whole team comes along.
+        """
+        if emp in self.manager_of:
+            raise ValueError(f"{emp.full_name()} is already in the chart; use move()")
+        self._check_manager(manager)
+        team = self._existing_team(emp)  # checked before anything changes
+
+        self.manager_of[emp] = None  # attached to manager below, once the team is in
+        for person in (emp, *team):
+            if isinstance(person, Manager):
+                self.under.setdefault(person, {})
+        for report, boss in team.items():
+            self.manager_of[report] = boss
+            for above in (boss, *self.managers_above(boss)):
+                self.under[above][report] = None
+        if manager is not None:
+            self.manager_of[emp] = manager
+            self._attach(emp, manager)
+
+    def _attach(self, emp, manager):
+        manager.add_emp(emp)
+        subtree = self._subtree(emp)
+        for above in (manager, *self.managers_above(manager)):
+            self.under[above].update(subtree)
+
+    def _detach(self, emp):
+        manager = self.manager_of[emp]
+        if manager is None:
+            return
+        manager.remove_emp(emp)
+        subtree = self._subtree(emp)
+        for above in (manager, *self.managers_above(manager)):
+            closure = self.under[above]
+            for person in subtree:
+                del closure[person]
+
+    def move(self, emp, new_manager):
+        """
+        emp (with their whole team) now reports to new_manager.
+        """
+        if emp not in self.manager_of:
+            raise ValueError(f"{emp.full_name()} is not in the chart; use add()")
+        self._check_manager(new_manager)  # all checks first, so a bad move changes nothing
+        if new_manager is emp or new_manager in self.under.get(emp, ()):
+            raise ValueError("cannot report to yourself or to someone under you")
+        self._detach(emp)
+        self.manager_of[emp] = new_manager
+        if new_manager is not None:
+            self._attach(emp, new_manager)
+
+    def remove(self, emp):
+        """
+        emp leaves; their direct reports now report to emp's manager.
+        """
+        manager = self.manager_of[emp]
+        direct = list(emp.employees) if isinstance(emp, Manager) else []
+        for above in self.managers_above(emp):
+            del self.under[above][emp]  # everyone else stays under the same people
+        if manager is not None:
+            manager.remove_emp(emp)
+        for report in direct:
+            self.manager_of[report] = manager
+            if manager is not None:
+                manager.add_emp(report)
+        del self.manager_of[emp]
+        self.under.pop(emp, None)
+
+    def all_reports(self, manager):
+        """
+        Everyone under manager at any level, as a read-only view (no copying).
+        """
+        return self.under[manager].keys()
+
+    def is_under(self, emp, manager):
+        return emp in self.under.get(manager, ())
+
+
+# ------------------------------------------------
+# Example Usage
+# ------------------------------------------------
+dev_1 = Developer('Arsh', 'Ansari', 50000, 'Python')
+dev_2 = Developer('Test', 'User', 60000, 'C++')
+dev_3 = Developer('Another', 'User', 70000, 'Java')
+lead = Manager('Team', 'Lead', 80000)
+cto = Manager('Mohd_Arsh', 'Ansari', 90000)
+
+org = OrgChart()
+org.add(cto)
+org.add(lead, cto)
+for dev in (dev_1, dev_2, dev_3):
+    org.add(dev, lead)
+
+print("Lead's team:")
+lead.print_emps()
+print("Everyone under the CTO:", [emp.full_name() for emp in org.all_reports(cto)])
+print("Is dev_1 under the CTO?", org.is_under(dev_1, cto))
+
+try:
+    org.move(dev_1, dev_3)  # a Developer has no reports: refused, nothing changes
+except TypeError as e:
+    print("TypeError:", e)
+
+org.move(dev_2, cto)     # dev_2 now reports straight to the CTO
+org.remove(lead)         # the lead leaves; their team moves up to the CTO
+print("\nAfter the lead left:")
+cto.print_emps()
+print("dev_1's chain of command:", [m.full_name() for m in org.managers_above(dev_1)])
+
+# A Manager who already has a team brings it along
+new_lead = Manager('New', 'Lead', 85000, [Developer('Team', 'Member', 55000, 'Go')])
+org.add(new_lead, cto)
+print("Under the new lead:", [emp.full_name() for emp in org.all_reports(new_lead)])
+print("Everyone under the CTO:", len(org.all_reports(cto)))
+
+
+# ------------------------------------------------
+# Benchmark: 100k reports
+# ------------------------------------------------
+N = 100_000
+people = [Developer(f"Dev{i}", "User", 50000, "Python") for i in range(N)]
+
+
+def list_team(staff):
+    # The old Manager: a list with `not in` before every append
+    team = []
+    for emp in staff:
+        if emp not in team:
+            team.append(emp)
+    return team
+
+
+# 1) One manager, 100k direct reports
+SMALL = 10_000  # the list version is quadratic; time it on fewer people and scale up
+start = time.perf_counter()
+list_team(people[:SMALL])
+list_s = (time.perf_counter() - start) * (N / SMALL) ** 2
+
+boss = Manager('Big', 'Boss', 200000)
+start = time.perf_counter()
+for emp in people:
+    boss.add_emp(emp)
+set_s = time.perf_counter() - start
+start = time.perf_counter()
+for emp in people[::2]:
+    boss.remove_emp(emp)
+remove_s = time.perf_counter() - start
+
+print(f"\nOne manager, {N:,} direct reports:")
+print(f"  build, list     : ~{list_s:7.1f} s  (measured on {SMALL:,}, O(n²) scaled)")
+print(f"  build, dict-set : {set_s:8.3f} s")
+print(f"  remove {N // 2:,}  : {remove_s:8.3f} s")
+
+# 2) Five-level hierarchy: 1 CEO -> 10 -> 100 -> 1,000 -> 10,000 managers -> 100k developers
+org = OrgChart()
+ceo = Manager('C', 'EO', 300000)
+org.add(ceo)
+level, start = [ceo], time.perf_counter()
+for depth in range(4):
+    next_level = []
+    for i in range(len(level) * 10):
+        manager = Manager(f"M{depth}", str(i), 100000)
+        org.add(manager, level[i % len(level)])
+        next_level.append(manager)
+    level = next_level
+for i, emp in enumerate(people):
+    org.add(emp, level[i % len(level)])
+build_s = time.perf_counter() - start
+
+
+def walk(manager):
+    # What all_reports() would cost without the closure: visit the whole subtree
+    found = []
+    for emp in manager.employees:
+        found.append(emp)
+        if isinstance(emp, Manager):
+            found.extend(walk(emp))
+    return found
+
+
+start = time.perf_counter()
+assert len(walk(ceo)) == len(org.all_reports(ceo))
+walk_s = time.perf_counter() - start
+start = time.perf_counter()
+hits = sum(org.is_under(emp, ceo) for emp in people)
+lookup_s = (time.perf_counter() - start) / N
+
+middle = next(iter(next(iter(ceo.employees)).employees))  # a level-2 manager
+start = time.perf_counter()
+org.move(middle, ceo)
+move_s = time.perf_counter() - start
+
+print(f"\n{len(org.manager_of):,} people in a 5-level org chart:")
+print(f"  build with closure          : {build_s:8.3f} s")
+print(f"  everyone under CEO, walk    : {walk_s:8.3f} s   closure: one dict lookup")
+print(f"  is_under(emp, CEO)          : {lookup_s * 1e9:8.0f} ns each ({hits:,} hits)")
+print(f"  move a {len(org.all_reports(middle)):,}-person team   : {move_s * 1000:8.2f} ms")
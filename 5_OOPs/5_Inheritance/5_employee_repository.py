@@ -0,0 +1,361 @@
+"""
+EmployeeRepository: find employees by email, last name, pay range or language.
+
+The other examples reach employees only through variables (emp_1, dev_1). To
+answer "who earns 60-80k?" or "which developers are called Smith?" in a large
+roster you would have to look at every single employee (a full scan).
+
+The repository keeps secondary indexes, like a database does:
+  - hash indexes  (email, last, prog_lang): key -> the employees with that key,
+    one dict lookup for an equality query;
+  - a sorted index (pay): a hash index whose distinct pays are also kept in
+    order, so a range query is two binary searches (bisect) plus a slice.
+
+find() has a small query planner: for every condition that has an index it
+asks how many employees would match, starts from the smallest candidate set,
+and checks the remaining conditions only on those candidates.
+
+Keeping the indexes correct: an Employee knows which repositories index it
+and tells them, in __setattr__, before and after any attribute changes. So
+apply_raise(), the fullname setter/deleter and plain assignments all keep the
+indexes in sync without the repository having to be called. New and vanished
+pay values are merged into the sorted index at the next range query: one by
+one if there are few, with a single re-sort if there are many (e.g. after a
+raise for everybody).
+"""
+
+import time
+from bisect import bisect_left, bisect_right, insort
+
+
+class Employee:
+    # Employee from 2_2_inheritance.py, with the fullname property from 3_Getter_Setter.py
+    raise_amt = 1.04
+    num_of_emps = 0
+    _watchers = ()  # repositories indexing this employee (set by EmployeeRepository.add)
+
+    def __init__(self, first, last, pay):
+        self.first = first
+        self.last = last
+        self.pay = pay
+
+        Employee.num_of_emps += 1
+
+    def __setattr__(self, name, value):
+        # Every attribute assignment (self.pay = ..., emp.last = ...) comes through here
+        if not self._watchers:
+            object.__setattr__(self, name, value)
+            return
+        for repo in self._watchers:
+            repo._before_change(self, name)
+        object.__setattr__(self, name, value)
+        for repo in self._watchers:
+            repo._after_change(self, name)
+
+    @property  # Getter for email (computed, so it can never disagree with first/last)
+    def email(self):
+        return f"{self.first}.{self.last}@company.com"
+
+    @property
+    def fullname(self):
+        return f"{self.first} {self.last}"
+
+    @fullname.setter
+    def fullname(self, name):
+        self.first, self.last = name.split(' ')
+
+    @fullname.deleter
+    def fullname(self):
+        self.first = None
+        self.last = None
+
+    def full_name(self):
+        return self.fullname
+
+    def apply_raise(self):
+        self.pay = int(self.pay * self.raise_amt)
+        return self.pay
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.first!r}, {self.last!r}, {self.pay})"
+
+
+class Developer(Employee):
+    raise_amt = 1.10
+
+    def __init__(self, first, last, pay, prog_lang):
+        super().__init__(first, last, pay)
+        self.prog_lang = prog_lang
+
+
+class HashIndex:
+    """
+    key -> {employee: None, ...} for equality lookups.
+    """
+    ranges = False  # can it answer (lo, hi) conditions?
+
+    def __init__(self, name):
+        self.name = name
+        self.buckets = {}
+
+    def key(self, emp):
+        return getattr(emp, self.name, None)  # plain Employees have no prog_lang
+
+    def add(self, emp):
+        self.buckets.setdefault(self.key(emp), {})[emp] = None
+
+    def discard(self, emp):
+        key = self.key(emp)
+        bucket = self.buckets[key]
+        del bucket[emp]
+        if not bucket:
+            del self.buckets[key]
+
+    def estimate(self, value):
+        return len(self.buckets.get(value, ()))
+
+    def lookup(self, value):
+        return self.buckets.get(value, {}).keys()
+
+
+class SortedIndex(HashIndex):
+    """
+    A HashIndex that also keeps its distinct keys in order, for range lookups
+    (lo <= value <= hi): bisect finds the keys in range, the buckets give the employees.
+
+    Moving an employee between existing keys is just the two dict updates. Keys
+    that appear or disappear are collected and merged into the sorted list at the
+    next range query (one re-sort if there are many, e.g. after a raise for all).
+    None (no value) is kept in its bucket for equality lookups but is never in range.
+    """
+    ranges = True
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.keys = []
+        self.new_keys = set()
+        self.gone_keys = set()
+
+    def add(self, emp):
+        key = self.key(emp)
+        if key is not None and key not in self.buckets:
+            if key in self.gone_keys:
+                self.gone_keys.discard(key)  # still in self.keys
+            else:
+                self.new_keys.add(key)
+        super().add(emp)
+
+    def discard(self, emp):
+        super().discard(emp)
+        key = self.key(emp)
+        if key is not None and key not in self.buckets:
+            if key in self.new_keys:
+                self.new_keys.discard(key)  # never made it into self.keys
+            else:
+                self.gone_keys.add(key)
+
+    def _flush(self):
+        if not (self.new_keys or self.gone_keys):
+            return
+        keys = self.keys
+        if len(self.new_keys) + len(self.gone_keys) > len(keys) // 64:
+            self.keys = sorted(key for key in self.buckets if key is not None)
+        else:
+            for key in self.gone_keys:
+                del keys[bisect_left(keys, key)]
+            for key in self.new_keys:
+                insort(keys, key)
+        self.new_keys.clear()
+        self.gone_keys.clear()
+
+    def _keys_in(self, value):
+        if not isinstance(value, tuple):
+            return [value] if value in self.buckets else []
+        self._flush()
+        lo, hi = value
+        start = 0 if lo is None else bisect_left(self.keys, lo)
+        stop = len(self.keys) if hi is None else bisect_right(self.keys, hi)
+        return self.keys[start:stop]
+
+    def estimate(self, value):
+        return sum(map(len, map(self.buckets.__getitem__, self._keys_in(value))))
+
+    def lookup(self, value):
+        buckets = self.buckets
+        return [emp for key in self._keys_in(value) for emp in buckets[key]]
+
+
+class EmployeeRepository:
+    """
+    In-memory collection of employees with indexes and find().
+    """
+
+    def __init__(self, hash_indexes=('email', 'last', 'prog_lang'), sorted_indexes=('pay',)):
+        self.members = {}  # ordered set of every employee
+        self.indexes = {name: HashIndex(name) for name in hash_indexes}
+        self.indexes.update({name: SortedIndex(name) for name in sorted_indexes})
+        # Which indexes to update when an attribute is assigned (email is derived from first/last)
+        self.watched = {}
+        for name, index in self.indexes.items():
+            for attr in ('first', 'last') if name == 'email' else (name,):
+                self.watched.setdefault(attr, []).append(index)
+
+    def add(self, emp):
+        if emp in self.members:
+            return
+        self.members[emp] = None
+        for index in self.indexes.values():
+            index.add(emp)
+        emp._watchers = (*emp._watchers, self)
+
+    def extend(self, employees):
+        for emp in employees:
+            self.add(emp)
+
+    def remove(self, emp):
+        for index in self.indexes.values():
+            index.discard(emp)
+        del self.members[emp]
+        emp._watchers = tuple(repo for repo in emp._watchers if repo is not self)
+
+    def __len__(self):
+        return len(self.members)
+
+    def __iter__(self):
+        return iter(self.members)
+
+    def _before_change(self, emp, attr):
+        for index in self.watched.get(attr, ()):
+            index.discard(emp)
+
+    def _after_change(self, emp, attr):
+        for index in self.watched.get(attr, ()):
+            index.add(emp)
+
+    # ——— queries ———
+
+    def plan(self, **conditions):
+        """
+        Choose how to run find(**conditions).
+
+        :return: (name of the index to start from or None for a full scan, estimated rows)
+        """
+        best, rows = None, len(self.members)
+        for name, value in conditions.items():
+            index = self.indexes.get(name)
+            # A range on a hash-indexed field is checked on the candidates instead
+            if index is not None and (index.ranges or not isinstance(value, tuple)):
+                estimate = index.estimate(value)
+                if estimate < rows or best is None:
+                    best, rows = name, estimate
+        return best, rows
+
+    def find(self, **conditions):
+        """
+        Employees matching every condition. A tuple (lo, hi) means lo <= value <= hi
+        (either end may be None); anything else means equality.
+
+            repo.find(last='User', pay=(60000, 80000))
+        """
+        start, _ = self.plan(**conditions)
+        candidates = self.members if start is None else self.indexes[start].lookup(conditions[start])
+        rest = [(name, value) for name, value in conditions.items() if name != start]
+        if not rest:
+            return list(candidates)
+        return [emp for emp in candidates if all(_matches(emp, name, value) for name, value in rest)]
+
+    def scan(self, **conditions):
+        """
+        find() without indexes: look at every employee.
+        """
+        return [emp for emp in self.members
+                if all(_matches(emp, name, value) for name, value in conditions.items())]
+
+
+def _matches(emp, name, value):
+    actual = getattr(emp, name, None)
+    if isinstance(value, tuple):
+        lo, hi = value
+        return actual is not None and (lo is None or lo <= actual) and (hi is None or actual <= hi)
+    return actual == value
+
+
+# ------------------------------------------------
+# Example Usage
+# ------------------------------------------------
+dev_1 = Developer('Arsh', 'Ansari', 50000, 'Python')
+dev_2 = Developer('Test', 'User', 60000, 'C++')
+dev_3 = Developer('Another', 'User', 70000, 'Python')
+emp_1 = Employee('John', 'Smith', 65000)
+
+repo = EmployeeRepository()
+repo.extend([dev_1, dev_2, dev_3, emp_1])
+
+print(repo.find(email='Test.User@company.com'))
+print(repo.find(last='User', prog_lang='Python'), repo.plan(last='User', prog_lang='Python'))
+print(repo.find(pay=(55000, 70000)), repo.plan(pay=(55000, 70000)))
+
+dev_1.apply_raise()              # 50000 -> 55000: the pay index follows
+emp_1.fullname = 'John User'     # the last-name and email indexes follow
+print(repo.find(pay=(55000, 70000)))
+print(repo.find(last='User'))
+print(repo.find(email='John.Smith@company.com'), repo.find(email='John.User@company.com'))
+
+# Ranges on hash-indexed fields and employees without a pay give the same rows as a scan
+repo.add(Employee('No', 'Pay', None))
+for conditions in ({'last': ('A', 'T')}, {'last': ('A', 'T'), 'pay': (None, 60000)},
+                   {'prog_lang': ('C', 'Q')}, {'pay': None}, {'pay': (None, None)}):
+    assert sorted(map(id, repo.find(**conditions))) == sorted(map(id, repo.scan(**conditions))), conditions
+print(repo.find(last=('A', 'T')), repo.plan(last=('A', 'T')))
+
+
+# ------------------------------------------------
+# Benchmark: 1M employees, indexed find() vs full scan
+# ------------------------------------------------
+N = 1_000_000
+LANGS = ['Python', 'C++', 'Java', 'Go', 'Rust']
+repo = EmployeeRepository()
+start = time.perf_counter()
+repo.extend(Developer(f"First{i}", f"Last{i % 7919}", 30000 + (i * 7919) % 90000, LANGS[i % 5])
+            for i in range(N))
+repo.find(pay=(0, 0))  # sorts the pay values
+print(f"\nIndexed {len(repo):,} developers in {time.perf_counter() - start:.1f} s")
+
+queries = {
+    "email (unique)": {'email': f'First123456.Last{123456 % 7919}@company.com'},
+    "last name": {'last': 'Last42'},
+    "pay range (0.1%)": {'pay': (60000, 60089)},
+    "last + language": {'last': 'Last42', 'prog_lang': 'Rust'},
+    "language + pay range": {'prog_lang': 'Go', 'pay': (100000, 100100)},
+}
+print(f"{'query':22} {'plan':>16} {'rows':>6} {'find':>10} {'scan':>10} {'speedup':>9}")
+for label, conditions in queries.items():
+    found = repo.find(**conditions)
+    start = time.perf_counter()
+    for _ in range(100):
+        repo.find(**conditions)
+    find_s = (time.perf_counter() - start) / 100
+    start = time.perf_counter()
+    scanned = repo.scan(**conditions)
+    scan_s = time.perf_counter() - start
+    assert sorted(map(id, found)) == sorted(map(id, scanned))  # same rows, maybe another order
+    index, _ = repo.plan(**conditions)
+    print(f"{label:22} {index:>16} {len(found):6} {find_s * 1e6:8.1f}µs {scan_s * 1e3:8.1f}ms "
+          f"{scan_s / find_s:8.0f}x")
+
+# Mutations keep the indexes exact
+staff = list(repo)
+start = time.perf_counter()
+for emp in staff[:1000]:
+    emp.apply_raise()
+repo.find(pay=(0, 0))
+few_s = time.perf_counter() - start
+start = time.perf_counter()
+for emp in staff:
+    emp.apply_raise()
+repo.find(pay=(0, 0))
+all_s = time.perf_counter() - start
+staff[7].fullname = 'Renamed Person'
+assert sorted(map(id, repo.find(pay=(60000, 60089)))) == sorted(map(id, repo.scan(pay=(60000, 60089))))
+assert repo.find(email='Renamed.Person@company.com') == [staff[7]]
+print(f"\nRaise 1,000 employees + re-sync: {few_s * 1000:.1f} ms;  raise all {N:,}: {all_s:.1f} s")
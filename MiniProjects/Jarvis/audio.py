@@ -0,0 +1,195 @@
+"""
+One long-lived microphone stream for Jarvis.
+
+Every listening function used to open its own sr.Microphone(), so the input
+device was opened and closed on each loop iteration. That costs tens of
+milliseconds every time, and anything said while the device was closed (often
+the first syllable of a command) was lost.
+
+MicrophoneStream opens the device once. A capture thread copies every chunk
+into a ring buffer that holds the last few seconds of audio, and consumers read
+from that buffer, each through its own BufferedSource cursor:
+
+* a BufferedSource is an sr.AudioSource, so Recognizer.listen() and
+  adjust_for_ambient_noise() work on it unchanged;
+* iterating over it yields raw PCM chunks, which is what pipeline.Pipeline reads.
+
+A new source can start a little way back in the buffer (pre-roll), so speech
+that began just before someone started listening is kept.
+"""
+
+import threading
+
+import speech_recognition as sr
+
+from wakeword import SAMPLE_RATE, SAMPLE_WIDTH
+
+
+class RingBuffer:
+    """
+    Fixed number of audio chunks, oldest overwritten first; one writer, many readers.
+
+    Chunks are addressed by a sequence number that only grows, so a reader
+    that falls more than `capacity` chunks behind can tell it missed some.
+    """
+
+    def __init__(self, capacity):
+        self.slots = [b""] * capacity
+        self.end = 0  # sequence number of the next chunk to be written
+        self.closed = False
+        self.changed = threading.Condition()
+
+    @property
+    def start(self):
+        """
+        Sequence number of the oldest chunk still held.
+        """
+        return max(self.end - len(self.slots), 0)
+
+    def append(self, chunk):
+        with self.changed:
+            self.slots[self.end % len(self.slots)] = chunk
+            self.end += 1
+            self.changed.notify_all()
+
+    def close(self):
+        """
+        No more audio is coming; readers get b"" once they have caught up.
+        """
+        with self.changed:
+            self.closed = True
+            self.changed.notify_all()
+
+    def read(self, position):
+        """
+        Wait for the chunk at `position`.
+
+        :return: (chunk, next position, chunks skipped because the reader fell behind);
+                 chunk is b"" once the buffer is closed and drained
+        """
+        with self.changed:
+            while position >= self.end and not self.closed:
+                self.changed.wait()
+            if position >= self.end:
+                return b"", position, 0
+            skipped = max(self.start - position, 0)
+            position += skipped
+            return self.slots[position % len(self.slots)], position + 1, skipped
+
+
+class BufferedSource(sr.AudioSource):
+    """
+    A reader of a MicrophoneStream that speech_recognition can listen to.
+
+    It is its own `stream`: read() returns the next chunk from the ring buffer.
+    """
+
+    def __init__(self, microphone, preroll_ms=0):
+        """
+        :param microphone: The MicrophoneStream to read from
+        :param preroll_ms: Start this much audio before "now", if the buffer still has it
+        """
+        # sr.AudioSource.__init__ only raises NotImplementedError, so it is not called
+        self.SAMPLE_RATE = SAMPLE_RATE
+        self.SAMPLE_WIDTH = SAMPLE_WIDTH
+        self.CHUNK = microphone.chunk_samples
+        self.buffer = microphone.buffer
+        self.stream = self
+        preroll_chunks = preroll_ms // microphone.chunk_ms
+        self.position = max(self.buffer.end - preroll_chunks, self.buffer.start)
+        self.overruns = 0  # chunks lost because this reader fell too far behind
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass  # the device belongs to the MicrophoneStream and stays open
+
+    def read(self, size=None):
+        """
+        Next chunk of audio (`size` is ignored: chunks are always CHUNK frames).
+        """
+        chunk, self.position, skipped = self.buffer.read(self.position)
+        self.overruns += skipped
+        return chunk
+
+    def __iter__(self):
+        while True:
+            chunk = self.read()
+            if not chunk:
+                return
+            yield chunk
+
+
+class MicrophoneStream:
+    """
+    Keeps the input device open and feeds its audio into a RingBuffer.
+    """
+
+    def __init__(self, buffer_s=10, chunk_ms=20, device_index=None, chunks=None):
+        """
+        :param buffer_s: Seconds of audio kept for readers that fall behind or want pre-roll
+        :param chunk_ms: Size of each chunk read from the device
+        :param device_index: Input device to use (default device if None)
+        :param chunks: Iterable of PCM chunks to use instead of a microphone
+                       (e.g. pipeline.replay_chunks(...)), for headless runs
+        """
+        self.chunk_ms = chunk_ms
+        self.chunk_samples = SAMPLE_RATE * chunk_ms // 1000
+        self.device_index = device_index
+        self.chunks = chunks
+        self.buffer = RingBuffer(buffer_s * 1000 // chunk_ms)
+        self.stopping = threading.Event()
+        self.thread = None
+
+    def start(self):
+        """
+        Open the device and start capturing in the background.
+
+        :return: self
+        """
+        if self.chunks is None:
+            microphone = sr.Microphone(device_index=self.device_index, sample_rate=SAMPLE_RATE,
+                                       chunk_size=self.chunk_samples)
+            self.chunks = self._device_chunks(microphone)
+        self.thread = threading.Thread(target=self._capture, name="microphone", daemon=True)
+        self.thread.start()
+        return self
+
+    def _device_chunks(self, microphone):
+        with microphone as src:
+            while not self.stopping.is_set():
+                yield src.stream.read(src.CHUNK)
+
+    def _capture(self):
+        try:
+            for chunk in self.chunks:
+                if self.stopping.is_set():
+                    break
+                self.buffer.append(chunk)
+        except OSError as e:
+            print("Microphone stream failed:", e)
+        finally:
+            if hasattr(self.chunks, "close"):
+                self.chunks.close()  # leaves the sr.Microphone context, releasing the device
+            self.buffer.close()
+
+    def source(self, preroll_ms=0) -> BufferedSource:
+        """
+        A new reader, starting at the live edge (minus `preroll_ms`).
+        """
+        return BufferedSource(self, preroll_ms)
+
+    def close(self, timeout=None):
+        """
+        Stop capturing and release the device.
+        """
+        self.stopping.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,73 @@
+"""
+Benchmark: command dispatch time with 10, 1,000 and 100,000 registered commands.
+
+Compares the compiled registry (commands.CommandRegistry) with the old approach
+of checking every phrase with `phrase in cmd`, one after another.
+
+Usage:
+    python bench_commands.py
+"""
+
+import random
+import string
+import time
+
+from commands import Command, CommandRegistry
+
+
+def random_word(rng):
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 9)))
+
+
+def make_commands(n, rng):
+    phrases = {f"open {random_word(rng)} {random_word(rng)}" for _ in range(n)}
+    while len(phrases) < n:
+        phrases.add(f"open {random_word(rng)} {random_word(rng)}")
+    return [Command(phrase, f"Opening {phrase[5:]}") for phrase in sorted(phrases)]
+
+
+def per_call_us(fn, utterances, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for utterance in utterances:
+            fn(utterance)
+        best = min(best, time.perf_counter() - start)
+    return best / len(utterances) * 1e6
+
+
+def linear_scan(commands):
+    def match(cmd):
+        cmd = cmd.lower()
+        for command in commands:
+            if command.phrase in cmd:
+                return command
+        return None
+    return match
+
+
+if __name__ == "__main__":
+    rng = random.Random(0)
+    print(f"{'commands':>9} {'build s':>9} {'exact µs':>10} {'miss µs':>9} {'fuzzy µs':>10} "
+          f"{'fuzzy cached µs':>16} {'linear µs':>10}")
+
+    for n in (10, 1_000, 100_000):
+        commands = make_commands(n, rng)
+        start = time.perf_counter()
+        registry = CommandRegistry(commands)
+        build = time.perf_counter() - start
+
+        targets = [rng.choice(commands).phrase for _ in range(200)]
+        hits = [f"jarvis please {phrase} now" for phrase in targets]
+        misses = [f"what is the weather like in {random_word(rng)}" for _ in range(200)]
+        typos = [phrase[:-1] for phrase in targets]  # drop the last letter
+
+        exact = per_call_us(registry.match, hits)
+        miss = per_call_us(registry.match_exact, misses)
+        registry.correct_word.cache_clear()
+        fuzzy = per_call_us(registry.match, typos, repeat=1)
+        fuzzy_cached = per_call_us(registry.match, typos)
+        linear = per_call_us(linear_scan(commands), hits, repeat=1)
+
+        assert all(registry.match(u).phrase == p for u, p in zip(hits, targets))
+        print(f"{n:>9,} {build:>9.2f} {exact:>10.1f} {miss:>9.1f} {fuzzy:>10.1f} {fuzzy_cached:>16.1f} {linear:>10.1f}")
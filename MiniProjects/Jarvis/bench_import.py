@@ -0,0 +1,69 @@
+"""
+Benchmark: how long `import main` takes, and proof that it touches no hardware.
+
+Runs `python -X importtime -c "import main"` in a fresh interpreter and reports
+the total import time and the slowest modules. Fails (exit code 1) if the import
+takes longer than the budget, pulls in an audio/speech library, or starts a thread.
+
+Usage:
+    python bench_import.py
+    python bench_import.py --budget-ms 50 --runs 10
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Libraries that may only be loaded once Jarvis actually starts
+HEAVY = ["speech_recognition", "pocketsphinx", "pyttsx3", "win32com", "pythoncom", "sounddevice",
+         "pyaudio", "webbrowser"]
+
+PROBE = ("import sys, threading, main; "
+         "print(threading.active_count(), *[m for m in %r if m in sys.modules])" % HEAVY)
+
+
+def import_times():
+    """
+    :return: ({module: cumulative µs}, stdout of the probe)
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", PROBE],
+                            cwd=HERE, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times, result.stdout.split()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure and guard the import time of main.py.")
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="fail above this median")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    runs = [import_times() for _ in range(args.runs)]
+    totals = [times["main"] / 1000 for times, _ in runs]
+    times, (threads, *loaded) = runs[-1]
+
+    print(f"import main: median {statistics.median(totals):.1f} ms, best {min(totals):.1f} ms "
+          f"over {args.runs} runs (main's own imports only, not the interpreter)")
+    print("slowest modules (cumulative ms):")
+    for name, us in sorted(times.items(), key=lambda item: -item[1])[:8]:
+        print(f"  {us / 1000:8.1f}  {name}")
+
+    problems = []
+    if statistics.median(totals) > args.budget_ms:
+        problems.append(f"import took longer than {args.budget_ms:g} ms")
+    if loaded:
+        problems.append(f"import loaded {', '.join(loaded)}")
+    if int(threads) != 1:
+        problems.append(f"import started {int(threads) - 1} thread(s)")
+    for problem in problems:
+        print("FAIL:", problem)
+    sys.exit(1 if problems else 0)
@@ -0,0 +1,118 @@
+"""
+Benchmark: speech-to-text speed and memory on recorded utterances.
+
+Compares
+  * sphinx (per call)   sr.Recognizer.recognize_sphinx, which reloads the model every time
+  * offline (resident)  recognition.OfflineRecognizer, models loaded once per worker
+  * online              Google Web Speech API (only with --online; needs a network)
+
+and reports the real-time factor (RTF = processing time / audio length; below 1
+is faster than real time) one utterance at a time and with all utterances
+submitted to the worker pool at once, plus the memory the models take up.
+
+Usage:
+    python bench_recognizer.py recordings/*.wav
+    python bench_recognizer.py recordings/*.wav --workers 4 --online
+"""
+
+import argparse
+import statistics
+import time
+import tracemalloc
+
+import psutil
+import speech_recognition as sr
+
+from recognition import OfflineRecognizer, OnlineRecognizer
+
+
+def load_wav(path):
+    with sr.AudioFile(path) as source:
+        return sr.Recognizer().record(source)
+
+
+def duration(audio):
+    return len(audio.frame_data) / (audio.sample_rate * audio.sample_width)
+
+
+def rss_mb():
+    """
+    Resident memory of this process and its children (the offline workers), in MB.
+    """
+    process = psutil.Process()
+    return sum(p.memory_info().rss for p in [process, *process.children(recursive=True)]) / 2**20
+
+
+def timed(recognize, audio):
+    start = time.perf_counter()
+    try:
+        text = recognize(audio)
+    except sr.UnknownValueError:
+        text = ""
+    except sr.RequestError as e:
+        text = f"<error: {e}>"
+    return time.perf_counter() - start, text
+
+
+def sequential(recognize, utterances):
+    """
+    :return: (RTF per utterance, transcripts)
+    """
+    rtfs, texts = [], []
+    for audio in utterances:
+        elapsed, text = timed(recognize, audio)
+        rtfs.append(elapsed / duration(audio))
+        texts.append(text)
+    return rtfs, texts
+
+
+def pooled(recognizer, utterances):
+    """
+    Aggregate RTF with every utterance in flight at once.
+    """
+    start = time.perf_counter()
+    for job in [recognizer.submit(audio) for audio in utterances]:
+        job.result()
+    return (time.perf_counter() - start) / sum(map(duration, utterances))
+
+
+def row(name, load_s, rtfs, pool_rtf, memory_mb):
+    pool = f"{pool_rtf:.3f}" if pool_rtf is not None else "-"
+    print(f"{name:<19} {load_s:>7.2f} {statistics.median(rtfs):>9.3f} {max(rtfs):>8.3f} {pool:>9} {memory_mb:>8.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark speech-to-text backends on WAV files.")
+    parser.add_argument("wavs", nargs="+", help="recorded utterances")
+    parser.add_argument("--workers", type=int, default=2, help="offline worker processes")
+    parser.add_argument("--online", action="store_true", help="also time the Google API")
+    args = parser.parse_args()
+
+    utterances = [load_wav(path) for path in args.wavs]
+    print(f"{len(utterances)} utterance(s), {sum(map(duration, utterances)):.1f} s of audio\n")
+    print(f"{'backend':<19} {'load s':>7} {'RTF p50':>9} {'RTF max':>8} {'pool RTF':>9} {'RSS MB':>8}")
+
+    base = rss_mb()
+    rtfs, _ = sequential(sr.Recognizer().recognize_sphinx, utterances)
+    row("sphinx (per call)", 0.0, rtfs, None, rss_mb() - base)
+
+    base = rss_mb()
+    start = time.perf_counter()
+    offline = OfflineRecognizer(workers=args.workers)
+    load = time.perf_counter() - start
+    tracemalloc.start()
+    rtfs, texts = sequential(offline.recognize, utterances)
+    _, python_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    row("offline (resident)", load, rtfs, pooled(offline, utterances), rss_mb() - base)
+    offline.close()
+
+    if args.online:
+        online = OnlineRecognizer()
+        rtfs, _ = sequential(online.recognize, utterances)
+        row("online", 0.0, rtfs, None, 0)
+
+    print(f"\noffline: {args.workers} worker(s); peak Python heap in this process while "
+          f"recognizing {python_peak / 2**20:.1f} MB")
+    for path, text in zip(args.wavs, texts):
+        print(f"  {path}: {text!r}")
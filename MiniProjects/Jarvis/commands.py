@@ -0,0 +1,177 @@
+"""
+Command registry for Jarvis.
+
+Commands are loaded from a config file (commands.json) instead of being hard-coded
+as an `elif "open X" in cmd` chain. All trigger phrases are compiled into a single
+Aho-Corasick automaton, so finding which command an utterance contains is one
+pass over the utterance, however many commands are registered. As before, a
+phrase matches anywhere in the utterance, and if several match, the one listed
+first in the config wins.
+
+Near-misses from the speech recognizer ("open youtub") are handled by correcting
+unknown words against the vocabulary of all trigger phrases, using a
+symmetric-deletion index (every word with one character removed) and an LRU cache
+of previous corrections, then matching again.
+"""
+
+import json
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_CONFIG = Path(__file__).with_name("commands.json")
+
+
+@dataclass(frozen=True)
+class Command:
+    """
+    phrase: trigger phrase, lower case (e.g. "open youtube")
+    say:    what Jarvis answers
+    url:    web page to open, if any
+    """
+    phrase: str
+    say: str
+    url: Optional[str] = None
+
+
+def edit_distance(a: str, b: str) -> int:
+    """
+    Levenshtein distance between two strings.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def deletions(word: str):
+    """
+    The word itself plus every variant with one character removed.
+    """
+    return {word} | {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+class CommandRegistry:
+    """
+    Trigger phrases compiled into an Aho-Corasick automaton, plus a fuzzy word index.
+    """
+
+    def __init__(self, commands=(), max_distance=1, cache_size=4096):
+        """
+        :param commands: Iterable of Command, in priority order
+        :param max_distance: Largest edit distance accepted when correcting a word
+                             (candidates come from a one-deletion index, so values above 2 add nothing)
+        :param cache_size: Number of word corrections remembered
+        """
+        self.commands = list(commands)
+        self.max_distance = max_distance
+        self.correct_word = lru_cache(maxsize=cache_size)(self._correct_word)
+        self.compile()
+
+    @classmethod
+    def from_file(cls, path=DEFAULT_CONFIG, **options):
+        """
+        Load commands from a JSON file: a list of {"phrases", "say", "url"} objects,
+        where "phrases" lists every way of saying the command.
+        """
+        with open(path, encoding="utf-8") as f:
+            entries = json.load(f)
+        return cls([Command(phrase.lower(), entry["say"], entry.get("url"))
+                    for entry in entries for phrase in entry["phrases"]], **options)
+
+    def add(self, command: Command):
+        """
+        Register one more command (lowest priority) and recompile.
+        """
+        self.commands.append(command)
+        self.compile()
+
+    def compile(self):
+        """
+        Build the automaton and the fuzzy index from the registered commands.
+        """
+        # goto[state] maps a character to the next state; best[state] is the
+        # highest-priority (lowest index) command whose phrase ends at this state
+        # or at any state reachable through its failure links
+        goto, best = [{}], [None]
+        for priority, command in enumerate(self.commands):
+            state = 0
+            for char in command.phrase:
+                nxt = goto[state].get(char)
+                if nxt is None:
+                    nxt = goto[state][char] = len(goto)
+                    goto.append({})
+                    best.append(None)
+                state = nxt
+            if best[state] is None:
+                best[state] = priority
+
+        # Breadth-first pass to compute failure links
+        fail = [0] * len(goto)
+        pending = deque(goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for char, nxt in goto[state].items():
+                pending.append(nxt)
+                if state:
+                    f = fail[state]
+                    while f and char not in goto[f]:
+                        f = fail[f]
+                    fail[nxt] = goto[f].get(char, 0)
+                inherited = best[fail[nxt]]
+                if inherited is not None and (best[nxt] is None or inherited < best[nxt]):
+                    best[nxt] = inherited
+
+        self.goto, self.fail, self.best = goto, fail, best
+
+        # Fuzzy index: deletion variant -> vocabulary words that produce it
+        self.vocabulary = {word for command in self.commands for word in command.phrase.split()}
+        self.fuzzy_index = {}
+        for word in self.vocabulary:
+            for variant in deletions(word):
+                self.fuzzy_index.setdefault(variant, set()).add(word)
+        self.correct_word.cache_clear()
+
+    def match_exact(self, utterance: str) -> Optional[Command]:
+        """
+        Highest-priority command whose phrase occurs in the utterance, or None.
+        """
+        goto, fail, best = self.goto, self.fail, self.best
+        state, found = 0, None
+        for char in utterance.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            priority = best[state]
+            if priority is not None and (found is None or priority < found):
+                found = priority
+                if found == 0:
+                    break
+        return self.commands[found] if found is not None else None
+
+    def _correct_word(self, word: str) -> str:
+        if word in self.vocabulary:
+            return word
+        candidates = set()
+        for variant in deletions(word):
+            candidates |= self.fuzzy_index.get(variant, set())
+        scored = [(edit_distance(word, candidate), candidate) for candidate in candidates]
+        scored = [pair for pair in scored if pair[0] <= self.max_distance]
+        return min(scored)[1] if scored else word
+
+    def match(self, utterance: str) -> Optional[Command]:
+        """
+        Find the command for an utterance, retrying with corrected words on a miss.
+        """
+        command = self.match_exact(utterance)
+        if command is None:
+            corrected = " ".join(map(self.correct_word, utterance.lower().split()))
+            command = self.match_exact(corrected)
+        return command
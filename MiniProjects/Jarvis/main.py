@@ -1,116 +1,205 @@
-import time  # for adding delays
-import speech_recognition as sr  # speech-to-text via Google API
-import webbrowser  # to open web pages
-import win32com.client as wincl  # Windows COM interface for text-to-speech
+import os  # for configuration through environment variables
+import time  # for timing the listening window
+from functools import lru_cache  # one shared instance of each lazily created component
+from metrics import configure_from_env, metrics  # per-stage latency and error counters
+
+# Importing this module has no side effects: speech output, the microphone, the
+# recognizers and the command registry (and the heavy libraries behind them) are
+# created on first use by the get_*() accessors below, or all at once by start().
+# So process_command and friends import in milliseconds, with no audio hardware;
+# `python bench_import.py` keeps it that way.
 
 # ——— Setup —————————————————————————————————————————————————————
-# Create a Recognizer instance to capture and interpret audio input
-recognizer = sr.Recognizer()
 
-# Initialize the Windows SAPI text-to-speech engine
-speaker = wincl.Dispatch("SAPI.SpVoice")
-# Set the speaker volume (0 to 100)
-speaker.Volume = 100
-# Set the speaking rate (-10 to +10; 0 is default)
-speaker.Rate = 0
+@lru_cache(maxsize=None)
+def get_recognizer():
+    """
+    The sr.Recognizer used to listen; start() calibrates its energy threshold.
+    """
+    import speech_recognition as sr  # microphone calibration and listening
+
+    return sr.Recognizer()
+
+
+@lru_cache(maxsize=None)
+def get_command_recognizer():
+    """
+    Speech-to-text for the command stage: JARVIS_COMMAND_RECOGNIZER=online (Google, the
+    default), offline (PocketSphinx, models kept loaded in worker processes) or
+    fallback (Google, switching to offline whenever it is unreachable).
+    The wake-word stage is always recognized offline (see wakeword.py).
+    """
+    from recognition import make_recognizer  # online (Google) / offline (PocketSphinx) speech-to-text
+
+    return make_recognizer(os.environ.get("JARVIS_COMMAND_RECOGNIZER", "online"))
+
+
+@lru_cache(maxsize=None)
+def get_speech():
+    """
+    Text-to-speech, running on its own thread (see tts.py). The backend is Windows SAPI
+    on Windows and pyttsx3/espeak elsewhere; set JARVIS_TTS=sapi|pyttsx3|null to choose.
+    Phrases are synthesized once and replayed from an audio cache (see tts_cache.py);
+    JARVIS_TTS_CACHE sets its directory, or "off" to always synthesize live.
+    """
+    from tts import SpeechQueue  # pluggable, non-blocking text-to-speech
+    from tts_cache import DEFAULT_DIR, AudioCache  # replay repeated phrases from cached audio
+
+    cache_dir = os.environ.get("JARVIS_TTS_CACHE", str(DEFAULT_DIR))
+    return SpeechQueue(
+        backend=os.environ.get("JARVIS_TTS", "auto"),
+        volume=100,  # speaker volume (0 to 100)
+        rate=0,      # speaking rate (-10 to +10; 0 is default)
+        cache=None if cache_dir == "off" else AudioCache(cache_dir),
+    )
 
 
-def speak(text: str):
+def speak(text: str, interrupt: bool = False):
     """
-    Convert text to speech using Windows SAPI and pause briefly.
+    Queue text to be spoken and return immediately.
 
     :param text: The string to verbalize
-    :return: None (blocks until speech is finished)
+    :param interrupt: Cut off whatever Jarvis is currently saying first
+    :return: An Utterance handle; call .wait() to block until it has been spoken
     """
-    # Log the phrase for debugging
-    print(f"[speak] → {text!r}")
-    # Speak the phrase
-    speaker.Speak(text)
-    # Small delay to allow audio device to free up before listening again
-    time.sleep(0.3)
+    return get_speech().say(text, interrupt=interrupt)
+
+
+# ——— Microphone —————————————————————————————————————————————————
+
+@lru_cache(maxsize=None)
+def get_microphone():
+    """
+    The input device, opened once and kept open; everything reads from its ring
+    buffer (see audio.py), so no audio is lost between listening calls.
+    """
+    from audio import MicrophoneStream  # one always-open microphone feeding a ring buffer
+    from pipeline import CHUNK_MS
+
+    return MicrophoneStream(chunk_ms=CHUNK_MS).start()
 
 
 # ——— Ambient Noise Calibration —————————————————————————————————————
-# Capture 1 second of ambient audio to set a noise threshold
-# This improves speech recognition accuracy in noisy environments
-with sr.Microphone() as src:
-    recognizer.adjust_for_ambient_noise(src, duration=1)
+
+def start():
+    """
+    Load the recognizers, speech output and commands, open the microphone and
+    calibrate for ambient noise. Call once before listening.
+    """
+    # Offline recognizer worker processes are started before any other thread,
+    # including the metrics server and dump threads
+    get_command_recognizer()
+
+    # JARVIS_METRICS=1 records per-stage timings (see metrics.py)
+    configure_from_env()
+
+    get_command_registry()
+    get_speech()
+
+    # Capture 1 second of ambient audio to set a noise threshold
+    # This improves speech recognition accuracy in noisy environments
+    with metrics.timer("calibrate"):
+        get_recognizer().adjust_for_ambient_noise(get_microphone().source(), duration=1)
     print("Calibrated for ambient noise.")
 
 
 # ——— Command Processing ——————————————————————————————————————————
 
+@lru_cache(maxsize=None)
+def get_command_registry():
+    """
+    Trigger phrases, replies and URLs, loaded from commands.json (see commands.py).
+    """
+    from commands import CommandRegistry  # config-driven command matching
+
+    return CommandRegistry.from_file()
+
+
 def process_command(cmd: str):
     """
     Interpret a spoken command string and perform the corresponding action.
 
-    Supported commands:
-    - "open youtube": opens YouTube in the default browser
-    - "open google": opens Google
-    - "open facebook": opens Facebook
-    - "open twitter": opens X (formerly Twitter)
-    - "open github": opens GitHub
-    - "open stackoverflow": opens Stack Overflow
-    - "open chat gpt": opens ChatGPT website
-    - otherwise: informs the user the command was not understood
+    The command is looked up in the registry loaded from commands.json, e.g.
+    "open youtube" opens YouTube in the default browser. Small recognition
+    errors ("open youtub") are corrected by fuzzy matching. If nothing matches,
+    the user is told the command was not understood.
 
     :param cmd: Raw command string (case-insensitive)
     :return: None
     """
-    cmd = cmd.lower()  # normalize to lowercase for easier matching
-
-    if "open youtube" in cmd:
-        speak("Opening YouTube")
-        webbrowser.open("https://youtube.com")
-    elif "open google" in cmd:
-        speak("Opening Google")
-        webbrowser.open("https://google.com")
-    elif "open facebook" in cmd:
-        speak("Opening Facebook")
-        webbrowser.open("https://facebook.com")
-    elif "open twitter" in cmd:
-        speak("Opening Twitter")
-        webbrowser.open("https://x.com")  # X is the new Twitter domain
-    elif "open github" in cmd:
-        speak("Opening GitHub")
-        webbrowser.open("https://github.com")
-    elif "open stackoverflow" in cmd:
-        speak("Opening Stack Overflow")
-        webbrowser.open("https://stackoverflow.com")
-    elif "open chat gpt" in cmd:
-        speak("Opening Chat G P T")
-        webbrowser.open("https://chatgpt.com")
-    else:
+    command = get_command_registry().match(cmd)
+
+    if command is None:
         # No matching command found
         speak("Sorry, I didn't understand that command.")
+        return
+
+    speak(command.say)
+    if command.url:
+        import webbrowser  # to open web pages
+
+        webbrowser.open(command.url)
+
+
+# Everything Jarvis says besides the per-command replies
+FIXED_PHRASES = [
+    "Initializing Jarvis",
+    "Yes, Sir?",
+    "Sorry, I didn't catch that.",
+    "Sorry, I didn't understand that command.",
+    "Speech service is down.",
+    "Shutting down. Goodbye!",
+]
+
+
+def warm_speech_cache():
+    """
+    Pre-render every fixed phrase and command reply in the background, so even
+    the first reply of a session comes from the audio cache.
+    """
+    replies = [command.say for command in get_command_registry().commands]
+    get_speech().prepare(dict.fromkeys(FIXED_PHRASES + replies))
 
 
 # ——— Listening Functions ———————————————————————————————————————————
 
-def listen_for_wake_word() -> bool:
+# Local keyword spotter for the wake word, created on first use (see wakeword.py)
+wake_detector = None
+
+# Reader of the shared microphone buffer used by the two functions below. The
+# command is read from where the wake word ended, so nothing said in between is lost.
+listener = None
+
+
+def listen_for_wake_word(window: float = 4) -> bool:
     """
-    Listen for a short phrase and check if the wake word "jarvis" is spoken.
+    Stream microphone audio through the local wake-word detector.
 
-    Uses a small time limit to avoid long blocking listens.
+    Audio is checked chunk by chunk as it arrives, entirely offline (PocketSphinx);
+    nothing is sent to Google until the wake word has been heard. Returns after
+    `window` seconds without a detection so the main loop stays responsive.
 
+    :param window: Seconds to listen before giving up for this call
     :return: True if "jarvis" detected, False otherwise
     """
-    with sr.Microphone() as src:
-        print("Listening for wake word...")
-        audio = recognizer.listen(src, phrase_time_limit=4, timeout=3)
+    global wake_detector, listener
+    if wake_detector is None:
+        from wakeword import WakeWordDetector  # offline streaming wake-word spotting
 
-    try:
-        # Convert audio to text via Google Speech Recognition
-        phrase = recognizer.recognize_google(audio)
-        print("Heard wake word:", phrase)
-        return "jarvis" in phrase.lower()
-    except sr.UnknownValueError:
-        # Could not understand audio
-        return False
-    except sr.RequestError as e:
-        # API was unreachable or unresponsive
-        print("Recognition error:", e)
-        return False
+        wake_detector = WakeWordDetector("jarvis")
+    if listener is None:
+        listener = get_microphone().source()
+
+    print("Listening for wake word...")
+    deadline = time.monotonic() + window
+    while time.monotonic() < deadline:
+        hit = wake_detector.process(listener.read())
+        if hit:
+            metrics.count("wake.detections")
+            metrics.observe("wake", hit.latency_ms / 1000)
+            print(f"Heard wake word (detection latency {hit.latency_ms:.0f} ms)")
+            return True
+    return False
 
 
 def listen_for_command() -> str:
@@ -121,44 +210,64 @@ def listen_for_command() -> str:
     :raises: sr.UnknownValueError if speech is unintelligible
              sr.RequestError if the API is unreachable
     """
-    with sr.Microphone() as src:
-        print("Listening for your command...")
-        audio = recognizer.listen(src)
+    global listener
+    if listener is None:
+        # Not called after listen_for_wake_word(): keep half a second of pre-roll
+        listener = get_microphone().source(preroll_ms=500)
+
+    print("Listening for your command...")
+    with metrics.timer("listen"):
+        audio = get_recognizer().listen(listener)
 
     # Return the raw recognized text (case as spoken)
-    result = recognizer.recognize_google(audio)
+    with metrics.timer("recognize"):
+        result = get_command_recognizer().recognize(audio)
     print("Heard command raw:", result)
     return result
 
 
 # ——— Main Execution Loop ————————————————————————————————————————————
 
+def on_recognition_error(error: Exception):
+    """
+    Tell the user why a command could not be handled.
+    """
+    import speech_recognition as sr
+
+    if isinstance(error, sr.UnknownValueError):
+        # Fallback if speech was unclear
+        speak("Sorry, I didn't catch that.")
+    else:
+        # Handle API connectivity issues
+        speak("Speech service is down.")
+        print(error)
+
+
 if __name__ == "__main__":
+    from pipeline import Pipeline, microphone_chunks  # concurrent capture/recognize/act loop
+    from wakeword import WakeWordDetector
+
+    start()
     # Announce startup
     speak("Initializing Jarvis")
+    if os.environ.get("JARVIS_TTS_WARM") == "1":
+        warm_speech_cache()
 
-    # Continuously listen for wake word and commands
-    while True:
-        try:
-            # If wake word detected, prompt and process a command
-            if listen_for_wake_word():
-                speak("Yes, Sir?")
-                cmd = listen_for_command()
-                print("Command:", cmd)
-                process_command(cmd)
-
-        except sr.UnknownValueError:
-            # Fallback if speech was unclear
-            speak("Sorry, I didn't catch that.")
-        except sr.RequestError as e:
-            # Handle API connectivity issues
-            speak("Speech service is down.")
-            print(e)
-        except KeyboardInterrupt:
-            # Allow graceful shutdown on Ctrl+C
-            speak("Shutting down. Goodbye!")
-            break
-        except Exception as e:
-            # Catch-all for any unexpected errors
-            print("Unexpected error:", e)
-            break
+    # Capture, recognition and actions run concurrently (see pipeline.py), so the
+    # microphone keeps listening while Jarvis is recognizing or speaking
+    wake_detector = WakeWordDetector("jarvis")
+    jarvis = Pipeline(
+        microphone_chunks(get_microphone()),
+        act=process_command,
+        recognize=get_command_recognizer().recognize,
+        # A new wake word interrupts any long reply still being spoken
+        acknowledge=lambda: speak("Yes, Sir?", interrupt=True),
+        on_error=on_recognition_error,
+        detector=wake_detector,
+        energy_threshold=get_recognizer().energy_threshold,
+    )
+    try:
+        jarvis.run()
+    except KeyboardInterrupt:
+        # Allow graceful shutdown on Ctrl+C
+        speak("Shutting down. Goodbye!", interrupt=True).wait()
@@ -0,0 +1,252 @@
+"""
+Latency and error metrics for Jarvis.
+
+Every stage of a command reports how long it took into a histogram:
+
+    calibrate   ambient-noise calibration at startup
+    wake        wake-word detection latency (end of the word -> detection)
+    listen      wake word -> end of the command audio
+    queue       end of the command audio -> a recognizer picks it up
+    recognize   speech-to-text
+    dispatch    running the command (process_command)
+    speak       saying one reply
+    end_to_end  end of the command audio -> action finished
+
+Counters track recognition errors and wake-word quality. A wake word that is
+not followed by any speech is counted as a false positive. False negatives can
+only be known from labelled recordings, e.g. `python wakeword.py --expect 1 ...`.
+
+Recording is off unless enabled, and then costs one attribute check per call:
+
+    JARVIS_METRICS=1                 record
+    JARVIS_METRICS_PORT=9101         serve the numbers as JSON on http://127.0.0.1:9101/metrics
+    JARVIS_METRICS_FILE=metrics.json rewrite this file every JARVIS_METRICS_INTERVAL seconds (default 10)
+"""
+
+import bisect
+import os
+import threading
+import time
+
+# Histogram bucket upper bounds, in milliseconds
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000, float("inf"))
+
+
+class Histogram:
+    """
+    Counts of observations per latency bucket, plus count / sum / min / max.
+    """
+
+    def __init__(self, bounds=BUCKETS_MS):
+        self.bounds = bounds
+        self.counts = [0] * len(bounds)
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = float("inf")
+        self.max_ms = 0.0
+
+    def observe(self, ms):
+        self.counts[bisect.bisect_left(self.bounds, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.min_ms = min(self.min_ms, ms)
+        self.max_ms = max(self.max_ms, ms)
+
+    def quantile(self, q):
+        """
+        Upper bound of the bucket holding the q-th quantile (capped at the largest value seen).
+        """
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.bounds, self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def to_dict(self):
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 2),
+            "min_ms": round(self.min_ms, 2),
+            "max_ms": round(self.max_ms, 2),
+            "p50_ms": round(self.quantile(0.5), 2),
+            "p95_ms": round(self.quantile(0.95), 2),
+            "buckets": {f"le_{bound:g}": n for bound, n in zip(self.bounds, self.counts) if n},
+        }
+
+
+class _Timer:
+    def __init__(self, metrics, stage):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.metrics.observe(self.stage, time.perf_counter() - self.started)
+
+
+class _NoTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+_NO_TIMER = _NoTimer()
+
+
+class Metrics:
+    """
+    Thread-safe store of stage histograms and counters.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.started = time.time()
+        self.stages = {}
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def observe(self, stage, seconds):
+        """
+        Record that `stage` took `seconds`.
+        """
+        if not self.enabled:
+            return
+        with self.lock:
+            histogram = self.stages.get(stage)
+            if histogram is None:
+                histogram = self.stages[stage] = Histogram()
+            histogram.observe(seconds * 1000)
+
+    def timer(self, stage):
+        """
+        Context manager that records how long its body took as `stage`.
+        """
+        return _Timer(self, stage) if self.enabled else _NO_TIMER
+
+    def count(self, name, n=1):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def wake_truth(self, expected, detected):
+        """
+        Score wake-word detections on a labelled recording.
+
+        :param expected: How many times the wake word really occurs
+        :param detected: How many detections the detector reported
+        """
+        self.count("wake.expected", expected)
+        self.count("wake.missed", max(expected - detected, 0))
+        self.count("wake.false_positives", max(detected - expected, 0))
+
+    def snapshot(self):
+        """
+        All current numbers as a JSON-ready dict.
+        """
+        with self.lock:
+            stages = {name: histogram.to_dict() for name, histogram in self.stages.items()}
+            counters = dict(self.counters)
+
+        detections = counters.get("wake.detections", 0)
+        false_positives = counters.get("wake.false_positives", 0)
+        expected = counters.get("wake.expected", 0)
+        audio_hours = counters.get("audio.seconds", 0) / 3600
+        wake_word = {
+            "detections": detections,
+            "false_positives": false_positives,
+            "false_positive_rate": round(false_positives / detections, 4) if detections else None,
+            "false_positives_per_hour": round(false_positives / audio_hours, 2) if audio_hours else None,
+            "false_negative_rate": round(counters.get("wake.missed", 0) / expected, 4) if expected else None,
+        }
+        return {
+            "enabled": self.enabled,
+            "uptime_s": round(time.time() - self.started, 1),
+            "stages": stages,
+            "counters": counters,
+            "wake_word": wake_word,
+        }
+
+    def dump(self, path):
+        """
+        Write snapshot() to `path` as JSON (atomically, so readers never see half a file).
+        """
+        import json
+
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(tmp, path)
+
+    def dump_every(self, path, interval_s=10):
+        """
+        Rewrite `path` every `interval_s` seconds on a background thread.
+        """
+        def run():
+            while True:
+                time.sleep(interval_s)
+                try:
+                    self.dump(path)
+                except OSError as e:
+                    print("Could not write metrics:", e)
+
+        threading.Thread(target=run, name="metrics-dump", daemon=True).start()
+
+    def serve(self, port=9101, host="127.0.0.1"):
+        """
+        Serve snapshot() as JSON at http://host:port/metrics on a background thread.
+
+        :return: The running server (call .shutdown() to stop it)
+        """
+        import json
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") not in ("", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = json.dumps(metrics.snapshot(), indent=2).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # keep the console for Jarvis
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        return server
+
+
+# The process-wide instance everything records into
+metrics = Metrics()
+
+
+def configure_from_env():
+    """
+    Apply the JARVIS_METRICS* environment variables (see the module docstring).
+    """
+    metrics.enabled = os.environ.get("JARVIS_METRICS", "") not in ("", "0")
+    if not metrics.enabled:
+        return
+    port = os.environ.get("JARVIS_METRICS_PORT")
+    if port:
+        metrics.serve(int(port))
+        print(f"Metrics on http://127.0.0.1:{port}/metrics")
+    path = os.environ.get("JARVIS_METRICS_FILE")
+    if path:
+        metrics.dump_every(path, float(os.environ.get("JARVIS_METRICS_INTERVAL", 10)))
@@ -0,0 +1,366 @@
+"""
+Concurrent capture -> recognize -> act pipeline for Jarvis.
+
+The original loop listened, recognized, ran the command and spoke, one after the
+other, so the microphone was deaf while Jarvis was thinking or talking. Here the
+three jobs run on their own threads, connected by bounded queues:
+
+    capture thread ──audio_queue──> recognition workers ──action_queue──> action executor
+    (wake word +                    (speech-to-text,                      (speak, open
+     command endpointing)            N in parallel)                        websites, ...)
+
+The capture thread never waits on the stages after it: if the audio queue is full
+the utterance is dropped (and counted) rather than stalling the microphone. The
+wake-word acknowledgement is started from its own small thread, so it is not stuck
+behind running actions either.
+
+Replay mode feeds WAV files through the exact same pipeline, so end-to-end command
+latency can be measured on a headless box:
+
+    python pipeline.py --replay recordings/*.wav                  # dry run, offline recognizer
+    python pipeline.py --replay recordings/*.wav --realtime       # pace audio like a live mic
+    python pipeline.py --replay recordings/*.wav --recognizer online
+"""
+
+import argparse
+import math
+import queue
+import statistics
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+
+import speech_recognition as sr
+
+from audio import MicrophoneStream
+from commands import CommandRegistry
+from metrics import metrics
+from recognition import RECOGNIZERS, make_recognizer
+from wakeword import SAMPLE_RATE, SAMPLE_WIDTH, WakeWordDetector, wav_chunks
+
+CHUNK_MS = 20
+CHUNK_BYTES = SAMPLE_RATE * SAMPLE_WIDTH * CHUNK_MS // 1000
+
+
+@dataclass
+class Utterance:
+    """
+    One command captured after the wake word.
+
+    audio:       the command audio (sr.AudioData)
+    captured_at: time.perf_counter() when the end of the command was detected
+    """
+    audio: sr.AudioData
+    captured_at: float
+
+
+# ——— Audio sources ———————————————————————————————————————————————————
+# A source is any iterable of raw 16 kHz / 16-bit mono PCM chunks.
+
+def microphone_chunks(microphone=None):
+    """
+    Endless chunks from the microphone, read through the shared ring buffer (see audio.py).
+
+    :param microphone: A started MicrophoneStream; a new one is opened if None
+    """
+    if microphone is None:
+        microphone = MicrophoneStream(chunk_ms=CHUNK_MS).start()
+    yield from microphone.source()
+
+
+def replay_chunks(paths, realtime=False, gap_ms=1500):
+    """
+    Chunks from recorded WAV files, one after another, with `gap_ms` of silence
+    after each file so its last command is endpointed before the next begins.
+
+    :param realtime: Sleep between chunks so audio arrives at microphone speed
+    """
+    silence = bytes(CHUNK_BYTES)
+    for path in paths:
+        for chunk in wav_chunks(path, CHUNK_MS):
+            yield chunk
+            if realtime:
+                time.sleep(CHUNK_MS / 1000)
+        for _ in range(gap_ms // CHUNK_MS):
+            yield silence
+            if realtime:
+                time.sleep(CHUNK_MS / 1000)
+
+
+def rms(chunk):
+    """
+    Root-mean-square energy of a 16-bit PCM chunk (same scale as sr.Recognizer.energy_threshold).
+    """
+    samples = array("h", chunk[:len(chunk) - len(chunk) % 2])
+    if not samples:
+        return 0.0
+    return math.sqrt(sum(s * s for s in samples) / len(samples))
+
+
+# ——— Pipeline ————————————————————————————————————————————————————————
+
+class Pipeline:
+    """
+    Wires the capture thread, recognition workers and action executor together.
+    """
+
+    def __init__(self, source, act, recognize, acknowledge=None, on_error=None,
+                 detector=None, workers=2, queue_size=8,
+                 energy_threshold=300, silence_ms=800, max_command_s=8, start_timeout_s=5,
+                 ack_timeout_s=3):
+        """
+        :param source: Iterable of PCM chunks (microphone_chunks() or replay_chunks(...))
+        :param act: Called with the recognized command text (e.g. process_command)
+        :param recognize: Called with an sr.AudioData, returns text; may raise
+                          sr.UnknownValueError / sr.RequestError
+        :param acknowledge: Called when the wake word is heard (e.g. say "Yes, Sir?"); if it
+                            returns a tts.Utterance, microphone audio is ignored while that
+                            reply is actually playing, so it is not recorded as the command
+        :param on_error: Called with the exception when recognition fails
+        :param detector: WakeWordDetector to use (a new one by default)
+        :param workers: Number of recognition threads
+        :param queue_size: Capacity of each queue between stages
+        :param energy_threshold: RMS level above which a chunk counts as speech
+        :param silence_ms: This much quiet after speech ends a command
+        :param max_command_s: Hard cap on command length
+        :param start_timeout_s: Give up if no speech starts this long after the wake word
+        :param ack_timeout_s: Never ignore audio for longer than this after the wake word
+        """
+        self.source = source
+        self.act = act
+        self.recognize = recognize
+        self.acknowledge = acknowledge
+        self.on_error = on_error
+        self.detector = detector or WakeWordDetector()
+        self.workers = workers
+        self.energy_threshold = energy_threshold
+        self.silence_chunks = silence_ms // CHUNK_MS
+        self.max_command_chunks = int(max_command_s * 1000) // CHUNK_MS
+        self.start_timeout_chunks = int(start_timeout_s * 1000) // CHUNK_MS
+        self.ack_timeout_s = ack_timeout_s
+
+        self.audio_queue = queue.Queue(maxsize=queue_size)
+        self.action_queue = queue.Queue(maxsize=queue_size)
+        self.ack_queue = queue.Queue(maxsize=1)
+        self.stopping = threading.Event()
+        self.ack_playing = None  # handle returned by the latest acknowledge() call
+
+        # Results, readable after run() returns
+        self.latencies = []   # seconds from end of command audio to action finished
+        self.commands = []    # recognized command texts, in completion order
+        self.dropped = 0      # utterances dropped because the audio queue was full
+
+    # ——— capture ———
+
+    def _capture(self):
+        collecting = False  # False: waiting for the wake word; True: recording a command
+        frames, heard_speech, quiet = [], False, 0
+        ack_deadline = 0.0
+
+        for chunk in self.source:
+            if self.stopping.is_set():
+                break
+            metrics.count("audio.seconds", len(chunk) / (SAMPLE_RATE * SAMPLE_WIDTH))
+            if not collecting:
+                hit = self.detector.process(chunk)
+                if hit:
+                    collecting, frames, heard_speech, quiet = True, [], False, 0
+                    woke_at = time.perf_counter()
+                    metrics.count("wake.detections")
+                    metrics.observe("wake", hit.latency_ms / 1000)
+                    if self.acknowledge is not None:
+                        self.ack_playing = None
+                        ack_deadline = woke_at + self.ack_timeout_s
+                        self._post_ack()
+                continue
+            if time.perf_counter() < ack_deadline and self._ack_is_playing():
+                # Jarvis is saying "Yes, Sir?" right now: what the microphone hears is
+                # mostly that reply, so it is not recorded as part of the command
+                metrics.count("audio.muted_seconds", len(chunk) / (SAMPLE_RATE * SAMPLE_WIDTH))
+                continue
+
+            # Recording a command: simple energy-based endpointing
+            frames.append(chunk)
+            if rms(chunk) >= self.energy_threshold:
+                heard_speech, quiet = True, 0
+            else:
+                quiet += 1
+            if not heard_speech and len(frames) >= self.start_timeout_chunks:
+                collecting = False  # woke up but nobody said anything
+                metrics.count("wake.false_positives")
+            elif (heard_speech and quiet >= self.silence_chunks) or len(frames) >= self.max_command_chunks:
+                self._submit(frames, woke_at)
+                collecting = False
+
+        if collecting and heard_speech:
+            self._submit(frames, woke_at)
+        for _ in range(self.workers):
+            self.audio_queue.put(None)  # one stop signal per recognition worker
+
+    def _submit(self, frames, woke_at):
+        utterance = Utterance(sr.AudioData(b"".join(frames), SAMPLE_RATE, SAMPLE_WIDTH), time.perf_counter())
+        metrics.observe("listen", utterance.captured_at - woke_at)
+        try:
+            self.audio_queue.put_nowait(utterance)
+        except queue.Full:
+            self.dropped += 1
+            metrics.count("pipeline.dropped")
+            print("[pipeline] recognizers are busy; dropped a command")
+
+    def _post_ack(self):
+        try:
+            self.ack_queue.put_nowait(True)
+        except queue.Full:
+            pass  # one is already on its way; not worth blocking the microphone for
+
+    def _ack_is_playing(self):
+        playing = self.ack_playing
+        if playing is None or not hasattr(playing, "wait"):
+            return False  # not started yet (or no playback handle): keep the audio
+        started = getattr(playing, "started", None)
+        if started is not None and not started.is_set():
+            return False  # still queued behind other speech
+        return not playing.wait(0)
+
+    # ——— acknowledgement ———
+
+    def _acknowledge(self):
+        while self.ack_queue.get() is not None:
+            try:
+                self.ack_playing = self.acknowledge()
+            except Exception as e:
+                print("Acknowledgement failed:", e)
+                metrics.count("actions.errors")
+
+    # ——— recognition ———
+
+    def _recognize(self):
+        while True:
+            utterance = self.audio_queue.get()
+            if utterance is None:
+                return
+            metrics.observe("queue", time.perf_counter() - utterance.captured_at)
+            try:
+                with metrics.timer("recognize"):
+                    text = self.recognize(utterance.audio)
+            except Exception as e:
+                # Anything else (e.g. a crashed offline worker pool) is reported the same
+                # way; the worker must stay alive or capture would block on its stop signal
+                if isinstance(e, sr.UnknownValueError):
+                    metrics.count("recognize.errors.unknown_value")
+                elif isinstance(e, sr.RequestError):
+                    metrics.count("recognize.errors.request")
+                else:
+                    metrics.count("recognize.errors.other")
+                self.action_queue.put(("error", e, utterance))
+                continue
+            metrics.count("recognize.ok")
+            self.action_queue.put(("command", text, utterance))
+
+    # ——— actions ———
+
+    def _execute(self):
+        while True:
+            item = self.action_queue.get()
+            if item is None:
+                return
+            try:
+                self._handle(item)
+            except Exception as e:
+                # A failing action must not take the executor (and Jarvis) down
+                print("Unexpected error:", e)
+                metrics.count("actions.errors")
+
+    def _handle(self, item):
+        kind, payload, utterance = item
+        if kind == "command":
+            print("Command:", payload)
+            with metrics.timer("dispatch"):
+                self.act(payload)
+            self.commands.append(payload)
+        elif self.on_error:
+            self.on_error(payload)
+        self.latencies.append(time.perf_counter() - utterance.captured_at)
+        metrics.observe("end_to_end", self.latencies[-1])
+
+    # ——— lifecycle ———
+
+    def run(self):
+        """
+        Run until the source is exhausted (replay) or stop() / Ctrl+C (live).
+        """
+        capture = threading.Thread(target=self._capture, name="capture", daemon=True)
+        recognizers = [threading.Thread(target=self._recognize, name=f"recognize-{i}", daemon=True)
+                       for i in range(self.workers)]
+        executor = threading.Thread(target=self._execute, name="actions", daemon=True)
+        acknowledger = threading.Thread(target=self._acknowledge, name="acknowledge", daemon=True)
+        for thread in (capture, *recognizers, executor, acknowledger):
+            thread.start()
+
+        try:
+            capture.join()
+            for thread in recognizers:
+                thread.join()
+        except KeyboardInterrupt:
+            self.stop()
+            raise
+        finally:
+            self.action_queue.put(None)
+            self.ack_queue.put(None)
+            executor.join()
+
+    def stop(self):
+        self.stopping.set()
+
+
+def report(pipeline, elapsed):
+    """
+    Print a latency summary of a finished (replay) run.
+    """
+    latencies = sorted(ms * 1000 for ms in pipeline.latencies)
+    print(f"\n{len(pipeline.commands)} command(s) in {elapsed:.2f} s, {pipeline.dropped} dropped")
+    if len(latencies) >= 2:
+        cuts = statistics.quantiles(latencies, n=100)
+        print(f"end-to-end latency: p50 {cuts[49]:.0f} ms, p95 {cuts[94]:.0f} ms, max {latencies[-1]:.0f} ms")
+    elif latencies:
+        print(f"end-to-end latency: {latencies[0]:.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded audio through the Jarvis pipeline.")
+    parser.add_argument("--replay", nargs="+", required=True, metavar="WAV", help="recordings to feed in")
+    parser.add_argument("--realtime", action="store_true", help="pace audio at microphone speed")
+    parser.add_argument("--recognizer", choices=list(RECOGNIZERS), default="offline",
+                        help="speech-to-text for commands (see recognition.py)")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--execute", action="store_true",
+                        help="really run the commands (speak, open browser) instead of a dry run")
+    parser.add_argument("--metrics", metavar="JSON", help="record per-stage metrics and write them here")
+    args = parser.parse_args()
+    metrics.enabled = bool(args.metrics)
+
+    recognizer = make_recognizer(args.recognizer, workers=args.workers)
+
+    if args.execute:
+        from main import process_command as act
+    else:
+        registry = CommandRegistry.from_file()
+
+        def act(cmd):
+            command = registry.match(cmd)
+            print(f"[dry run] {cmd!r} -> " + (f"{command.say} ({command.url})" if command else "no match"))
+
+    pipeline = Pipeline(replay_chunks(args.replay, args.realtime), act, recognizer.recognize,
+                        on_error=lambda e: print("[pipeline] recognition failed:", repr(e)),
+                        workers=args.workers)
+    start = time.perf_counter()
+    pipeline.run()
+    report(pipeline, time.perf_counter() - start)
+    recognizer.close()
+    if args.metrics:
+        metrics.dump(args.metrics)
+
+
+if __name__ == "__main__":
+    main()
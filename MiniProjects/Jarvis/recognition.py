@@ -0,0 +1,139 @@
+"""
+Speech-to-text backends for Jarvis commands.
+
+recognize_google() is a blocking network request, and when the service is
+unreachable Jarvis could only say "Speech service is down". recognize_sphinx()
+works offline but loads the whole PocketSphinx model from disk on every call.
+
+* OfflineRecognizer  PocketSphinx; each worker process loads the model once at
+                     startup and keeps it resident. Requests go through the
+                     process pool, so several utterances decode in parallel
+                     (the decoder holds the GIL, so threads would not help).
+* OnlineRecognizer   Google Web Speech API, as before.
+* FallbackRecognizer Online first, offline when the service can't be reached.
+
+All of them have recognize(audio) -> text, raising sr.UnknownValueError /
+sr.RequestError like speech_recognition does, so they plug straight into
+pipeline.Pipeline. Pick one with make_recognizer("offline" | "online" | "fallback").
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import speech_recognition as sr
+from pocketsphinx import Decoder
+
+from wakeword import SAMPLE_RATE, SAMPLE_WIDTH
+
+# ——— Offline worker processes ———————————————————————————————————————
+# Each pool process keeps its own decoder in these globals for its whole life.
+
+_decoder = None
+_ready = None
+
+
+def _load(config, ready):
+    global _decoder, _ready
+    _decoder, _ready = Decoder(**config), ready
+
+
+def _wait_ready():
+    _ready.wait()  # holds this process until every worker has loaded its model
+
+
+def _decode(pcm):
+    _decoder.start_utt()
+    _decoder.process_raw(pcm, False, True)
+    _decoder.end_utt()
+    hypothesis = _decoder.hyp()
+    return hypothesis.hypstr if hypothesis is not None else ""
+
+
+class OfflineRecognizer:
+    """
+    PocketSphinx large-vocabulary recognition with warm, per-process models.
+    """
+
+    def __init__(self, workers=2, **config):
+        """
+        :param workers: Number of decoding processes, each with its own copy of the model
+        :param config: Extra pocketsphinx.Decoder options (e.g. hmm=, lm=, dict=)
+        """
+        self.workers = workers
+        config = {"samprate": SAMPLE_RATE, "logfn": os.devnull, **config}
+        ready = multiprocessing.Barrier(workers)
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_load, initargs=(config, ready))
+        # Start every worker and load its model now, so no command pays for it later
+        for job in [self.pool.submit(_wait_ready) for _ in range(workers)]:
+            job.result()
+
+    def submit(self, audio: sr.AudioData) -> Future:
+        """
+        Queue an utterance for decoding and return at once.
+
+        :return: A Future whose result() is the text ("" if nothing was recognized)
+        """
+        pcm = audio.get_raw_data(convert_rate=SAMPLE_RATE, convert_width=SAMPLE_WIDTH)
+        return self.pool.submit(_decode, pcm)
+
+    def recognize(self, audio: sr.AudioData) -> str:
+        text = self.submit(audio).result()
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+    def close(self):
+        self.pool.shutdown()
+
+
+class OnlineRecognizer:
+    """
+    Google Web Speech API (needs a network connection).
+    """
+
+    def __init__(self, workers=None):
+        self.recognizer = sr.Recognizer()
+
+    def recognize(self, audio: sr.AudioData) -> str:
+        return self.recognizer.recognize_google(audio)
+
+    def close(self):
+        pass
+
+
+class FallbackRecognizer:
+    """
+    Online recognition, switching to the (already loaded) offline model per request
+    whenever the online service fails.
+    """
+
+    def __init__(self, workers=2):
+        self.online = OnlineRecognizer()
+        self.offline = OfflineRecognizer(workers)
+
+    def recognize(self, audio: sr.AudioData) -> str:
+        try:
+            return self.online.recognize(audio)
+        except sr.RequestError as e:
+            print("Online recognition unavailable, using offline model:", e)
+            return self.offline.recognize(audio)
+
+    def close(self):
+        self.offline.close()
+
+
+RECOGNIZERS = {"offline": OfflineRecognizer, "online": OnlineRecognizer, "fallback": FallbackRecognizer}
+
+
+def make_recognizer(mode="online", workers=2):
+    """
+    :param mode: "offline", "online" or "fallback"
+    :param workers: Offline decoding processes (one resident model each)
+    """
+    try:
+        recognizer_class = RECOGNIZERS[mode]
+    except KeyError:
+        raise ValueError(f"unknown recognizer {mode!r}; choose from {', '.join(RECOGNIZERS)}") from None
+    # Outside the try: a KeyError raised while building the recognizer is a real error
+    return recognizer_class(workers=workers)
@@ -0,0 +1,330 @@
+"""
+Speech output for Jarvis.
+
+speak() used to call Windows SAPI directly, block until the sentence was finished
+and then sleep, so Jarvis could not run on Linux and every reply stalled the loop.
+This module separates *what* is said from *how*:
+
+* Backends turn text into sound:
+    - SapiBackend      Windows SAPI via COM (the original voice)
+    - Pyttsx3Backend   pyttsx3, offline; uses espeak on Linux, NSSpeech on macOS
+    - NullBackend      prints/records the text only; for tests and headless runs
+* SpeechQueue plays utterances one at a time on a background thread. say()
+  returns immediately, and interrupt() cuts off the current reply and drops
+  queued ones, so a new command never has to wait for Jarvis to finish talking.
+  Spoken phrases always go ahead of prepare() warm-up work still in the queue.
+
+All backends take the SAPI-style settings used before: volume 0-100, rate -10..+10.
+"""
+
+import itertools
+import queue
+import sys
+import threading
+
+from metrics import metrics
+
+
+class SpeechBackend:
+    """
+    Interface for a text-to-speech engine.
+
+    Backends are created and used on the SpeechQueue's worker thread only, which
+    keeps COM (SAPI) and pyttsx3 happy; stop() is the one exception and may be
+    called from any thread. say() implementations should end early once
+    self.stopped is set; the queue clears it before each utterance.
+    """
+
+    def __init__(self):
+        self.stopped = threading.Event()
+
+    def say(self, text: str):
+        """
+        Speak `text` and return when finished or stopped.
+        """
+        raise NotImplementedError
+
+    def stop(self):
+        """
+        Cut off the utterance currently being spoken, if any.
+        """
+        self.stopped.set()
+
+    def render(self, text: str, path: str):
+        """
+        Synthesize `text` into a WAV file instead of the speakers (used by tts_cache).
+        """
+        raise NotImplementedError(f"{type(self).__name__} cannot render to a file")
+
+    def voice_id(self) -> str:
+        """
+        Identifies the voice, so cached audio is never replayed with another voice.
+        """
+        return type(self).__name__
+
+    def prepare(self, text: str):
+        """
+        Get ready to say `text` soon (e.g. pre-render it); a no-op by default.
+        """
+
+
+class SapiBackend(SpeechBackend):
+    """
+    Windows SAPI (SAPI.SpVoice) through COM.
+    """
+
+    SVSF_ASYNC = 1
+    SVSF_PURGE_BEFORE_SPEAK = 2
+
+    def __init__(self, volume=100, rate=0):
+        import pythoncom
+        import win32com.client as wincl
+
+        super().__init__()
+        pythoncom.CoInitialize()  # COM must be initialised on the thread that uses it
+        self.voice = wincl.Dispatch("SAPI.SpVoice")
+        self.voice.Volume = volume
+        self.voice.Rate = rate
+
+    def say(self, text):
+        self.voice.Speak(text, self.SVSF_ASYNC)
+        # Wait in short slices so a stop() request is noticed quickly
+        while not self.voice.WaitUntilDone(50):
+            if self.stopped.is_set():
+                self.voice.Speak("", self.SVSF_ASYNC | self.SVSF_PURGE_BEFORE_SPEAK)
+                break
+
+    def render(self, text, path):
+        import win32com.client as wincl
+
+        stream = wincl.Dispatch("SAPI.SpFileStream")
+        stream.Open(path, 3)  # SSFMCreateForWrite
+        speakers = self.voice.AudioOutputStream
+        self.voice.AudioOutputStream = stream
+        try:
+            self.voice.Speak(text)
+        finally:
+            stream.Close()
+            self.voice.AudioOutputStream = speakers
+
+    def voice_id(self):
+        return "sapi:" + self.voice.Voice.GetDescription()
+
+
+class Pyttsx3Backend(SpeechBackend):
+    """
+    pyttsx3 (espeak / NSSpeech / SAPI depending on the platform), fully offline.
+    """
+
+    def __init__(self, volume=100, rate=0):
+        import pyttsx3
+
+        super().__init__()
+        self.engine = pyttsx3.init()
+        self.engine.setProperty("volume", volume / 100)
+        # SAPI rate -10..+10 around pyttsx3's default of ~200 words per minute
+        self.engine.setProperty("rate", 200 + rate * 20)
+        # pyttsx3 may only be stopped from inside its own loop, so check between words
+        self.engine.connect("started-word", self._check_stop)
+
+    def _check_stop(self, name, location, length):
+        if self.stopped.is_set():
+            self.engine.stop()
+
+    def say(self, text):
+        self.engine.say(text)
+        self.engine.runAndWait()
+
+    def render(self, text, path):
+        self.engine.save_to_file(text, path)
+        self.engine.runAndWait()
+
+    def voice_id(self):
+        return "pyttsx3:" + str(self.engine.getProperty("voice"))
+
+
+class NullBackend(SpeechBackend):
+    """
+    Speaks nothing; records what would have been said.
+
+    :param seconds_per_char: Optional simulated speaking time, to test interruption
+    """
+
+    def __init__(self, volume=100, rate=0, seconds_per_char=0.0):
+        super().__init__()
+        self.spoken = []
+        self.seconds_per_char = seconds_per_char
+
+    def say(self, text):
+        self.spoken.append(text)
+        self.stopped.wait(len(text) * self.seconds_per_char)
+
+    def render(self, text, path):
+        # Silence as long as the simulated speech, 16 kHz 16-bit mono
+        import wave
+
+        self.spoken.append(text)
+        with wave.open(path, "wb") as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(16000)
+            f.writeframes(bytes(2 * int(16000 * len(text) * self.seconds_per_char)))
+
+
+BACKENDS = {"sapi": SapiBackend, "pyttsx3": Pyttsx3Backend, "null": NullBackend}
+
+
+def default_backend_name():
+    """
+    SAPI on Windows (the original voice), pyttsx3 everywhere else.
+    """
+    return "sapi" if sys.platform == "win32" else "pyttsx3"
+
+
+class Utterance:
+    """
+    Handle for one queued phrase.
+    """
+
+    def __init__(self, text, prepare_only=False):
+        self.text = text
+        self.prepare_only = prepare_only  # warm-up request: render, don't speak
+        self.cancelled = False
+        self.started = threading.Event()  # set when the backend starts speaking it
+        self.done = threading.Event()
+
+    def wait(self, timeout=None):
+        """
+        Block until the phrase has been spoken (or cancelled).
+        """
+        return self.done.wait(timeout)
+
+
+# Queue priorities: speech first, then warm-up rendering, then close()'s stop signal
+SPEAK, PREPARE, STOP = 0, 1, 2
+
+
+class SpeechQueue:
+    """
+    Speaks queued utterances in order on a background thread.
+    """
+
+    def __init__(self, backend="auto", volume=100, rate=0, cache=None):
+        """
+        :param backend: "sapi", "pyttsx3", "null", "auto", or a SpeechBackend subclass
+        :param volume: 0-100
+        :param rate: -10 (slow) .. +10 (fast)
+        :param cache: A tts_cache.AudioCache to replay repeated phrases from, or None
+        """
+        if backend == "auto":
+            backend = default_backend_name()
+        self.backend_class = BACKENDS[backend] if isinstance(backend, str) else backend
+        self.options = {"volume": volume, "rate": rate}
+        self.cache = cache
+        self.backend = None
+        self.ready = threading.Event()
+        self.pending = queue.PriorityQueue()  # (priority, order, Utterance or None)
+        self.order = itertools.count()        # FIFO within one priority
+        self.current = None
+        self.lock = threading.Lock()
+        self.worker = threading.Thread(target=self._run, name="speech", daemon=True)
+        self.worker.start()
+
+    def say(self, text: str, interrupt=False) -> Utterance:
+        """
+        Queue `text` and return at once.
+
+        :param interrupt: First cut off whatever is being said and drop the queued phrases
+        :return: An Utterance; call .wait() to block until it has been spoken
+        """
+        if interrupt:
+            self.interrupt()
+        utterance = Utterance(text)
+        self._put(SPEAK, utterance)
+        return utterance
+
+    def prepare(self, texts):
+        """
+        Queue phrases to be pre-rendered (e.g. into the audio cache) without speaking them.
+        """
+        for text in texts:
+            self._put(PREPARE, Utterance(text, prepare_only=True))
+
+    def _put(self, priority, utterance):
+        self.pending.put((priority, next(self.order), utterance))
+
+    def interrupt(self):
+        """
+        Stop the current utterance and discard every phrase still queued to be spoken.
+        Queued prepare() requests are kept: they are warm-up work, not speech.
+        """
+        kept = []
+        while True:
+            try:
+                item = self.pending.get_nowait()
+            except queue.Empty:
+                break
+            priority, _, dropped = item
+            if priority != SPEAK:
+                kept.append(item)  # prepare() work and close()'s stop signal
+                continue
+            dropped.cancelled = True
+            dropped.done.set()
+        # Put back with their old priority and order: a phrase said after this
+        # still goes ahead of them
+        for item in kept:
+            self.pending.put(item)
+        with self.lock:
+            if self.current is not None and not self.current.prepare_only:
+                self.current.cancelled = True
+                self.ready.wait()
+                self.backend.stop()
+
+    def close(self, timeout=None):
+        """
+        Finish what is queued, then stop the worker thread.
+        """
+        self._put(STOP, None)
+        self.worker.join(timeout)
+
+    def _run(self):
+        # Created here so the engine lives on the thread that uses it
+        try:
+            self.backend = self.backend_class(**self.options)
+        except Exception as e:
+            print("Speech output unavailable, continuing silently:", e)
+            self.backend = NullBackend(**self.options)
+        if self.cache is not None:
+            from tts_cache import CachedBackend
+
+            self.backend = CachedBackend(self.backend, self.cache, **self.options)
+        self.ready.set()
+        while True:
+            _, _, utterance = self.pending.get()
+            if utterance is None:
+                return
+            with self.lock:
+                if utterance.cancelled:
+                    continue
+                self.backend.stopped.clear()
+                self.current = utterance
+            if utterance.prepare_only:
+                try:
+                    self.backend.prepare(utterance.text)
+                except Exception as e:
+                    print("Could not prepare speech:", e)
+                with self.lock:
+                    self.current = None
+                utterance.done.set()
+                continue
+            try:
+                print(f"[speak] → {utterance.text!r}")
+                utterance.started.set()
+                with metrics.timer("speak"):
+                    self.backend.say(utterance.text)
+            except Exception as e:
+                print("Speech output failed:", e)
+            finally:
+                with self.lock:
+                    self.current = None
+                utterance.done.set()
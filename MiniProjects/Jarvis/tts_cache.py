@@ -0,0 +1,209 @@
+"""
+Cache of synthesized speech for Jarvis.
+
+Jarvis keeps repeating the same phrases ("Yes, Sir?", "Opening YouTube", ...), and
+synthesizing each one from scratch costs noticeable time. CachedBackend wraps any
+tts backend that can render to a WAV file: the first time a phrase is said it is
+rendered once, stored, and played back; after that it is played straight from
+the cache.
+
+Audio is content-addressed: the file name is a hash of (text, voice, rate, volume),
+so changing any of them never replays stale audio. Two size-bounded LRU layers are
+kept: decoded clips in memory and WAV files on disk (which survive restarts).
+"""
+
+import hashlib
+import os
+import tempfile
+import wave
+from collections import OrderedDict, namedtuple
+from pathlib import Path
+
+from tts import SpeechBackend
+
+DEFAULT_DIR = Path.home() / ".cache" / "jarvis-tts"
+
+# channels, sample width in bytes, frame rate, raw PCM frames
+Clip = namedtuple("Clip", ["channels", "width", "rate", "frames"])
+
+
+def audio_key(text, voice, rate, volume):
+    """
+    Content address of a rendered phrase.
+    """
+    return hashlib.sha256(f"{voice}\0{rate}\0{volume}\0{text}".encode()).hexdigest()
+
+
+def read_clip(path):
+    with wave.open(str(path), "rb") as f:
+        return Clip(f.getnchannels(), f.getsampwidth(), f.getframerate(), f.readframes(f.getnframes()))
+
+
+class AudioCache:
+    """
+    Memory + disk LRU store of rendered clips, keyed by audio_key().
+
+    Only the speech worker thread uses it, so it needs no locking.
+    """
+
+    def __init__(self, directory=DEFAULT_DIR, memory_bytes=16 << 20, disk_bytes=256 << 20):
+        """
+        :param directory: Where WAV files are kept
+        :param memory_bytes: Budget for decoded clips held in memory
+        :param disk_bytes: Budget for WAV files on disk
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+
+        self.memory = OrderedDict()  # key -> Clip, least recently used first
+        self.memory_used = 0
+
+        # key -> file size, least recently used (oldest mtime) first
+        files = sorted(self.directory.glob("*.wav"), key=lambda p: p.stat().st_mtime)
+        self.disk = OrderedDict((p.stem, p.stat().st_size) for p in files)
+        self.disk_used = sum(self.disk.values())
+        self.hits = self.misses = 0
+
+    def path(self, key):
+        return self.directory / f"{key}.wav"
+
+    def get(self, key):
+        """
+        The cached Clip for `key`, or None.
+        """
+        clip = self.memory.get(key)
+        if clip is not None:
+            self.memory.move_to_end(key)
+            self.hits += 1
+            return clip
+        if key in self.disk:
+            try:
+                clip = read_clip(self.path(key))
+                os.utime(self.path(key))  # mtime doubles as "last used" across restarts
+            except (OSError, wave.Error, EOFError):
+                self._forget_file(key)
+            else:
+                self.disk.move_to_end(key)
+                self._remember(key, clip)
+                self.hits += 1
+                return clip
+        self.misses += 1
+        return None
+
+    def add(self, key, rendered_path):
+        """
+        Move a freshly rendered WAV into the cache and return its Clip.
+        """
+        clip = read_clip(rendered_path)
+        os.replace(rendered_path, self.path(key))  # atomic: readers never see half a file
+        size = self.path(key).stat().st_size
+        self.disk_used += size - self.disk.pop(key, 0)
+        self.disk[key] = size
+        while self.disk_used > self.disk_bytes and len(self.disk) > 1:
+            oldest = next(iter(self.disk))
+            self._forget_file(oldest)
+            try:
+                self.path(oldest).unlink()
+            except OSError:
+                pass
+        self._remember(key, clip)
+        return clip
+
+    def _remember(self, key, clip):
+        if len(clip.frames) > self.memory_bytes:
+            return
+        self.memory_used += len(clip.frames)
+        old = self.memory.pop(key, None)
+        if old is not None:
+            self.memory_used -= len(old.frames)
+        self.memory[key] = clip
+        while self.memory_used > self.memory_bytes:
+            _, evicted = self.memory.popitem(last=False)
+            self.memory_used -= len(evicted.frames)
+
+    def _forget_file(self, key):
+        self.disk_used -= self.disk.pop(key, 0)
+        evicted = self.memory.pop(key, None)
+        if evicted is not None:
+            self.memory_used -= len(evicted.frames)
+
+
+def play_clip(clip, stopped):
+    """
+    Play a clip on the default output device, in small blocks so `stopped` can cut it off.
+
+    :raises RuntimeError: if no audio output library is available
+    """
+    try:
+        import sounddevice as sd
+    except (ImportError, OSError) as e:  # OSError: PortAudio itself is missing
+        raise RuntimeError(f"no audio output: {e}") from None
+
+    dtype = {1: "uint8", 2: "int16", 4: "int32"}[clip.width]
+    block = clip.rate // 20 * clip.channels * clip.width  # 50 ms
+    with sd.RawOutputStream(samplerate=clip.rate, channels=clip.channels, dtype=dtype) as stream:
+        for start in range(0, len(clip.frames), block):
+            if stopped.is_set():
+                break
+            stream.write(clip.frames[start:start + block])
+
+
+class CachedBackend(SpeechBackend):
+    """
+    Wraps a backend so phrases are rendered once and replayed from an AudioCache.
+    """
+
+    def __init__(self, inner, cache, volume=100, rate=0, max_chars=200, player=play_clip):
+        """
+        :param inner: The real backend; must implement render()
+        :param cache: AudioCache to use
+        :param max_chars: Longer phrases are spoken directly, not cached
+        :param player: Called as player(clip, stopped_event) to play audio
+        """
+        super().__init__()
+        self.inner = inner
+        self.stopped = inner.stopped  # one stop flag for both, so stop() reaches either path
+        self.cache = cache
+        self.settings = (rate, volume)
+        self.max_chars = max_chars
+        self.player = player
+        self.voice = inner.voice_id()
+
+    def voice_id(self):
+        return self.voice
+
+    def _clip(self, text):
+        key = audio_key(text, self.voice, *self.settings)
+        clip = self.cache.get(key)
+        if clip is None:
+            fd, tmp = tempfile.mkstemp(suffix=".wav", dir=self.cache.directory)
+            os.close(fd)
+            try:
+                self.inner.render(text, tmp)
+                clip = self.cache.add(key, tmp)
+            finally:
+                if os.path.exists(tmp):
+                    os.unlink(tmp)
+        return clip
+
+    def prepare(self, text):
+        if len(text) <= self.max_chars:
+            self._clip(text)
+
+    def say(self, text):
+        if self.player is None or len(text) > self.max_chars:
+            self.inner.say(text)
+            return
+        try:
+            clip = self._clip(text)
+            self.player(clip, self.stopped)
+        except (NotImplementedError, RuntimeError) as e:
+            # This backend can't render, or there is no way to play audio: stop trying
+            print("[tts cache] disabled, speaking directly:", e)
+            self.player = None
+            self.inner.say(text)
+        except (OSError, wave.Error) as e:
+            print("[tts cache] falling back to live speech:", e)
+            self.inner.say(text)
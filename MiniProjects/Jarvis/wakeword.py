@@ -0,0 +1,152 @@
+"""
+Streaming, offline wake-word detection for Jarvis.
+
+Instead of recording a whole phrase and sending it to Google just to find out
+whether it contained "jarvis", the microphone audio is fed to a local
+PocketSphinx keyword spotter chunk by chunk as it arrives. Only the audio that
+follows a detection is sent to the full (online) recognizer.
+
+The same detector runs on recorded WAV files (any rate; converted to 16 kHz mono
+16-bit), which makes it testable offline. Record a clip that says "Jarvis ..."
+and one without the word (TV, music, room noise) and check both:
+
+    python wakeword.py --expect 1 jarvis_command.wav
+    python wakeword.py --expect 0 background_noise.wav
+
+--expect makes the exit status fail on a missed or extra detection.
+"""
+
+import argparse
+import os
+import sys
+import time
+from dataclasses import dataclass
+
+import speech_recognition as sr  # only used to read/convert WAV files
+from pocketsphinx import Decoder
+
+from metrics import metrics
+
+SAMPLE_RATE = 16000   # PocketSphinx's default acoustic model is 16 kHz
+SAMPLE_WIDTH = 2      # 16-bit signed PCM, mono
+FRAMES_PER_SEC = 100  # PocketSphinx frame rate (one frame every 10 ms)
+
+
+@dataclass
+class Detection:
+    """
+    One wake-word hit.
+
+    audio_ms:      position in the stream (ms of audio fed so far) when it fired
+    keyword_end_ms: where the keyword itself ended in the stream
+    latency_ms:    how long after the keyword ended the detection was reported,
+                   i.e. audio buffered after the word + time spent decoding
+    """
+    audio_ms: float
+    keyword_end_ms: float
+    latency_ms: float
+
+
+class WakeWordDetector:
+    """
+    Keyword spotter that consumes raw 16 kHz / 16-bit mono PCM chunks.
+    """
+
+    def __init__(self, keyphrase="jarvis", threshold=1e-20):
+        """
+        :param keyphrase: Word(s) to listen for; must be in the pronunciation dictionary
+        :param threshold: Detection threshold; lower (e.g. 1e-30) = more sensitive,
+                          more false positives
+        """
+        self.keyphrase = keyphrase
+        # The model is loaded once here and stays resident for the whole session
+        self.decoder = Decoder(keyphrase=keyphrase, kws_threshold=threshold,
+                               samprate=SAMPLE_RATE, logfn=os.devnull)
+        self.samples = 0       # samples fed since the current utterance started
+        self.offset_ms = 0.0   # stream position where the current utterance started
+        self.decoder.start_utt()
+
+    def process(self, chunk):
+        """
+        Feed one chunk of audio.
+
+        :param chunk: Raw PCM bytes (any length, ideally 10-100 ms)
+        :return: A Detection if the wake word was heard in or before this chunk, else None
+        """
+        started = time.perf_counter()
+        self.decoder.process_raw(chunk, False, False)
+        self.samples += len(chunk) // SAMPLE_WIDTH
+        if self.decoder.hyp() is None:
+            return None
+
+        decode_ms = (time.perf_counter() - started) * 1000
+        audio_ms = self.offset_ms + self.samples * 1000 / SAMPLE_RATE
+        end_frames = [seg.end_frame for seg in self.decoder.seg()]
+        keyword_end_ms = self.offset_ms + (max(end_frames) + 1) * 1000 / FRAMES_PER_SEC if end_frames else audio_ms
+        self.reset()
+        return Detection(audio_ms, keyword_end_ms, max(audio_ms - keyword_end_ms, 0.0) + decode_ms)
+
+    def reset(self):
+        """
+        Start a fresh utterance (called automatically after every detection).
+        """
+        self.decoder.end_utt()
+        self.offset_ms += self.samples * 1000 / SAMPLE_RATE
+        self.samples = 0
+        self.decoder.start_utt()
+
+
+def wav_chunks(path, chunk_ms=20):
+    """
+    Yield a WAV file as detector-ready PCM chunks, converting rate/width if needed.
+    """
+    with sr.AudioFile(path) as source:
+        audio = sr.Recognizer().record(source)
+    pcm = audio.get_raw_data(convert_rate=SAMPLE_RATE, convert_width=SAMPLE_WIDTH)
+    step = SAMPLE_RATE * SAMPLE_WIDTH * chunk_ms // 1000
+    for start in range(0, len(pcm), step):
+        yield pcm[start:start + step]
+
+
+def detect_in_wav(path, keyphrase="jarvis", threshold=1e-20, chunk_ms=20):
+    """
+    Run the streaming detector over a recorded WAV file.
+
+    :return: List of Detection, in stream order
+    """
+    detector = WakeWordDetector(keyphrase, threshold)
+    return [hit for hit in map(detector.process, wav_chunks(path, chunk_ms)) if hit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run wake-word detection over recorded WAV files.")
+    parser.add_argument("wavs", nargs="+", help="WAV files to scan")
+    parser.add_argument("--keyphrase", default="jarvis")
+    parser.add_argument("--threshold", type=float, default=1e-20)
+    parser.add_argument("--chunk-ms", type=int, default=20)
+    parser.add_argument("--expect", type=int, help="exit non-zero unless every file has this many detections")
+    args = parser.parse_args()
+
+    metrics.enabled = args.expect is not None
+    failed = False
+    for path in args.wavs:
+        hits = detect_in_wav(path, args.keyphrase, args.threshold, args.chunk_ms)
+        print(f"{path}: {len(hits)} detection(s)")
+        metrics.count("wake.detections", len(hits))
+        for hit in hits:
+            print(f"  at {hit.audio_ms:8.0f} ms (word ended {hit.keyword_end_ms:8.0f} ms)"
+                  f"  latency {hit.latency_ms:6.1f} ms")
+        if args.expect is not None:
+            metrics.wake_truth(args.expect, len(hits))
+            if len(hits) != args.expect:
+                print(f"  expected {args.expect}")
+                failed = True
+    if args.expect is not None:
+        counters = metrics.snapshot()["counters"]
+        print(f"false negatives: {counters['wake.missed']}/{counters['wake.expected']}, "
+              f"false positives: {counters['wake.false_positives']}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
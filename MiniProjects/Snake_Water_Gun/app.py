@@ -15,20 +15,62 @@ if __name__ == '__main__':
     app.run(debug=True)
 
 '''
-from flask import Flask, render_template, request
+from flask import Flask, Response, g, jsonify, request, stream_with_context
+import atexit
+import json
 import random
+import uuid
+
+from engine import DRAW, LOSE, MESSAGES, SNAKE_WATER_GUN, WIN, WebResponses
+from opponent import MarkovOpponent, RandomOpponent
+from render_cache import RenderCache, not_modified, page_headers
+from stats import PLAYER, SESSION, SESSION_COOKIE, StatsStore
 
 app = Flask(__name__)
 
-# Possible choices
-choices = ["snake", "water", "gun"]
+# Win/lose/draw counters per session and per player; writes are buffered and
+# flushed to SQLite in the background, so recording never blocks a request
+stats = StatsStore()
+atexit.register(stats.close)
+
+# Game rules live in engine.py and are shared with the console game (logic.py)
+rules = SNAKE_WATER_GUN
+# Pre-built response bytes, shared with asgi.py (see engine.WebResponses)
+web = WebResponses(rules)
+choices = web.choices
+
+# Computer strategies; send opponent=adaptive to play against the Markov predictor
+opponents = {"random": RandomOpponent(rules), "adaptive": MarkovOpponent(rules)}
+
+# Every page the game can show: the empty form plus one result card per (user, comp) pair
+page_cache = RenderCache(app.jinja_env, "index.html", web.page_variants())
+
+batch_chunk = 65_536  # rounds per streamed chunk
 
-# Mapping of winning relationships
-dwins = {
-    ("snake", "water"),  # snake drinks water
-    ("water", "gun"),    # water douses gun
-    ("gun", "snake"),    # gun kills snake
-}
+
+def play_against(opponent_name, player, user_code):
+    """
+    Let the chosen opponent (random unless "adaptive" is asked for) pick its move,
+    then show it the player's move so adaptive opponents can learn.
+    """
+    opponent = opponents.get(opponent_name) if isinstance(opponent_name, str) else None
+    opponent = opponent or opponents["random"]
+    comp_code = opponent.choose(player or g.session_id)
+    if user_code is not None:
+        opponent.observe(player or g.session_id, user_code)
+    return comp_code
+
+@app.before_request
+def load_session():
+    # Only clients that send the cookie back have a session; one-shot API clients and
+    # load tests are counted globally (and per player) but never create session rows
+    g.session_id = request.cookies.get(SESSION_COOKIE)
+
+@app.after_request
+def save_session(response):
+    if g.get("session_id") is None:
+        response.set_cookie(SESSION_COOKIE, uuid.uuid4().hex, httponly=True, samesite="Lax")
+    return response
 
 @app.route("/", methods = ["GET", "POST"])
 def index():
@@ -38,15 +80,89 @@ def index():
 
     if request.method == "POST":
         user_choice = request.form.get("choice", None)
-        comp_choice = random.choice(choices)
-        if user_choice == comp_choice:
-            result = "Draw"
-        elif (user_choice, comp_choice) in dwins:
-            result = "You Win!"
-        else:
-            result = "You Lose!"
-
-    return render_template("index.html", user_choice=user_choice, comp_choice=comp_choice, result=result)
+        player = request.form.get("player")
+        comp_choice = choices[play_against(request.form.get("opponent"), player, rules.parse(user_choice))]
+        # Anything that is not a valid choice loses
+        outcome = rules.index.get((user_choice, comp_choice), LOSE)
+        result = MESSAGES[outcome]
+        stats.record(outcome, g.session_id, player)
+
+    # Served from the pre-rendered cache; a GET with matching validators gets a 304
+    page = page_cache.get(user_choice, comp_choice, result)
+    headers = page_headers(page)
+    if request.method == "GET" and not_modified(page, request.headers.get("If-None-Match"),
+                                                request.headers.get("If-Modified-Since")):
+        return Response(status=304, headers=headers)
+    return Response(page.body, mimetype="text/html", headers=headers)
+
+@app.route("/api/play", methods = ["POST"])
+def api_play():
+    # Accept {"choice": "snake"} / {"choice": 0} as JSON, or a plain form field
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        data = request.form
+    user_code = rules.parse(data.get("choice"))
+    if user_code is None:
+        return Response(web.invalid_choice_response, status=400, mimetype="application/json")
+
+    # No template: the outcome is a table lookup into pre-built bytes
+    player = data.get("player")
+    if not isinstance(player, str):
+        player = None
+    comp_code = play_against(data.get("opponent"), player, user_code)
+    stats.record(rules.resolve_codes(user_code, comp_code), g.session_id, player)
+    return Response(web.play_responses[user_code][comp_code], mimetype="application/json")
+
+@app.route("/api/play/batch", methods = ["POST"])
+def api_play_batch():
+    # Body is either a JSON array (["snake", "gun", 2, ...]) or one choice per line
+    body = request.get_data()
+    if body.lstrip().startswith(b"["):
+        try:
+            items = json.loads(body)
+        except ValueError:
+            return Response(json.dumps({"error": "invalid JSON array"}), status=400, mimetype="application/json")
+    else:
+        items = [line.strip() for line in body.splitlines() if line.strip()]
+
+    user_codes, bad = web.batch_codes(items)
+    if user_codes is None:
+        return Response(json.dumps({"error": f"invalid choice at round {bad}"}), status=400, mimetype="application/json")
+
+    # Seeded so a tournament can be replayed exactly; the seed is echoed back
+    seed = request.args.get("seed", type=int)
+    if seed is None:
+        seed = random.getrandbits(64)
+    comp_codes = rules.draw(random.Random(seed), len(user_codes))
+    pairs, outcomes = rules.resolve_batch(user_codes, comp_codes)
+
+    summary = {
+        "rounds": len(outcomes),
+        "seed": seed,
+        "wins": outcomes.count(WIN),
+        "losses": outcomes.count(LOSE),
+        "draws": outcomes.count(DRAW),
+    }
+    counts = [0, 0, 0]
+    counts[DRAW], counts[WIN], counts[LOSE] = summary["draws"], summary["wins"], summary["losses"]
+    stats.record_many(counts, g.session_id, request.args.get("player"))
+
+    def generate():
+        # One NDJSON line per round, then a final line with the totals
+        for start in range(0, len(pairs), batch_chunk):
+            yield b"".join(map(web.round_lines.__getitem__, pairs[start:start + batch_chunk]))
+        yield json.dumps({"summary": summary}).encode() + b"\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+@app.route("/api/stats")
+def api_stats():
+    # Includes rounds not yet flushed to disk
+    body = {"global": stats.snapshot(), "session": stats.snapshot(SESSION, g.session_id or "")}
+    player = request.args.get("player")
+    if player:
+        body["player"] = stats.snapshot(PLAYER, player)
+    return jsonify(body)
 
 if __name__ == "__main__":
     app.run(debug=True)
@@ -0,0 +1,277 @@
+'''
+Async (ASGI) entry point for the Snake-Water-Gun game.
+
+Serves the same routes as app.py — "/" (HTML form, rendered from templates/index.html),
+"/api/play" (JSON), "/api/play/batch" (NDJSON) and "/api/stats" — with the same
+session cookie, opponents and statistics, but as a plain ASGI callable, so an async
+server such as uvicorn can keep many requests in flight per worker instead of one at a time.
+
+Run it with:
+    uvicorn asgi:app --port 8001
+'''
+
+import asyncio
+import atexit
+import json
+import os
+import random
+import uuid
+from http.cookies import SimpleCookie
+from pathlib import Path
+from urllib.parse import parse_qs
+
+from jinja2 import Environment, FileSystemLoader
+
+# Rules and pre-built response bytes are shared with app.py through engine.py,
+# so importing this module does not build the Flask app or open the database
+from engine import DRAW, LOSE, MESSAGES, SNAKE_WATER_GUN, WIN, WebResponses
+from opponent import MarkovOpponent, RandomOpponent
+from render_cache import RenderCache, not_modified, page_headers
+from stats import PLAYER, SESSION, SESSION_COOKIE, StatsStore
+
+rules = SNAKE_WATER_GUN
+web = WebResponses(rules)
+choices = web.choices
+
+# Computer strategies; send opponent=adaptive to play against the Markov predictor
+opponents = {"random": RandomOpponent(rules), "adaptive": MarkovOpponent(rules)}
+
+# Set SWG_DEBUG=1 to pick up template edits without restarting the server
+templates = Environment(
+    loader=FileSystemLoader(Path(__file__).parent / "templates"),
+    autoescape=True,
+    auto_reload=os.environ.get("SWG_DEBUG") == "1",
+)
+page_cache = RenderCache(templates, "index.html", web.page_variants())
+
+html_headers = [(b"content-type", b"text/html; charset=utf-8")]
+json_headers = [(b"content-type", b"application/json")]
+ndjson_headers = [(b"content-type", b"application/x-ndjson")]
+batch_chunk = 65_536  # rounds per streamed chunk
+
+_stats = None
+
+
+def get_stats():
+    """
+    The statistics store, opened on first use (or at lifespan startup).
+    """
+    global _stats
+    if _stats is None:
+        _stats = StatsStore()
+        atexit.register(_stats.close)
+    return _stats
+
+
+def close_stats():
+    global _stats
+    if _stats is not None:
+        atexit.unregister(_stats.close)
+        _stats.close()
+        _stats = None
+
+
+class Request:
+    """
+    The parts of an HTTP request the routes need.
+    """
+
+    def __init__(self, scope, body):
+        self.method = scope["method"]
+        self.path = scope["path"]
+        self.query = {key: values[0] for key, values in parse_qs(scope.get("query_string", b"").decode("latin-1")).items()}
+        self.headers = {name.decode("latin-1"): value.decode("latin-1") for name, value in scope["headers"]}
+        self.body = body
+        cookie = SimpleCookie()
+        try:
+            cookie.load(self.headers.get("cookie", ""))
+        except Exception:  # a malformed Cookie header just means "no session"
+            pass
+        # Same rule as app.py: only a client that sends the cookie back has a session
+        morsel = cookie.get(SESSION_COOKIE)
+        self.session_id = morsel.value if morsel else None
+
+    def form(self):
+        # Bytes that are not UTF-8 become U+FFFD, which is just an invalid choice
+        return {key: values[0] for key, values in parse_qs(self.body.decode("utf-8", "replace")).items()}
+
+    def response_headers(self, headers):
+        if self.session_id is None:
+            cookie = f"{SESSION_COOKIE}={uuid.uuid4().hex}; HttpOnly; Path=/; SameSite=Lax"
+            return headers + [(b"set-cookie", cookie.encode())]
+        return headers
+
+
+async def read_body(receive):
+    """
+    Collect the full request body from the ASGI receive channel.
+    """
+    body = b""
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get("body", b"")
+        more_body = message.get("more_body", False)
+    return body
+
+
+async def send_response(send, request, status, headers, body):
+    await send({"type": "http.response.start", "status": status,
+                "headers": request.response_headers(headers)})
+    await send({"type": "http.response.body", "body": body})
+
+
+def play_against(opponent_name, player, user_code, session_id):
+    """
+    Same as app.play_against: the chosen opponent picks, then sees the player's move.
+    """
+    opponent = opponents.get(opponent_name) if isinstance(opponent_name, str) else None
+    opponent = opponent or opponents["random"]
+    comp_code = opponent.choose(player or session_id)
+    if user_code is not None:
+        opponent.observe(player or session_id, user_code)
+    return comp_code
+
+
+async def index(request, send):
+    result = None
+    user_choice = None
+    comp_choice = None
+
+    if request.method == "POST":
+        form = request.form()
+        user_choice = form.get("choice")
+        player = form.get("player")
+        comp_choice = choices[play_against(form.get("opponent"), player, rules.parse(user_choice),
+                                           request.session_id)]
+        # Anything that is not a valid choice loses, just like the Flask route
+        outcome = rules.index.get((user_choice, comp_choice), LOSE)
+        result = MESSAGES[outcome]
+        get_stats().record(outcome, request.session_id, player)
+
+    page = page_cache.get(user_choice, comp_choice, result)
+    validators = [(name.lower().encode(), value.encode()) for name, value in page_headers(page)]
+    if request.method == "GET" and not_modified(page, request.headers.get("if-none-match"),
+                                                request.headers.get("if-modified-since")):
+        await send_response(send, request, 304, validators, b"")
+        return
+    await send_response(send, request, 200, html_headers + validators, page.body)
+
+
+async def api_play(request, send):
+    try:
+        data = json.loads(request.body) if request.body else {}
+    except ValueError:  # includes bodies that are not UTF-8
+        data = None
+    if not isinstance(data, dict):
+        data = request.form()
+
+    user_code = rules.parse(data.get("choice"))
+    if user_code is None:
+        await send_response(send, request, 400, json_headers, web.invalid_choice_response)
+        return
+    player = data.get("player")
+    if not isinstance(player, str):
+        player = None
+    comp_code = play_against(data.get("opponent"), player, user_code, request.session_id)
+    get_stats().record(rules.resolve_codes(user_code, comp_code), request.session_id, player)
+    await send_response(send, request, 200, json_headers, web.play_responses[user_code][comp_code])
+
+
+async def api_play_batch(request, send):
+    # Body is either a JSON array (["snake", "gun", 2, ...]) or one choice per line
+    body = request.body
+    if body.lstrip().startswith(b"["):
+        try:
+            items = json.loads(body)
+        except ValueError:
+            await send_response(send, request, 400, json_headers, json.dumps({"error": "invalid JSON array"}).encode())
+            return
+    else:
+        items = [line.strip() for line in body.splitlines() if line.strip()]
+
+    user_codes, bad = web.batch_codes(items)
+    if user_codes is None:
+        await send_response(send, request, 400, json_headers,
+                            json.dumps({"error": f"invalid choice at round {bad}"}).encode())
+        return
+
+    # Seeded so a tournament can be replayed exactly; the seed is echoed back
+    try:
+        seed = int(request.query["seed"])
+    except (KeyError, ValueError):
+        seed = random.getrandbits(64)
+    comp_codes = rules.draw(random.Random(seed), len(user_codes))
+    pairs, outcomes = rules.resolve_batch(user_codes, comp_codes)
+
+    summary = {
+        "rounds": len(outcomes),
+        "seed": seed,
+        "wins": outcomes.count(WIN),
+        "losses": outcomes.count(LOSE),
+        "draws": outcomes.count(DRAW),
+    }
+    counts = [0, 0, 0]
+    counts[DRAW], counts[WIN], counts[LOSE] = summary["draws"], summary["wins"], summary["losses"]
+    get_stats().record_many(counts, request.session_id, request.query.get("player"))
+
+    # One NDJSON line per round, then a final line with the totals
+    await send({"type": "http.response.start", "status": 200,
+                "headers": request.response_headers(ndjson_headers)})
+    for start in range(0, len(pairs), batch_chunk):
+        await send({"type": "http.response.body", "more_body": True,
+                    "body": b"".join(map(web.round_lines.__getitem__, pairs[start:start + batch_chunk]))})
+    await send({"type": "http.response.body", "body": json.dumps({"summary": summary}).encode() + b"\n"})
+
+
+def stats_body(session_id, player):
+    # Includes rounds not yet flushed to disk
+    stats = get_stats()
+    body = {"global": stats.snapshot(), "session": stats.snapshot(SESSION, session_id or "")}
+    if player:
+        body["player"] = stats.snapshot(PLAYER, player)
+    return json.dumps(body).encode()
+
+
+async def api_stats(request, send):
+    # A row not yet in the in-memory aggregate is read from SQLite: off the event loop
+    body = await asyncio.get_running_loop().run_in_executor(
+        None, stats_body, request.session_id, request.query.get("player"))
+    await send_response(send, request, 200, json_headers, body)
+
+
+ROUTES = {
+    ("/", "GET"): index,
+    ("/", "POST"): index,
+    ("/api/play", "POST"): api_play,
+    ("/api/play/batch", "POST"): api_play_batch,
+    ("/api/stats", "GET"): api_stats,
+}
+
+
+async def app(scope, receive, send):
+    """
+    The ASGI application callable.
+    """
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                get_stats()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                close_stats()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    if scope["type"] == "websocket":
+        await send({"type": "websocket.close"})  # no websocket routes: refuse the handshake
+        return
+    if scope["type"] != "http":
+        return
+
+    request = Request(scope, await read_body(receive))
+    route = ROUTES.get((request.path, request.method))
+    if route is None:
+        await send_response(send, request, 404, [(b"content-type", b"text/plain")], b"Not Found")
+        return
+    await route(request, send)
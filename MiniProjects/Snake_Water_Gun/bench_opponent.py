@@ -0,0 +1,52 @@
+'''
+Benchmark: rounds/sec with the adaptive (Markov) opponent versus the random one.
+
+The simulated player is predictable on purpose (mostly repeats a fixed cycle), so
+the run also shows how often each opponent wins against a habit-driven human.
+
+Usage:
+    python bench_opponent.py              # 1,000,000 rounds per opponent
+    python bench_opponent.py 200000 500   # rounds, number of distinct players
+'''
+
+import random
+import sys
+import time
+
+from engine import LOSE, SNAKE_WATER_GUN as rules
+from opponent import MarkovOpponent, RandomOpponent
+
+
+def play(opponent, rounds, players):
+    """
+    Play `rounds` rounds spread over `players` players; return (rounds/sec, computer win rate).
+    """
+    rng = random.Random(42)
+    pattern = [0, 0, 1, 2]  # the habit: snake, snake, water, gun, ...
+    position = [0] * players
+    computer_wins = 0
+
+    start = time.perf_counter()
+    for i in range(rounds):
+        player = i % players
+        if rng.random() < 0.8:
+            user_code = pattern[position[player] % len(pattern)]
+            position[player] += 1
+        else:
+            user_code = rng.randrange(rules.size)
+        comp_code = opponent.choose(player)
+        opponent.observe(player, user_code)
+        computer_wins += rules.resolve_codes(user_code, comp_code) == LOSE
+    elapsed = time.perf_counter() - start
+    return rounds / elapsed, computer_wins / rounds
+
+
+if __name__ == "__main__":
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    players = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    print(f"{rounds:,} rounds, {players} players")
+    for name, opponent in (("random", RandomOpponent(rules, random.Random(1))),
+                           ("adaptive", MarkovOpponent(rules, rng=random.Random(1)))):
+        rate, win_rate = play(opponent, rounds, players)
+        print(f"  {name:<9}: {rate:12,.0f} rounds/s   computer wins {win_rate:6.1%}")
@@ -0,0 +1,69 @@
+'''
+Benchmark: requests/sec of the HTML route ("/") versus the JSON route ("/api/play"),
+plus the time to resolve a 1M-round tournament through "/api/play/batch".
+
+Both routes are driven through Flask's test client, so the numbers measure the
+application itself (routing, form parsing, game logic, rendering) without any
+network noise.
+
+Usage:
+    python bench_play.py            # 20,000 requests per route
+    python bench_play.py 100000     # custom request count
+'''
+
+import random
+import sys
+import time
+
+from app import app
+from engine import SNAKE_WATER_GUN as rules
+
+
+def bench(client, path, n, **kwargs):
+    """
+    POST to `path` n times and return the achieved requests/sec.
+    """
+    # Warm up (first request compiles the template, builds url maps, etc.)
+    for _ in range(100):
+        client.post(path, **kwargs)
+
+    start = time.perf_counter()
+    for _ in range(n):
+        client.post(path, **kwargs)
+    elapsed = time.perf_counter() - start
+    return n / elapsed
+
+
+def bench_batch(client, rounds):
+    """
+    Time resolving `rounds` rounds, both in-process and through the batch endpoint.
+    """
+    user_codes = rules.draw(random.Random(0), rounds)
+    start = time.perf_counter()
+    rules.resolve_batch(user_codes, rules.draw(random.Random(1), rounds))
+    core = time.perf_counter() - start
+
+    body = b"\n".join(str(code).encode() for code in user_codes)
+    start = time.perf_counter()
+    client.post("/api/play/batch?seed=1", data=body).get_data()
+    endpoint = time.perf_counter() - start
+    return core, endpoint
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    client = app.test_client()
+
+    html_rps = bench(client, "/", n, data={"choice": "snake"})
+    api_rps = bench(client, "/api/play", n, json={"choice": 0})
+
+    print(f"Requests per route: {n:,}")
+    print(f"  /          (HTML, Jinja render) : {html_rps:10,.0f} req/s")
+    print(f"  /api/play  (pre-serialized JSON): {api_rps:10,.0f} req/s")
+    print(f"  speed-up                        : {api_rps / html_rps:10.2f}x")
+
+    rounds = 1_000_000
+    core, endpoint = bench_batch(client, rounds)
+    print(f"\nBatch of {rounds:,} rounds:")
+    print(f"  draw + resolve (in-process)     : {core * 1000:10.1f} ms")
+    print(f"  /api/play/batch (parse+stream)  : {endpoint * 1000:10.1f} ms")
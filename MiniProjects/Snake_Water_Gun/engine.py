@@ -0,0 +1,277 @@
+'''
+Game engine shared by the console game (logic.py) and the web front ends (app.py, asgi.py).
+
+A RuleSet is a list of choices plus "who beats whom". When it is built, every
+(user, comp) pair is resolved once into a lookup table, so resolving a round is a
+single index no matter how many choices the game has.
+
+    >>> from engine import resolve, WIN
+    >>> resolve("snake", "water") == WIN
+    True
+
+Importing this module has no side effects: it only defines the rule sets.
+'''
+
+import json
+
+# Outcome codes, from the user's point of view
+DRAW, WIN, LOSE = 0, 1, 2
+OUTCOMES = ("draw", "win", "lose")
+
+
+class RuleSet:
+    """
+    A set of choices and the winning relationships between them.
+    """
+
+    def __init__(self, name, choices, beats):
+        """
+        :param name: Short identifier, e.g. "snake-water-gun"
+        :param choices: Ordered choice names; a choice's code is its index
+        :param beats: Iterable of (winner, loser) pairs. Every two different
+                      choices must appear exactly once, in one order or the other.
+        """
+        self.name = name
+        self.choices = tuple(choices)
+        self.codes = {choice: code for code, choice in enumerate(self.choices)}
+        n = self.size = len(self.choices)
+        if n < 2 or len(self.codes) != n:
+            raise ValueError("a rule set needs at least two distinct choices")
+
+        table = bytearray(n * n)  # table[user * n + comp] -> outcome; diagonal stays DRAW
+        for winner, loser in beats:
+            w, l = self.codes[winner], self.codes[loser]
+            if w == l or table[w * n + l] != DRAW:
+                raise ValueError(f"conflicting or duplicate rule: {winner} beats {loser}")
+            table[w * n + l] = WIN
+            table[l * n + w] = LOSE
+        missing = [(self.choices[u], self.choices[c]) for u in range(n) for c in range(n)
+                   if u != c and table[u * n + c] == DRAW]
+        if missing:
+            raise ValueError(f"no rule for {missing[0][0]} vs {missing[0][1]}")
+        self.table = bytes(table)
+
+        # Same table keyed by names, for callers that work with strings
+        self.index = {(user, comp): self.table[u * n + c]
+                      for u, user in enumerate(self.choices)
+                      for c, comp in enumerate(self.choices)}
+        # For each choice, the choices that beat it (used by opponents that counter a move)
+        self.beaten_by = tuple(
+            tuple(w for w in range(n) if self.table[w * n + l] == WIN) for l in range(n)
+        )
+
+    @classmethod
+    def cyclic(cls, name, choices):
+        """
+        An N-way cyclic game (N odd): each choice beats the (N - 1) / 2 choices after it.
+        With ["snake", "water", "gun"] this gives exactly snake > water > gun > snake.
+        """
+        choices = list(choices)
+        n = len(choices)
+        if n % 2 == 0:
+            raise ValueError("a cyclic game needs an odd number of choices")
+        beats = [(choices[i], choices[(i + step) % n])
+                 for i in range(n) for step in range(1, (n - 1) // 2 + 1)]
+        return cls(name, choices, beats)
+
+    def __repr__(self):
+        return f"RuleSet(name={self.name!r}, choices={list(self.choices)!r})"
+
+    def resolve(self, user, comp):
+        """
+        Outcome (DRAW / WIN / LOSE) of one round, by choice name.
+
+        :raises ValueError: if either choice is not part of this rule set
+        """
+        try:
+            return self.index[user, comp]
+        except KeyError:
+            raise ValueError(f"invalid choice for {self.name}: {user!r} vs {comp!r}") from None
+
+    def resolve_codes(self, user_code, comp_code):
+        """
+        Outcome (DRAW / WIN / LOSE) of one round, by choice code.
+        """
+        return self.table[user_code * self.size + comp_code]
+
+    def parse(self, value):
+        """
+        Map a choice name ("snake", " Snake ") or code (0 / "0") to its code.
+
+        :return: The integer code, or None if the value is not a valid choice
+        """
+        if isinstance(value, str):
+            value = value.strip().lower()
+            if value in self.codes:
+                return self.codes[value]
+            # ASCII only: "²" and "١" are digits to isdigit() but not move codes
+            if value.isascii() and value.isdigit():
+                try:
+                    value = int(value)
+                except ValueError:  # more digits than int() accepts
+                    return None
+        if isinstance(value, int) and not isinstance(value, bool) and 0 <= value < self.size:
+            return value
+        return None
+
+    # ——— Bulk resolution ——————————————————————————————————————————————
+    # A batch is one byte per round (the choice code). pair = n * user + comp is
+    # computed for all rounds at once by treating the byte strings as big integers
+    # (with n <= 16 no byte exceeds 255, so there are no carries), then
+    # bytes.translate() maps each pair byte to its outcome in C.
+
+    def draw(self, rng, k):
+        """
+        Draw k uniformly random choice codes from `rng` (a random.Random) as bytes.
+        """
+        n = self.size
+        if n > 256:
+            return bytes(rng.choices(range(n), k=k))
+        limit = 256 - 256 % n  # bytes >= limit are dropped so every code is equally likely
+        to_code = bytes(b % n for b in range(256))
+        reject = bytes(range(limit, 256))
+        drawn = b""
+        while len(drawn) < k:
+            m = k - len(drawn) + 64
+            # Same bytes as rng.randbytes(m) (Python 3.9+), so seeded batches replay identically
+            drawn += rng.getrandbits(m * 8).to_bytes(m, "little").translate(to_code, reject)
+        return drawn[:k]
+
+    def resolve_batch(self, user_codes, comp_codes):
+        """
+        Resolve many rounds at once.
+
+        :param user_codes: bytes of user choice codes, one per round
+        :param comp_codes: bytes of computer choice codes, same length
+        :return: (pairs, outcomes) as bytes; pairs[i] = n * user + comp and
+                 outcomes[i] is DRAW, WIN or LOSE
+        """
+        n, k = self.size, len(user_codes)
+        if n > 16:
+            pairs = [u * n + c for u, c in zip(user_codes, comp_codes)]
+            return pairs, bytes(map(self.table.__getitem__, pairs))
+        pairs = (int.from_bytes(user_codes, "big") * n
+                 + int.from_bytes(comp_codes, "big")).to_bytes(k, "big")
+        return pairs, pairs.translate(self.table.ljust(256, b"\0"))
+
+
+# ——— Pre-built web responses ————————————————————————————————————————————————
+# Shared by the Flask (app.py) and ASGI (asgi.py) front ends, so both answer with
+# the same bytes and neither has to import the other.
+
+MESSAGES = {DRAW: "Draw", WIN: "You Win!", LOSE: "You Lose!"}
+
+# The only item types a batch may contain (True and 1.0 hash like 1, so they are rejected)
+BATCH_TYPES = {str, bytes, int}
+
+
+class WebResponses:
+    """
+    Every response body the web games can send for one rule set, built once.
+    """
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.choices = choices = list(rules.choices)
+        # Outcome message for every (user_code, comp_code) pair: results[user_code][comp_code]
+        self.results = [[MESSAGES[rules.resolve_codes(u, c)] for c in range(rules.size)]
+                        for u in range(rules.size)]
+        # /api/play JSON body for every (user, comp) pair
+        self.play_responses = [
+            [json.dumps({
+                "user_choice": user, "user_code": u,
+                "comp_choice": comp, "comp_code": c,
+                "result": self.results[u][c],
+            }).encode()
+             for c, comp in enumerate(choices)]
+            for u, user in enumerate(choices)
+        ]
+        self.invalid_choice_response = json.dumps(
+            {"error": "choice must be one of " + ", ".join(choices) + f" or a code 0-{rules.size - 1}"}
+        ).encode()
+        # Batch NDJSON line for every pair code (n * user + comp)
+        self.round_lines = [
+            json.dumps({"user": user, "comp": comp, "result": OUTCOMES[rules.resolve_codes(u, c)]}).encode() + b"\n"
+            for u, user in enumerate(choices)
+            for c, comp in enumerate(choices)
+        ]
+        # Every accepted spelling of a batch choice ("snake", "0", b"snake", 0, ...) -> code
+        self.batch_lookup = {}
+        for code, name in enumerate(choices):
+            for key in (name, name.upper(), name.capitalize(), str(code), code):
+                self.batch_lookup[key] = code
+                if isinstance(key, str):
+                    self.batch_lookup[key.encode()] = code
+
+    def page_variants(self):
+        """
+        Every (user, comp, result) the HTML page can show: the empty form plus one card per pair.
+        """
+        return [(None, None, None)] + [
+            (user, comp, self.results[u][c])
+            for u, user in enumerate(self.choices)
+            for c, comp in enumerate(self.choices)
+        ]
+
+    def batch_codes(self, items):
+        """
+        Choice codes for a batch of items, as bytes.
+
+        :return: (codes, None), or (None, index of the first invalid item)
+        """
+        try:
+            if not set(map(type, items)) <= BATCH_TYPES:
+                raise TypeError
+            return bytes(map(self.batch_lookup.__getitem__, items)), None
+        except (KeyError, TypeError):
+            return None, next(i for i, item in enumerate(items)
+                              if type(item) not in BATCH_TYPES or item not in self.batch_lookup)
+
+
+# ——— Built-in rule sets ————————————————————————————————————————————————
+
+SNAKE_WATER_GUN = RuleSet("snake-water-gun", ["snake", "water", "gun"], [
+    ("snake", "water"),  # snake drinks water
+    ("water", "gun"),    # water douses gun
+    ("gun", "snake"),    # gun kills snake
+])
+
+ROCK_PAPER_SCISSORS_LIZARD_SPOCK = RuleSet(
+    "rock-paper-scissors-lizard-spock", ["rock", "paper", "scissors", "lizard", "spock"], [
+        ("scissors", "paper"),   # scissors cuts paper
+        ("paper", "rock"),       # paper covers rock
+        ("rock", "lizard"),      # rock crushes lizard
+        ("lizard", "spock"),     # lizard poisons Spock
+        ("spock", "scissors"),   # Spock smashes scissors
+        ("scissors", "lizard"),  # scissors decapitates lizard
+        ("lizard", "paper"),     # lizard eats paper
+        ("paper", "spock"),      # paper disproves Spock
+        ("spock", "rock"),       # Spock vaporizes rock
+        ("rock", "scissors"),    # rock crushes scissors
+    ])
+
+RULE_SETS = {rules.name: rules for rules in (SNAKE_WATER_GUN, ROCK_PAPER_SCISSORS_LIZARD_SPOCK)}
+
+
+def register(rules):
+    """
+    Make a custom RuleSet available by name through get_rules().
+    """
+    RULE_SETS[rules.name] = rules
+    return rules
+
+
+def get_rules(name):
+    """
+    Look up a registered rule set by name.
+
+    :raises KeyError: if no rule set with that name was registered
+    """
+    return RULE_SETS[name]
+
+
+def resolve(user, comp, rules=SNAKE_WATER_GUN):
+    """
+    Outcome (DRAW / WIN / LOSE) of one round of `rules` (snake-water-gun by default).
+    """
+    return rules.resolve(user, comp)
@@ -0,0 +1,131 @@
+'''
+Load test: WSGI (Flask, app.py) versus ASGI (asgi.py) on the same game.
+
+Starts both servers locally, then for each concurrency level (1, 100, 1000 clients)
+fires POST requests at "/" and reports throughput and p50/p99 latency.
+
+Usage:
+    python loadtest.py                     # 5 seconds per level, route "/"
+    python loadtest.py --duration 10 --path /api/play
+    python loadtest.py --no-spawn          # servers already running on the ports below
+'''
+
+import argparse
+import asyncio
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+HERE = Path(__file__).parent
+HOST = "127.0.0.1"
+
+# name -> (port, command that starts the server)
+SERVERS = {
+    "wsgi (flask)": (8000, [sys.executable, "-m", "flask", "--app", "app", "run", "--port", "8000"]),
+    "asgi (uvicorn)": (8001, [sys.executable, "-m", "uvicorn", "asgi:app", "--port", "8001",
+                              "--log-level", "warning", "--no-access-log"]),
+}
+
+
+def build_request(path):
+    """
+    Raw HTTP/1.1 request bytes for one game round.
+    """
+    if path == "/api/play":
+        body, content_type = b'{"choice": "snake"}', b"application/json"
+    else:
+        body, content_type = b"choice=snake", b"application/x-www-form-urlencoded"
+    return (
+        b"POST " + path.encode() + b" HTTP/1.1\r\n"
+        b"Host: " + HOST.encode() + b"\r\n"
+        b"Content-Type: " + content_type + b"\r\n"
+        b"Content-Length: " + str(len(body)).encode() + b"\r\n"
+        b"Connection: close\r\n\r\n" + body
+    )
+
+
+async def client(port, request, deadline, latencies, errors):
+    """
+    One simulated user: send requests back to back until the deadline.
+    """
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            reader, writer = await asyncio.open_connection(HOST, port)
+            writer.write(request)
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            if not response.startswith(b"HTTP/1.1 200") and not response.startswith(b"HTTP/1.0 200"):
+                errors.append(response[:12])
+                continue
+        except OSError as e:
+            errors.append(e)
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+async def run_level(port, request, concurrency, duration):
+    latencies, errors = [], []
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(client(port, request, deadline, latencies, errors)
+                           for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return latencies, errors, elapsed
+
+
+def report(name, concurrency, latencies, errors, elapsed):
+    if latencies:
+        cuts = statistics.quantiles(latencies, n=100)
+        p50, p99 = cuts[49] * 1000, cuts[98] * 1000
+    else:
+        p50 = p99 = float("nan")
+    print(f"{name:<16} {concurrency:>6} {len(latencies) / elapsed:>10,.0f} "
+          f"{p50:>10.2f} {p99:>10.2f} {len(errors):>8}")
+
+
+def wait_for_port(port, timeout=15):
+    async def probe():
+        _, writer = await asyncio.open_connection(HOST, port)
+        writer.close()
+
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            asyncio.run(probe())
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server on port {port} did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per concurrency level")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 100, 1000])
+    parser.add_argument("--path", default="/", choices=["/", "/api/play"])
+    parser.add_argument("--no-spawn", action="store_true", help="use servers that are already running")
+    args = parser.parse_args()
+
+    request = build_request(args.path)
+    print(f"{'server':<16} {'conc.':>6} {'req/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'errors':>8}")
+
+    for name, (port, command) in SERVERS.items():
+        process = None
+        if not args.no_spawn:
+            process = subprocess.Popen(command, cwd=HERE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_for_port(port)
+            for concurrency in args.levels:
+                report(name, concurrency, *asyncio.run(run_level(port, request, concurrency, args.duration)))
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,41 +6,64 @@ A simple Snake, Water, Gun game (variant of Rock-Paper-Scissors):
 - Water douses Gun (Water wins)
 - Gun kills Snake (Gun wins)
 
-The computer chooses randomly, and the user plays against it.
+The computer chooses randomly, and the user plays against it
+(run with --adaptive to face an opponent that learns your habits).
+The rules themselves live in engine.py, shared with the web version (app.py),
+and results are counted in the same statistics database (stats.py).
 '''
 
-import random
-
-# Possible choices
-choices = ["snake", "water", "gun"]
-
-# Mapping of winning relationships
-dwins = {
-    ("snake", "water"),  # snake drinks water
-    ("water", "gun"),    # water douses gun
-    ("gun", "snake"),    # gun kills snake
-}
-
-print("Welcome to Snake, Water, Gun!")
-print("Enter your choice: snake, water, or gun. Type 'quit' to exit.")
-
-while True:
-    user_choice = input("Your choice: ").strip().lower()
-    if user_choice == "quit":
-        print("Thanks for playing! Goodbye.")
-        break
-    if user_choice not in choices:
-        print("Invalid choice. Please choose 'snake', 'water', or 'gun'.")
-        continue
-
-    comp_choice = random.choice(choices)
-    print(f"Computer chose: {comp_choice}")
-
-    if user_choice == comp_choice:
-        print("It's a tie!")
-    elif (user_choice, comp_choice) in dwins:
-        print("You win!")
-    else:
-        print("You lose!")
-
-    print()  # blank line for readability
+import argparse
+import getpass
+import uuid
+
+from engine import DRAW, SNAKE_WATER_GUN, WIN
+from opponent import make_opponent
+from stats import PLAYER, SESSION, StatsStore
+
+messages = {DRAW: "It's a tie!", WIN: "You win!"}
+
+
+def main(rules=SNAKE_WATER_GUN, opponent="random"):
+    computer = make_opponent(opponent, rules)
+    choices = rules.choices
+    options = ", ".join(choices[:-1]) + ", or " + choices[-1]
+    stats = StatsStore()
+    session = uuid.uuid4().hex  # one console run = one session
+
+    print("Welcome to " + ", ".join(choice.capitalize() for choice in choices) + "!")
+    try:
+        player = input("Your name (Enter for '" + getpass.getuser() + "'): ").strip() or getpass.getuser()
+        print(f"Enter your choice: {options}. Type 'quit' to exit.")
+
+        while True:
+            user_choice = input("Your choice: ").strip().lower()
+            if user_choice == "quit":
+                for label, record in (("This session", stats.snapshot(SESSION, session)),
+                                      (f"All-time for {player}", stats.snapshot(PLAYER, player))):
+                    print(f"{label}: {record['wins']} wins, {record['losses']} losses, {record['draws']} draws")
+                print("Thanks for playing! Goodbye.")
+                break
+            if user_choice not in rules.codes:
+                print("Invalid choice. Please choose " + ", ".join(f"'{c}'" for c in choices[:-1])
+                      + f", or '{choices[-1]}'.")
+                continue
+
+            comp_choice = choices[computer.choose(player)]
+            computer.observe(player, rules.codes[user_choice])
+            print(f"Computer chose: {comp_choice}")
+            outcome = rules.resolve(user_choice, comp_choice)
+            print(messages.get(outcome, "You lose!"))
+            stats.record(outcome, session, player)
+
+            print()  # blank line for readability
+    except (EOFError, KeyboardInterrupt):  # Ctrl+D / Ctrl+C: leave quietly
+        print()
+    finally:
+        stats.close()  # writes the rounds still buffered, however the game ended
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Snake, Water, Gun on the console")
+    parser.add_argument("--adaptive", action="store_true", help="play against the learning opponent")
+    args = parser.parse_args()
+    main(opponent="adaptive" if args.adaptive else "random")
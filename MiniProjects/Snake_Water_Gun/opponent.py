@@ -0,0 +1,110 @@
+'''
+Computer opponents.
+
+RandomOpponent is the classic strategy (uniformly random move). MarkovOpponent is
+an opt-in adaptive strategy: it keeps, per player, a table counting which move the
+player made after each of their last `order` moves, predicts the most frequent
+follow-up and plays something that beats it.
+
+Both work on choice codes of an engine.RuleSet. Every opponent has:
+    choose(player) -> comp_code   (called before the player's move is known)
+    observe(player, user_code)    (called afterwards with the player's move)
+'''
+
+import random
+import threading
+from array import array
+from collections import OrderedDict
+
+
+class RandomOpponent:
+    """
+    Uniformly random moves; ignores history.
+    """
+
+    def __init__(self, rules, rng=None):
+        self.rules = rules
+        self.rng = rng or random.Random()
+
+    def choose(self, player=None):
+        return self.rng.randrange(self.rules.size)
+
+    def observe(self, player, user_code):
+        pass
+
+
+class MarkovOpponent:
+    """
+    Order-n Markov (n-gram) predictor of the player's next move.
+
+    Per player the model is one fixed-size table of k ** (order + 1) counters
+    (k = number of choices), so prediction and update are O(1) per round and memory
+    per player never grows. Counters are halved when one reaches `max_count`, which
+    also lets the model forget old habits. At most `max_players` models are kept;
+    the least recently seen player is dropped first.
+    """
+
+    def __init__(self, rules, order=2, max_players=10_000, max_count=1 << 16, rng=None):
+        self.rules = rules
+        self.order = order
+        self.contexts = rules.size ** order  # number of distinct "last n moves"
+        self.max_players = max_players
+        self.max_count = max_count
+        self.rng = rng or random.Random()
+        self.models = OrderedDict()  # player -> [context, counts]
+        self.lock = threading.Lock()
+
+    def _model(self, player):
+        model = self.models.get(player)
+        if model is None:
+            model = self.models[player] = [0, array("I", bytes(4 * self.contexts * self.rules.size))]
+            if len(self.models) > self.max_players:
+                self.models.popitem(last=False)
+        else:
+            self.models.move_to_end(player)
+        return model
+
+    def predict(self, player):
+        """
+        Most likely next move code for `player`, or None with no data yet.
+        """
+        k = self.rules.size
+        with self.lock:
+            context, counts = self._model(player)
+            row = counts[context * k:context * k + k]
+        best = max(row)
+        return row.index(best) if best else None
+
+    def choose(self, player=None):
+        predicted = self.predict(player)
+        if predicted is None:
+            return self.rng.randrange(self.rules.size)
+        return self.rng.choice(self.rules.beaten_by[predicted])
+
+    def observe(self, player, user_code):
+        k = self.rules.size
+        with self.lock:
+            model = self._model(player)
+            context, counts = model
+            slot = context * k + user_code
+            counts[slot] += 1
+            if counts[slot] >= self.max_count:
+                for i in range(context * k, context * k + k):
+                    counts[i] >>= 1
+            model[0] = (context * k + user_code) % self.contexts
+
+
+OPPONENTS = {"random": RandomOpponent, "adaptive": MarkovOpponent}
+
+
+def make_opponent(name, rules, **options):
+    """
+    Build an opponent by name ("random" or "adaptive").
+
+    :raises ValueError: for an unknown opponent name
+    """
+    try:
+        cls = OPPONENTS[name]
+    except KeyError:
+        raise ValueError(f"unknown opponent {name!r}; choose from {', '.join(OPPONENTS)}") from None
+    return cls(rules, **options)
@@ -0,0 +1,105 @@
+'''
+Render cache for templates/index.html.
+
+The game page only has a handful of possible states: the empty form (GET) and one
+result card per (user_choice, comp_choice) pair. Instead of running Jinja on every
+request, every state is rendered once up front and served as ready-made bytes with
+an ETag and Last-Modified header, so browsers can revalidate with a cheap 304.
+
+When the Jinja environment has auto_reload switched on (Flask turns it on in debug
+mode), the template file's mtime is checked on each lookup and the whole cache is
+rebuilt after an edit.
+'''
+
+import hashlib
+import os
+from collections import namedtuple
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+# body: encoded HTML; etag: unquoted hash of the body; last_modified: aware datetime
+CachedPage = namedtuple("CachedPage", ["body", "etag", "last_modified"])
+
+
+class RenderCache:
+    """
+    Pre-rendered variants of one template, keyed by (user_choice, comp_choice, result).
+    """
+
+    def __init__(self, env, template_name, variants):
+        """
+        :param env: The jinja2 Environment that owns the template
+        :param template_name: Template to render (e.g. "index.html")
+        :param variants: Iterable of (user_choice, comp_choice, result) to pre-render
+        """
+        self.env = env
+        self.template_name = template_name
+        self.variants = list(variants)
+        self.build()
+
+    def build(self):
+        """
+        (Re)render every variant from the current template source.
+        """
+        template = self.env.get_template(self.template_name)
+        self.filename = template.filename
+        self.mtime = os.stat(self.filename).st_mtime if self.filename else 0
+        # HTTP dates only have one-second resolution
+        last_modified = datetime.fromtimestamp(int(self.mtime), timezone.utc)
+
+        pages = {}
+        for key in self.variants:
+            pages[key] = self._render(template, key, last_modified)
+        self.template = template
+        self.last_modified = last_modified
+        self.pages = pages
+
+    def get(self, user_choice, comp_choice, result):
+        """
+        Return the CachedPage for this game state, rendering it on the fly if it is
+        not one of the pre-rendered variants (e.g. a tampered form value).
+        """
+        if self.env.auto_reload and self.filename and os.stat(self.filename).st_mtime != self.mtime:
+            self.build()
+        key = (user_choice, comp_choice, result)
+        page = self.pages.get(key)
+        if page is None:
+            page = self._render(self.template, key, self.last_modified)
+        return page
+
+    @staticmethod
+    def _render(template, key, last_modified):
+        user_choice, comp_choice, result = key
+        body = template.render(user_choice=user_choice, comp_choice=comp_choice, result=result).encode()
+        return CachedPage(body, hashlib.blake2b(body, digest_size=16).hexdigest(), last_modified)
+
+
+def page_headers(page):
+    """
+    ETag / Last-Modified / Cache-Control headers for a CachedPage, as (name, value) str pairs.
+    """
+    return [
+        ("ETag", f'"{page.etag}"'),
+        ("Last-Modified", format_datetime(page.last_modified, usegmt=True)),
+        ("Cache-Control", "no-cache"),
+    ]
+
+
+def not_modified(page, if_none_match, if_modified_since):
+    """
+    True if a client holding a copy with these validators can be answered with 304.
+
+    :param if_none_match: Value of the If-None-Match header, or None
+    :param if_modified_since: Value of the If-Modified-Since header, or None
+    """
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        # Weak tags (W/"...") match too; no str.removeprefix, it needs Python 3.9
+        tags = [(tag[2:] if tag.startswith("W/") else tag).strip('"') for tag in tags]
+        return "*" in tags or page.etag in tags
+    if if_modified_since is not None:
+        try:
+            return parsedate_to_datetime(if_modified_since) >= page.last_modified
+        except (TypeError, ValueError):
+            return False
+    return False
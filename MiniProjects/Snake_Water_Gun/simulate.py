@@ -0,0 +1,197 @@
+'''
+Headless simulation of the game rules: two strategies play N rounds against each
+other, spread over a process pool, with no browser and no stdin.
+
+Each worker gets its own deterministic seed (derived from --seed and the worker
+index), so a run is reproducible for a given worker count.
+
+Usage:
+    python simulate.py random adaptive --rounds 1000000 --workers 4
+    python simulate.py cycle adaptive --rules rock-paper-scissors-lizard-spock
+    python simulate.py constant:snake random --scaling      # 1, 2, 4, ... workers
+'''
+
+import argparse
+import math
+import os
+import random
+import time
+from multiprocessing import Pool
+
+from engine import DRAW, LOSE, RULE_SETS, WIN, get_rules
+from opponent import MarkovOpponent, RandomOpponent
+
+
+class ConstantStrategy:
+    """
+    Always plays the same move.
+    """
+
+    def __init__(self, rules, code=0):
+        self.code = code
+
+    def choose(self, player=None):
+        return self.code
+
+    def observe(self, player, user_code):
+        pass
+
+
+class CycleStrategy:
+    """
+    Plays every choice in turn: 0, 1, 2, 0, 1, 2, ...
+    """
+
+    def __init__(self, rules):
+        self.size = rules.size
+        self.next = 0
+
+    def choose(self, player=None):
+        code, self.next = self.next, (self.next + 1) % self.size
+        return code
+
+    def observe(self, player, user_code):
+        pass
+
+
+def make_strategy(spec, rules, rng):
+    """
+    Build a strategy from its command-line name: random, adaptive, cycle or constant:<choice>.
+    """
+    name, _, arg = spec.partition(":")
+    if name == "random":
+        return RandomOpponent(rules, rng)
+    if name == "adaptive":
+        return MarkovOpponent(rules, rng=rng)
+    if name == "cycle":
+        return CycleStrategy(rules)
+    if name == "constant":
+        code = rules.parse(arg or rules.choices[0])
+        if code is None:
+            raise ValueError(f"{arg!r} is not a choice in {rules.name}")
+        return ConstantStrategy(rules, code)
+    raise ValueError(f"unknown strategy {spec!r}")
+
+
+def run_worker(job):
+    """
+    Play one worker's share of rounds; return (a_wins, b_wins, draws, seconds).
+    """
+    rules_name, spec_a, spec_b, rounds, seed = job
+    rules = get_rules(rules_name)
+    rng = random.Random(seed)
+    a = make_strategy(spec_a, rules, random.Random(rng.getrandbits(64)))
+    b = make_strategy(spec_b, rules, random.Random(rng.getrandbits(64)))
+
+    counts = [0, 0, 0]  # indexed by outcome from A's point of view
+    table, n = rules.table, rules.size
+    start = time.perf_counter()
+    for _ in range(rounds):
+        move_a = a.choose("b")
+        move_b = b.choose("a")
+        a.observe("b", move_b)
+        b.observe("a", move_a)
+        counts[table[move_a * n + move_b]] += 1
+    elapsed = time.perf_counter() - start
+    return counts[WIN], counts[LOSE], counts[DRAW], elapsed
+
+
+def wilson_interval(successes, trials, z=1.96):
+    """
+    95% Wilson score interval for a binomial proportion.
+    """
+    if trials == 0:
+        return 0.0, 0.0
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return centre - margin, centre + margin
+
+
+def simulate(rules_name, spec_a, spec_b, rounds, workers, seed):
+    """
+    Run the simulation on `workers` processes and return a summary dict.
+    """
+    shares = [rounds // workers + (i < rounds % workers) for i in range(workers)]
+    jobs = [(rules_name, spec_a, spec_b, share, seed * 1_000_003 + i) for i, share in enumerate(shares)]
+
+    start = time.perf_counter()
+    with Pool(workers) as pool:
+        parts = pool.map(run_worker, jobs)
+    wall = time.perf_counter() - start
+
+    a_wins = sum(part[0] for part in parts)
+    b_wins = sum(part[1] for part in parts)
+    draws = sum(part[2] for part in parts)
+    per_core = [share / part[3] for share, part in zip(shares, parts) if part[3] > 0]
+    return {
+        "rounds": rounds,
+        "workers": workers,
+        "a_wins": a_wins,
+        "b_wins": b_wins,
+        "draws": draws,
+        "a_ci": wilson_interval(a_wins, rounds),
+        "b_ci": wilson_interval(b_wins, rounds),
+        "per_core": sum(per_core) / len(per_core) if per_core else 0.0,
+        "total": rounds / wall,
+    }
+
+
+def positive_int(text):
+    """
+    argparse type for --rounds / --workers: a whole number of at least 1.
+    """
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{text!r} is not a whole number") from None
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("strategy_a", help="random, adaptive, cycle or constant:<choice>")
+    parser.add_argument("strategy_b", help="random, adaptive, cycle or constant:<choice>")
+    parser.add_argument("--rules", default="snake-water-gun", choices=sorted(RULE_SETS))
+    parser.add_argument("--rounds", type=positive_int, default=1_000_000)
+    parser.add_argument("--workers", type=positive_int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scaling", action="store_true",
+                        help="repeat the run with 1, 2, 4, ... up to --workers processes")
+    args = parser.parse_args()
+
+    # Fail fast on bad strategy names instead of inside the pool
+    rules = get_rules(args.rules)
+    for spec in (args.strategy_a, args.strategy_b):
+        try:
+            make_strategy(spec, rules, random.Random())
+        except ValueError as e:
+            parser.error(str(e))
+
+    levels = [args.workers]
+    if args.scaling:
+        levels = [2 ** i for i in range(int(math.log2(args.workers)) + 1)]
+        if levels[-1] != args.workers:
+            levels.append(args.workers)
+
+    print(f"{args.strategy_a} vs {args.strategy_b} ({args.rules}), {args.rounds:,} rounds, seed {args.seed}")
+    baseline = None
+    for workers in levels:
+        result = simulate(args.rules, args.strategy_a, args.strategy_b, args.rounds, workers, args.seed)
+        baseline = baseline or result["total"]
+        a_low, a_high = result["a_ci"]
+        b_low, b_high = result["b_ci"]
+        print(f"\nworkers={workers}")
+        print(f"  {args.strategy_a:<16} wins {result['a_wins'] / args.rounds:7.3%}  95% CI [{a_low:.3%}, {a_high:.3%}]")
+        print(f"  {args.strategy_b:<16} wins {result['b_wins'] / args.rounds:7.3%}  95% CI [{b_low:.3%}, {b_high:.3%}]")
+        print(f"  {'draws':<16}      {result['draws'] / args.rounds:7.3%}")
+        print(f"  rounds/sec per core: {result['per_core']:12,.0f}")
+        print(f"  rounds/sec total   : {result['total']:12,.0f}  "
+              f"(scaling efficiency {result['total'] / (baseline * workers / levels[0]):.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+'''
+Persistent win/lose/draw statistics for the Snake-Water-Gun front ends.
+
+Results are counted per session and per player in a local SQLite database. The game
+never waits on the database: record() only bumps counters in memory, and a
+background thread flushes the accumulated deltas every `flush_interval_ms` in a
+single transaction (many rounds for the same player become one UPSERT).
+
+Reads (snapshot()) are served from an in-memory aggregate: the first read of a row
+loads it from the database (plus this process's not-yet-flushed rounds), after which
+record() keeps it current, so /api/stats never waits on SQLite or a flush. Nothing is
+loaded up front, and at most `max_rows` rows are kept (least recently used dropped
+first, to be re-read on demand). With several worker processes, a row cached by one
+of them does not see the others' rounds until it is dropped and re-read.
+'''
+
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from engine import DRAW, LOSE, WIN
+
+# Scopes a counter can belong to
+GLOBAL, SESSION, PLAYER = "global", "session", "player"
+
+# Cookie the web front ends keep a browser's session id in
+SESSION_COOKIE = "swg_session"
+
+# Shared by app.py and logic.py so the console and web games count together
+DEFAULT_PATH = os.environ.get("SWG_STATS_DB", str(Path(__file__).with_name("stats.db")))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS stats (
+    scope  TEXT    NOT NULL,
+    key    TEXT    NOT NULL,
+    draws  INTEGER NOT NULL DEFAULT 0,
+    wins   INTEGER NOT NULL DEFAULT 0,
+    losses INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (scope, key)
+)
+"""
+UPSERT = """
+INSERT INTO stats (scope, key, draws, wins, losses) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (scope, key) DO UPDATE SET
+    draws  = draws  + excluded.draws,
+    wins   = wins   + excluded.wins,
+    losses = losses + excluded.losses
+"""
+
+
+class StatsStore:
+    """
+    Buffered win/lose/draw counters backed by SQLite.
+
+    Counters are lists indexed by outcome code: [draws, wins, losses].
+    """
+
+    def __init__(self, path=DEFAULT_PATH, flush_interval_ms=250, max_rows=10_000):
+        """
+        :param path: SQLite database file (":memory:" keeps nothing on disk)
+        :param flush_interval_ms: How often buffered results are written
+        :param max_rows: How many counter rows the in-memory aggregate keeps
+        """
+        self.path = path
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_rows = max_rows
+        self.lock = threading.Lock()        # guards pending and totals
+        self.write_lock = threading.Lock()  # one flush (or database read) at a time
+
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        # WAL + synchronous=NORMAL: commits don't fsync on every transaction
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(SCHEMA)
+        self.db.commit()
+
+        # Deltas recorded since the last flush
+        self.pending = {}
+        # (scope, key) -> [draws, wins, losses] including pending; least recently used first
+        self.totals = OrderedDict()
+
+        self.stopped = threading.Event()
+        self.flusher = threading.Thread(target=self._flush_loop, name="stats-flusher", daemon=True)
+        self.flusher.start()
+
+    def record(self, outcome, session=None, player=None, count=1):
+        """
+        Count `count` rounds that ended with `outcome` (DRAW / WIN / LOSE).
+        """
+        counts = [0, 0, 0]
+        counts[outcome] = count
+        self.record_many(counts, session, player)
+
+    def record_many(self, counts, session=None, player=None):
+        """
+        Count a batch of rounds at once.
+
+        :param counts: [draws, wins, losses]
+        """
+        keys = [(GLOBAL, "")]
+        if session:
+            keys.append((SESSION, session))
+        if player:
+            keys.append((PLAYER, player))
+
+        with self.lock:
+            for key in keys:
+                row = self.pending.get(key)
+                if row is None:
+                    row = self.pending[key] = [0, 0, 0]
+                row[DRAW] += counts[DRAW]
+                row[WIN] += counts[WIN]
+                row[LOSE] += counts[LOSE]
+                total = self.totals.get(key)
+                if total is not None:
+                    total[DRAW] += counts[DRAW]
+                    total[WIN] += counts[WIN]
+                    total[LOSE] += counts[LOSE]
+                    self.totals.move_to_end(key)
+
+    def snapshot(self, scope=GLOBAL, key=""):
+        """
+        Current counters for one session / player (or the global totals) as a dict.
+        """
+        key = (scope, key)
+        with self.lock:
+            total = self.totals.get(key)
+            if total is not None:
+                self.totals.move_to_end(key)
+                draws, wins, losses = total
+                return {"wins": wins, "losses": losses, "draws": draws, "rounds": wins + losses + draws}
+
+        # Not in memory yet: read it once. Holding write_lock means no flush is half
+        # done: every round is either committed to the database or still in pending
+        with self.write_lock:
+            saved = self.db.execute("SELECT draws, wins, losses FROM stats WHERE scope = ? AND key = ?",
+                                    key).fetchone() or (0, 0, 0)
+            with self.lock:
+                total = self.totals.get(key)
+                if total is None:
+                    delta = self.pending.get(key, (0, 0, 0))
+                    total = self.totals[key] = [old + new for old, new in zip(saved, delta)]
+                    if len(self.totals) > self.max_rows:
+                        self.totals.popitem(last=False)
+                draws, wins, losses = total
+        return {"wins": wins, "losses": losses, "draws": draws, "rounds": wins + losses + draws}
+
+    def flush(self):
+        """
+        Write all buffered deltas in one transaction.
+        """
+        with self.write_lock:
+            with self.lock:
+                pending, self.pending = self.pending, {}
+            if not pending:
+                return
+            try:
+                with self.db:
+                    self.db.executemany(UPSERT, [(scope, key, *counts) for (scope, key), counts in pending.items()])
+            except sqlite3.Error:
+                # Put the deltas back so the next flush retries them
+                with self.lock:
+                    for key, counts in pending.items():
+                        row = self.pending.setdefault(key, [0, 0, 0])
+                        for outcome in (DRAW, WIN, LOSE):
+                            row[outcome] += counts[outcome]
+                raise
+
+    def close(self):
+        """
+        Stop the background flusher and write anything still buffered.
+        """
+        self.stopped.set()
+        self.flusher.join()
+        self.flush()
+        self.db.close()
+
+    def _flush_loop(self):
+        while not self.stopped.wait(self.flush_interval):
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                print("Stats flush failed, will retry:", e)